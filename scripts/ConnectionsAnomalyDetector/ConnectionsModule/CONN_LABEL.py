@@ -17,11 +17,8 @@ class CONN_LABEL(Enum):
         :type val: str
         :return: the value relative to the string
         :rtype: int
-        """        
-        if val == 'Normal':
-            return cls.NORMAL
-        elif val == 'Anomaly':
-            return cls.ANOMALY
+        """
+        return _LABELS.get(val)
     
     @classmethod
     def conn_label_to_str(cls, conn_label: int) -> str:
@@ -31,8 +28,9 @@ class CONN_LABEL(Enum):
         :type val: int
         :return: the string relative to the value
         :rtype: str
-        """  
-        if conn_label == cls.NORMAL:
-            return 'Normal'
-        if conn_label == cls.ANOMALY:
-            return 'Anomaly'
\ No newline at end of file
+        """
+        return _LABEL_NAMES.get(conn_label)
+
+# conversions built once from the members
+_LABELS = {'Normal': CONN_LABEL.NORMAL, 'Anomaly': CONN_LABEL.ANOMALY}
+_LABEL_NAMES = {label: name for name, label in _LABELS.items()}
\ No newline at end of file
@@ -39,33 +39,8 @@ class CONN_STATE(Enum):
         :type val: str
         :return: the value relative to the string
         :rtype: int
-        """        
-        if val == 'S0':
-            return cls.S0
-        if val == 'S1':
-            return cls.S1
-        if val == 'SF':
-            return cls.SF
-        if val == 'REJ':
-            return cls.REJ
-        if val == 'S2':
-            return cls.S2
-        if val == 'S3':
-            return cls.S3
-        if val == 'RSTO':
-            return cls.RSTO
-        if val == 'RSTR':
-            return cls.RSTR
-        if val == 'RSTOS0':
-            return cls.RSTOS0
-        if val == 'RSTRH':
-            return cls.RSTRH
-        if val == 'SH':
-            return cls.SH
-        if val == 'SHR':
-            return cls.SHR
-        if val == 'OTH':
-            return cls.OTH
+        """
+        return _STATES.get(val)
     
     @classmethod
     def state_to_str(cls, state: int) -> str:
@@ -75,30 +50,9 @@ class CONN_STATE(Enum):
         :type val: int
         :return: the string relative to the value
         :rtype: str
-        """  
-        if state == cls.S0:
-            return 'S0'
-        if state == cls.S1:
-            return 'S1'
-        if state == cls.SF:
-            return 'SF'
-        if state == cls.REJ:
-            return 'REJ'
-        if state == cls.S2:
-            return 'S2'
-        if state == cls.S3:
-            return 'S3'
-        if state == cls.RSTO:
-            return 'RSTO'
-        if state == cls.RSTR:
-            return 'RSTR'
-        if state == cls.RSTOS0:
-            return 'RSTOS0'
-        if state == cls.RSTRH:
-            return 'RSTRH'
-        if state == cls.SH:
-            return 'SH'
-        if state == cls.SHR:
-            return 'SHR'
-        if state == cls.OTH:
-            return 'OTH'
\ No newline at end of file
+        """
+        return _STATE_NAMES.get(state)
+
+# conversions built once from the members, the names of the states are the strings of the conn.log
+_STATES = {state.name: state for state in CONN_STATE}
+_STATE_NAMES = {state: name for name, state in _STATES.items()}
\ No newline at end of file
@@ -0,0 +1,86 @@
+import numpy as np
+
+class Codebook:
+    """
+    Encoding of the values of a categorical attribute (service, conn_state, history, ...) as small ints:
+    the code of a value is its position in the list of the distinct values, in the order they have been seen.
+    A value is converted to its code with a dict lookup and a code to its value with a list index
+
+    :param __values: distinct values, the code of a value is its position
+    :type __values: list[str]
+    :param __codes: dict where the key is the value and the value its code
+    :type __codes: dict{str: int}
+    """
+
+    def __init__(self, values: list=None) -> None:
+        """Constructor, creates a codebook with the given values
+
+        :param values: initial distinct values, defaults to None
+        :type values: list[str], optional
+        """
+        self.__values = []
+        self.__codes = {}
+        for value in values if values is not None else []:
+            self.encode(value)
+
+    def __len__(self) -> int:
+        """returns the number of distinct values
+
+        :return: the number of distinct values
+        :rtype: int
+        """
+        return len(self.__values)
+
+    def encode(self, value: str) -> int:
+        """returns the code of a value, adding it to the codebook if it's new
+
+        :param value: value to encode
+        :type value: str
+        :return: the code of the value
+        :rtype: int
+        """
+        try:
+            return self.__codes[value]
+        except KeyError:
+            code = self.__codes[value] = len(self.__values)
+            self.__values.append(value)
+            return code
+
+    def decode(self, code: int) -> str:
+        """returns the value of a code
+
+        :param code: code to decode
+        :type code: int
+        :return: the value of the code
+        :rtype: str
+        """
+        return self.__values[code]
+
+    def get_values(self) -> list:
+        """Getter of the distinct values, the code of a value is its position
+
+        :return: the list of the distinct values
+        :rtype: list[str]
+        """
+        return self.__values
+
+    def get_decoded(self, function) -> list:
+        """returns the result of a function (e.g. the conversion to the string to print) applied once to every value,
+        the result for a code is at its position
+
+        :param function: function to apply to the values
+        :type function: Callable[[str], Any]
+        :return: the list of the results
+        :rtype: list
+        """
+        return [function(value) for value in self.__values]
+
+    def translate(self, other: 'Codebook') -> np.ndarray:
+        """returns the code in this codebook of every code of another codebook, adding the missing values
+
+        :param other: the other codebook
+        :type other: Codebook
+        :return: array where the element i is the code of the value with code i in other
+        :rtype: np.ndarray
+        """
+        return np.array([self.encode(value) for value in other.__values], dtype=np.int64)
@@ -0,0 +1,228 @@
+import queue
+import threading
+
+class DecompressingReader:
+    """
+    Reader of a compressed file (gzip, bz2, xz or zstd) that decompresses it while it's read, without writing
+    the decompressed file on disk. The decompression is done by a thread in blocks of block_size bytes,
+    up to n_blocks blocks ahead of the reader, so that it's overlapped with the conversion of the lines
+    (the decompressors release the GIL while decompressing).
+
+    It has the read and readline methods of a binary file and it can be used in a with statement.
+    zstd needs the zstandard package
+
+    :param __f_raw: the compressed file
+    :type __f_raw: io.BufferedReader
+    :param __stream: decompressed stream of the file
+    :type __stream: io.BufferedIOBase
+    :param __blocks: decompressed blocks not yet read, an empty block is the end of the file
+    :type __blocks: queue.Queue
+    :param __buffer: the part of the last block not yet read
+    :type __buffer: bytes
+    :param __eof: True if the last block has been read
+    :type __eof: bool
+    :param __error: exception raised by the thread while decompressing, raised again by the reader
+    :type __error: Exception
+    :param __closed: set when the reader is closed to stop the thread
+    :type __closed: threading.Event
+    :param __thread: the thread that decompresses the file
+    :type __thread: threading.Thread
+    """
+    # first bytes of the files of every compression
+    MAGIC_BYTES = {
+        'gzip': b'\x1f\x8b',
+        'bz2': b'BZh',
+        'xz': b'\xfd7zXZ\x00',
+        'zstd': b'\x28\xb5\x2f\xfd',
+    }
+    EXTENSIONS = {
+        '.gz': 'gzip',
+        '.bz2': 'bz2',
+        '.xz': 'xz',
+        '.zst': 'zstd',
+    }
+    # size of the buffer of the compressed file
+    RAW_BUFFER_SIZE = 1 << 20
+
+    def __init__(self, filepath: str, compression: str, block_size: int=1 << 22, n_blocks: int=4) -> None:
+        """Constructor, opens the file and starts the thread that decompresses it
+
+        :param filepath: path of the compressed file
+        :type filepath: str
+        :param compression: compression of the file, one of MAGIC_BYTES
+        :type compression: str
+        :param block_size: number of decompressed bytes of every block, defaults to 1 << 22
+        :type block_size: int, optional
+        :param n_blocks: max number of blocks decompressed ahead of the reader, defaults to 4
+        :type n_blocks: int, optional
+        :raises ValueError: raised if the compression is not supported
+        :raises ImportError: raised if the compression is zstd and the zstandard package is not installed
+        """
+        self.__f_raw = open(filepath, 'rb', buffering=DecompressingReader.RAW_BUFFER_SIZE)
+        try:
+            self.__stream = DecompressingReader.__open_stream(self.__f_raw, compression)
+        except Exception:
+            self.__f_raw.close()
+            raise
+        self.__blocks = queue.Queue(n_blocks)
+        self.__buffer = b''
+        self.__eof = False
+        self.__error = None
+        self.__closed = threading.Event()
+        self.__thread = threading.Thread(target=self.__decompress, args=(block_size,), daemon=True)
+        self.__thread.start()
+
+    @staticmethod
+    def detect_compression(filepath: str) -> str:
+        """returns the compression of a file from its first bytes, the extension is used only if the file is empty
+
+        :param filepath: path of the file
+        :type filepath: str
+        :return: the compression (one of MAGIC_BYTES) or None if the file is not compressed
+        :rtype: str
+        """
+        import os
+
+        with open(filepath, 'rb') as f:
+            head = f.read(max(len(magic) for magic in DecompressingReader.MAGIC_BYTES.values()))
+        for compression, magic in DecompressingReader.MAGIC_BYTES.items():
+            if head.startswith(magic):
+                return compression
+        return DecompressingReader.EXTENSIONS.get(os.path.splitext(filepath)[1].lower()) if head == b'' else None
+
+    @staticmethod
+    def __open_stream(f_raw, compression: str):
+        """returns the decompressed stream of a compressed file
+
+        :param f_raw: the compressed file
+        :type f_raw: io.BufferedReader
+        :param compression: compression of the file, one of MAGIC_BYTES
+        :type compression: str
+        :return: the decompressed stream
+        :rtype: io.BufferedIOBase
+        :raises ValueError: raised if the compression is not supported
+        :raises ImportError: raised if the compression is zstd and the zstandard package is not installed
+        """
+        if compression == 'gzip':
+            import gzip
+            return gzip.GzipFile(fileobj=f_raw, mode='rb')
+        if compression == 'bz2':
+            import bz2
+            return bz2.BZ2File(f_raw, mode='rb')
+        if compression == 'xz':
+            import lzma
+            return lzma.LZMAFile(f_raw, mode='rb')
+        if compression == 'zstd':
+            try:
+                import zstandard
+            except ImportError:
+                raise ImportError('the zstandard package is needed to read the files compressed with zstd')
+            return zstandard.ZstdDecompressor().stream_reader(f_raw, read_size=DecompressingReader.RAW_BUFFER_SIZE)
+        raise ValueError(f'compression must be one of these: {", ".join(DecompressingReader.MAGIC_BYTES)}')
+
+    def __decompress(self, block_size: int) -> None:
+        """decompresses the file in blocks and puts them in the queue, run by the thread
+
+        :param block_size: number of decompressed bytes of every block
+        :type block_size: int
+        """
+        try:
+            while True:
+                block = self.__stream.read(block_size)
+                if not self.__put(block) or not block:
+                    return
+        except Exception as e:
+            self.__error = e
+            self.__put(b'')
+
+    def __put(self, block: bytes) -> bool:
+        """puts a block in the queue, waiting until there is space or the reader is closed
+
+        :param block: the block
+        :type block: bytes
+        :return: False if the reader has been closed
+        :rtype: bool
+        """
+        while not self.__closed.is_set():
+            try:
+                self.__blocks.put(block, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def __fill_buffer(self) -> None:
+        """gets the next block from the queue if the buffer is empty
+
+        :raises Exception: the exception raised by the thread while decompressing
+        """
+        if self.__buffer or self.__eof:
+            return
+        self.__buffer = self.__blocks.get()
+        if not self.__buffer:
+            self.__eof = True
+            if self.__error is not None:
+                raise self.__error
+
+    def read(self, size: int=-1) -> bytes:
+        """reads up to size decompressed bytes, at most the bytes of one block
+
+        :param size: max number of bytes to read, -1 for the rest of the block, defaults to -1
+        :type size: int, optional
+        :return: the bytes read, empty at the end of the file
+        :rtype: bytes
+        """
+        self.__fill_buffer()
+        if size < 0 or size >= len(self.__buffer):
+            block, self.__buffer = self.__buffer, b''
+        else:
+            block, self.__buffer = self.__buffer[:size], self.__buffer[size:]
+        return block
+
+    def readline(self) -> bytes:
+        """reads a decompressed line
+
+        :return: the line with the new line, empty at the end of the file
+        :rtype: bytes
+        """
+        line = b''
+        while True:
+            self.__fill_buffer()
+            if not self.__buffer:
+                return line
+            end = self.__buffer.find(b'\n') + 1
+            if end > 0:
+                line += self.__buffer[:end]
+                self.__buffer = self.__buffer[end:]
+                return line
+            line += self.__buffer
+            self.__buffer = b''
+
+    def get_compressed_position(self) -> int:
+        """returns the number of bytes of the compressed file read by the decompressor, used to show the progress
+
+        :return: the position in the compressed file
+        :rtype: int
+        """
+        return self.__f_raw.tell()
+
+    def close(self) -> None:
+        """stops the thread and closes the file
+        """
+        self.__closed.set()
+        self.__thread.join()
+        self.__stream.close()
+        self.__f_raw.close()
+
+    def __enter__(self) -> 'DecompressingReader':
+        """returns this reader at the start of a with statement
+
+        :return: this reader
+        :rtype: DecompressingReader
+        """
+        return self
+
+    def __exit__(self, *args) -> None:
+        """closes this reader at the end of a with statement
+        """
+        self.close()
@@ -1,26 +1,29 @@
 from DiscretizerModule.Discretizer import Discretizer
 from .EventHistory import EventHistory
 from .CONN_STATE import CONN_STATE
+from .Codebook import Codebook
 
 class Event:
     '''
     Class of a single event registered
 
     This class contains all of the data that are going to be used
-    to classify an event
+    to classify an event, the numeric attributes are parsed when the event is read
+    and they are nan if they are missing ('-' in the conn.log). service and conn_state are stored
+    as codes of the codebooks SERVICES and CONN_STATES, shared by all the events
 
     :param ts: timestamp of this event
     :type ts: str
-    :param service: An identification of an application protocol being sent over the event.
-    :type service: str
+    :param service: An identification of an application protocol being sent over the event, as code of SERVICES
+    :type service: int
     :param duration: How long the event lasted. For 3-way or 4-way event tear-downs, this will not include the final ACK.
     :type duration: float
     :param orig_bytes: number of bytes sent by the origin
     :type orig_bytes: float
     :param resp_bytes: number of bytes sent by the responder
     :type resp_bytes: float
-    :param conn_state: state of this event
-    :type conn_state: CONN_STATE
+    :param conn_state: state of this event, as code of CONN_STATES
+    :type conn_state: int
     :param missed_bytes: bytes missed during this event
     :type missed_bytes: float
     :param history: state history of this event.
@@ -50,6 +53,9 @@ class Event:
     :type disc_resp_pkts: Discretizer
     :param disc_resp_ip_bytes: Discretizer of the relative attribute
     :type disc_resp_ip_bytes: Discretizer
+    :param discretized_codes: code of the bin of every attribute in DISCRETIZED_ATTRIBUTES, computed once by set_discretized_codes,
+        None if the bins are computed by every call of the get_discretized methods
+    :type discretized_codes: bytes
     '''
     disc_duration: Discretizer = None
     disc_orig_bytes: Discretizer = None
@@ -59,6 +65,20 @@ class Event:
     disc_orig_ip_bytes: Discretizer = None
     disc_resp_pkts: Discretizer = None
     disc_resp_ip_bytes: Discretizer = None
+    # codebooks of service and conn_state, the events store the codes of their values
+    SERVICES = Codebook()
+    CONN_STATES = Codebook()
+    # order of the codes of the discretized attributes given to set_discretized_codes
+    DISCRETIZED_ATTRIBUTES = [
+        'duration', 'orig_bytes', 'resp_bytes', 'missed_bytes', 'orig_pkts', 'orig_ip_bytes', 'resp_pkts', 'resp_ip_bytes',
+        'orig_syn', 'orig_fin', 'orig_syn_ack', 'orig_rst', 'resp_syn', 'resp_fin', 'resp_syn_ack', 'resp_rst',
+        'orig_bad_checksum', 'orig_content_gap', 'orig_retransmitted_payload', 'orig_zero_window',
+        'resp_bad_checksum', 'resp_content_gap', 'resp_retransmitted_payload', 'resp_zero_window',
+    ]
+    # position of every discretized attribute in the codes
+    DISCRETIZED_INDICES = {attribute: i for i, attribute in enumerate(DISCRETIZED_ATTRIBUTES)}
+    # the codes are stored in one byte, the bins have codes from 0 to 254 and 255 is stored for the values out of bounds
+    OUT_OF_BOUNDS_CODE = 255
 
     def __init__(self, 
             ts: str,
@@ -101,17 +121,40 @@ class Event:
         :type resp_ip_bytes: float
         """             
         self.__ts = ts
-        self.__service = service
+        self.__service = Event.SERVICES.encode(service)
         self.__duration = duration
         self.__orig_bytes = orig_bytes
         self.__resp_bytes = resp_bytes
-        self.__conn_state = CONN_STATE.str_to_state(conn_state)
+        self.__conn_state = Event.CONN_STATES.encode(conn_state)
         self.__missed_bytes = missed_bytes
-        self.__history = EventHistory(history)
+        self.__history = EventHistory.intern(history)
         self.__orig_pkts = orig_pkts
         self.__orig_ip_bytes = orig_ip_bytes
         self.__resp_pkts = resp_pkts
         self.__resp_ip_bytes = resp_ip_bytes
+        self.__discretized_codes = None
+
+    def __getstate__(self) -> dict:
+        """the codes are of the codebooks of this process, service and conn_state are pickled as their values,
+        e.g. when the events are sent back by the worker processes
+
+        :return: the attributes of this object
+        :rtype: dict
+        """
+        state = self.__dict__.copy()
+        state['_Event__service'] = self.get_service()
+        state['_Event__conn_state'] = Event.CONN_STATES.decode(self.__conn_state)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """encodes service and conn_state with the codebooks of this process when unpickled
+
+        :param state: the attributes of the object
+        :type state: dict
+        """
+        state['_Event__service'] = Event.SERVICES.encode(state['_Event__service'])
+        state['_Event__conn_state'] = Event.CONN_STATES.encode(state['_Event__conn_state'])
+        self.__dict__.update(state)
 
     def __repr__(self) -> str:
         """returns a string version of this object
@@ -122,10 +165,10 @@ class Event:
         from datetime import datetime
         return f'''
     connection created at {datetime.fromtimestamp(float(self.__ts))}
-    using the {self.__service} service
+    using the {self.get_service()} service
     lasted {self.__duration} seconds
     the originator sent {self.__orig_bytes} and the responder sent {self.__resp_bytes}
-    the state of the connection is {CONN_STATE.state_to_str(self.__conn_state)}
+    the state of the connection is {CONN_STATE.state_to_str(self.get_conn_state())}
     {self.__missed_bytes} bytes were missed during the lifetime of this connection
     the history of this connection is {self.__history.get_history()}
     the orginator sent {self.__orig_pkts} ({self.__orig_ip_bytes} bytes in the packet header)
@@ -155,6 +198,14 @@ class Event:
         :return: the value of service
         :rtype: str
         """
+        return Event.SERVICES.decode(self.__service)
+
+    def get_service_code(self) -> int:
+        """Getter of the code of service in SERVICES
+
+        :return: the code of service
+        :rtype: int
+        """
         return self.__service
 
     def get_duration(self) -> float:
@@ -187,6 +238,14 @@ class Event:
         :return: the value of conn_state
         :rtype: CONN_STATE
         """
+        return CONN_STATE.str_to_state(Event.CONN_STATES.decode(self.__conn_state))
+
+    def get_conn_state_code(self) -> int:
+        """Getter of the code of conn_state in CONN_STATES
+
+        :return: the code of conn_state
+        :rtype: int
+        """
         return self.__conn_state
 
     def get_missed_bytes(self) -> float:
@@ -434,15 +493,40 @@ class Event:
 
     ###### DISCRETIZED EVENT ######
 
+    def set_discretized_codes(self, codes: bytes) -> None:
+        """Setter of the codes of the bins of the discretized attributes, so that the get_discretized methods
+        don't discretize the values again
+
+        :param codes: code of the bin of every attribute in DISCRETIZED_ATTRIBUTES (OUT_OF_BOUNDS_CODE if the value is not in any bin), None to discretize the values again
+        :type codes: bytes | None
+        """
+        self.__discretized_codes = codes
+
+    def __get_discretized(self, attribute: str, discretizer: Discretizer, value) -> str:
+        """returns the bin of a value from its code if the codes have been set, otherwise it discretizes the value (a missing value is discretized as 0)
+
+        :param attribute: name of the attribute, one of DISCRETIZED_ATTRIBUTES
+        :type attribute: str
+        :param discretizer: discretizer of the attribute
+        :type discretizer: Discretizer
+        :param value: value of the attribute
+        :type value: float
+        :return: the bin of the value, 'n/a' if the attribute is not discretized
+        :rtype: str
+        """
+        if discretizer is None:
+            return 'n/a'
+        if self.__discretized_codes is not None:
+            return discretizer.get_label_of_code(self.__discretized_codes[Event.DISCRETIZED_INDICES[attribute]])
+        return discretizer.discretize_attribute(value if value == value else 0.0)
+
     def get_discretized_duration(self) -> str:
         """Returns the discretized value of this objects duration
 
         :return: the discretized value of duration
         :rtype: str
         """
-        if self.__duration == '-':
-            self.__duration = 0
-        return Event.disc_duration.discretize_attribute(float(self.__duration)) if Event.disc_duration is not None else 'n/a'
+        return self.__get_discretized('duration', Event.disc_duration, self.__duration)
     
     def get_discretized_orig_bytes(self) -> str:
         """Returns the discretized value of this objects orig_bytes
@@ -450,9 +534,7 @@ class Event:
         :return: the discretized value of orig_bytes
         :rtype: str
         """
-        if self.__orig_bytes == '-':
-            self.__orig_bytes = 0
-        return Event.disc_orig_bytes.discretize_attribute(float(self.__orig_bytes)) if Event.disc_orig_bytes is not None else 'n/a'
+        return self.__get_discretized('orig_bytes', Event.disc_orig_bytes, self.__orig_bytes)
 
     def get_discretized_resp_bytes(self) -> str:
         """Returns the discretized value of this objects resp_bytes
@@ -460,9 +542,7 @@ class Event:
         :return: the discretized value of resp_bytes
         :rtype: str
         """
-        if self.__resp_bytes == '-':
-            self.__resp_bytes = 0
-        return Event.disc_resp_bytes.discretize_attribute(float(self.__resp_bytes)) if Event.disc_resp_bytes is not None else 'n/a'
+        return self.__get_discretized('resp_bytes', Event.disc_resp_bytes, self.__resp_bytes)
 
     def get_discretized_missed_bytes(self) -> str:
         """Returns the discretized value of this objects missed_bytes
@@ -470,9 +550,7 @@ class Event:
         :return: the discretized value of missed_bytes
         :rtype: str
         """
-        if self.__missed_bytes == '-':
-            self.__missed_bytes = 0
-        return Event.disc_missed_bytes.discretize_attribute(float(self.__missed_bytes)) if Event.disc_missed_bytes is not None else 'n/a'
+        return self.__get_discretized('missed_bytes', Event.disc_missed_bytes, self.__missed_bytes)
 
     def get_discretized_orig_pkts(self) -> str:
         """Returns the discretized value of this objects orig_pkts
@@ -480,9 +558,7 @@ class Event:
         :return: the discretized value of orig_pkts
         :rtype: str
         """
-        if self.__orig_pkts == '-':
-            self.__orig_pkts = 0
-        return Event.disc_orig_pkts.discretize_attribute(float(self.__orig_pkts)) if Event.disc_orig_pkts is not None else 'n/a'
+        return self.__get_discretized('orig_pkts', Event.disc_orig_pkts, self.__orig_pkts)
 
     def get_discretized_orig_ip_bytes(self) -> str:
         """Returns the discretized value of this objects orig_ip_bytes
@@ -490,9 +566,7 @@ class Event:
         :return: the discretized value of orig_ip_bytes
         :rtype: str
         """
-        if self.__orig_ip_bytes == '-':
-            self.__orig_ip_bytes = 0
-        return Event.disc_orig_ip_bytes.discretize_attribute(float(self.__orig_ip_bytes)) if Event.disc_orig_ip_bytes is not None else 'n/a'
+        return self.__get_discretized('orig_ip_bytes', Event.disc_orig_ip_bytes, self.__orig_ip_bytes)
 
     def get_discretized_resp_pkts(self) -> str:
         """Returns the discretized value of this objects resp_pkts
@@ -500,9 +574,7 @@ class Event:
         :return: the discretized value of resp_pkts
         :rtype: str
         """
-        if self.__resp_pkts == '-':
-            self.__resp_pkts = 0
-        return Event.disc_resp_pkts.discretize_attribute(float(self.__resp_pkts)) if Event.disc_resp_pkts is not None else 'n/a'
+        return self.__get_discretized('resp_pkts', Event.disc_resp_pkts, self.__resp_pkts)
 
     def get_discretized_resp_ip_bytes(self) -> str:
         """Returns the discretized value of this objects resp_ip_bytes
@@ -510,9 +582,7 @@ class Event:
         :return: the discretized value of resp_ip_bytes
         :rtype: str
         """
-        if self.__resp_ip_bytes == '-':
-            self.__resp_ip_bytes = 0
-        return Event.disc_resp_ip_bytes.discretize_attribute(float(self.__resp_ip_bytes)) if Event.disc_resp_ip_bytes is not None else 'n/a'
+        return self.__get_discretized('resp_ip_bytes', Event.disc_resp_ip_bytes, self.__resp_ip_bytes)
 
     ###### DISCRETIZED HISTORY ######
 
@@ -522,7 +592,7 @@ class Event:
         :return: the discretized value of orig_syn
         :rtype: str
         """
-        return self.__history.get_discretized_orig_syn()
+        return self.__get_discretized('orig_syn', EventHistory.disc_orig_syn, self.__history.get_orig_syn())
     
     def get_discretized_orig_fin(self) -> str:
         """Returns the discretized value of this objects __history orig_fin
@@ -530,7 +600,7 @@ class Event:
         :return: the discretized value of orig_fin
         :rtype: str
         """
-        return self.__history.get_discretized_orig_fin()
+        return self.__get_discretized('orig_fin', EventHistory.disc_orig_fin, self.__history.get_orig_fin())
     
     def get_discretized_orig_syn_ack(self) -> str:
         """Returns the discretized value of this objects __history orig_syn_ack
@@ -538,7 +608,7 @@ class Event:
         :return: the discretized value of orig_syn_ack
         :rtype: str
         """
-        return self.__history.get_discretized_orig_syn_ack()
+        return self.__get_discretized('orig_syn_ack', EventHistory.disc_orig_syn_ack, self.__history.get_orig_syn_ack())
     
     def get_discretized_orig_rst(self) -> str:
         """Returns the discretized value of this objects __history orig_rst
@@ -546,7 +616,7 @@ class Event:
         :return: the discretized value of orig_rst
         :rtype: str
         """
-        return self.__history.get_discretized_orig_rst()
+        return self.__get_discretized('orig_rst', EventHistory.disc_orig_rst, self.__history.get_orig_rst())
     
     def get_discretized_resp_syn(self) -> str:
         """Returns the discretized value of this objects __history resp_syn
@@ -554,7 +624,7 @@ class Event:
         :return: the discretized value of resp_syn
         :rtype: str
         """
-        return self.__history.get_discretized_resp_syn()
+        return self.__get_discretized('resp_syn', EventHistory.disc_resp_syn, self.__history.get_resp_syn())
     
     def get_discretized_resp_fin(self) -> str:
         """Returns the discretized value of this objects __history resp_fin
@@ -562,7 +632,7 @@ class Event:
         :return: the discretized value of resp_fin
         :rtype: str
         """
-        return self.__history.get_discretized_resp_fin()
+        return self.__get_discretized('resp_fin', EventHistory.disc_resp_fin, self.__history.get_resp_fin())
     
     def get_discretized_resp_syn_ack(self) -> str:
         """Returns the discretized value of this objects __history resp_syn_ack
@@ -570,7 +640,7 @@ class Event:
         :return: the discretized value of resp_syn_ack
         :rtype: str
         """
-        return self.__history.get_discretized_resp_syn_ack()
+        return self.__get_discretized('resp_syn_ack', EventHistory.disc_resp_syn_ack, self.__history.get_resp_syn_ack())
     
     def get_discretized_resp_rst(self) -> str:
         """Returns the discretized value of this objects __history resp_rst
@@ -578,7 +648,7 @@ class Event:
         :return: the discretized value of resp_rst
         :rtype: str
         """
-        return self.__history.get_discretized_resp_rst()
+        return self.__get_discretized('resp_rst', EventHistory.disc_resp_rst, self.__history.get_resp_rst())
     
     def get_discretized_orig_bad_checksum(self) -> str:
         """Returns the discretized value of this objects __history orig_bad_checksum
@@ -586,7 +656,7 @@ class Event:
         :return: the discretized value of orig_bad_checksum
         :rtype: str
         """
-        return self.__history.get_discretized_orig_bad_checksum()
+        return self.__get_discretized('orig_bad_checksum', EventHistory.disc_orig_bad_checksum, self.__history.get_orig_bad_checksum())
     
     def get_discretized_orig_content_gap(self) -> str:
         """Returns the discretized value of this objects __history orig_content_gap
@@ -594,7 +664,7 @@ class Event:
         :return: the discretized value of orig_content_gap
         :rtype: str
         """
-        return self.__history.get_discretized_orig_content_gap()
+        return self.__get_discretized('orig_content_gap', EventHistory.disc_orig_content_gap, self.__history.get_orig_content_gap())
     
     def get_discretized_orig_retransmitted_payload(self) -> str:
         """Returns the discretized value of this objects __history orig_retransmitted_payload
@@ -602,7 +672,7 @@ class Event:
         :return: the discretized value of orig_retransmitted_payload
         :rtype: str
         """
-        return self.__history.get_discretized_orig_retransmitted_payload()
+        return self.__get_discretized('orig_retransmitted_payload', EventHistory.disc_orig_retransmitted_payload, self.__history.get_orig_retransmitted_payload())
     
     def get_discretized_orig_zero_window(self) -> str:
         """Returns the discretized value of this objects __history orig_zero_window
@@ -610,7 +680,7 @@ class Event:
         :return: the discretized value of orig_zero_window
         :rtype: str
         """
-        return self.__history.get_discretized_orig_zero_window()
+        return self.__get_discretized('orig_zero_window', EventHistory.disc_orig_zero_window, self.__history.get_orig_zero_window())
     
     def get_discretized_resp_bad_checksum(self) -> str:
         """Returns the discretized value of this objects __history resp_bad_checksum
@@ -618,7 +688,7 @@ class Event:
         :return: the discretized value of resp_bad_checksum
         :rtype: str
         """
-        return self.__history.get_discretized_resp_bad_checksum()
+        return self.__get_discretized('resp_bad_checksum', EventHistory.disc_resp_bad_checksum, self.__history.get_resp_bad_checksum())
     
     def get_discretized_resp_content_gap(self) -> str:
         """Returns the discretized value of this objects __history resp_content_gap
@@ -626,7 +696,7 @@ class Event:
         :return: the discretized value of resp_content_gap
         :rtype: str
         """
-        return self.__history.get_discretized_resp_content_gap()
+        return self.__get_discretized('resp_content_gap', EventHistory.disc_resp_content_gap, self.__history.get_resp_content_gap())
     
     def get_discretized_resp_retransmitted_payload(self) -> str:
         """Returns the discretized value of this objects __history resp_retransmitted_payload
@@ -634,7 +704,7 @@ class Event:
         :return: the discretized value of resp_retransmitted_payload
         :rtype: str
         """
-        return self.__history.get_discretized_resp_retransmitted_payload()
+        return self.__get_discretized('resp_retransmitted_payload', EventHistory.disc_resp_retransmitted_payload, self.__history.get_resp_retransmitted_payload())
     
     def get_discretized_resp_zero_window(self) -> str:
         """Returns the discretized value of this objects __history resp_zero_window
@@ -642,5 +712,5 @@ class Event:
         :return: the discretized value of resp_zero_window
         :rtype: str
         """
-        return self.__history.get_discretized_resp_zero_window()
+        return self.__get_discretized('resp_zero_window', EventHistory.disc_resp_zero_window, self.__history.get_resp_zero_window())
     
\ No newline at end of file
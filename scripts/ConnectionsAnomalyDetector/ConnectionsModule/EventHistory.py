@@ -3,7 +3,11 @@ from DiscretizerModule.Discretizer import Discretizer
 class EventHistory:
     '''
     Class that manages the history of a single event, takes the string history
-    and according to its characters sets single fields of this object to their value
+    and according to its characters sets single fields of this object to their value.
+
+    The distinct history strings are few compared to the events, so the events share
+    the objects returned by intern (flyweight): every distinct string is analyzed once,
+    its object can't be changed and it remembers its discretized values
 
     :param __history: history to be converted
     :type __history: str
@@ -57,6 +61,10 @@ class EventHistory:
     :type __resp_zero_window: float 
     :param __conn_dir_flipped: Event direction was flipped by Zeek's heuristic
     :type __conn_dir_flipped: bool
+    :param __frozen: true if the object is shared by intern and can't be changed
+    :type __frozen: bool
+    :param __discretized: discretized values already computed, for every attribute the bins used and the value
+    :type __discretized: dict{str: tuple[list, str]}
 
     :param disc_orig_syn: Discretizer of the relative attribute
     :type disc_orig_syn: Discretizer
@@ -116,6 +124,9 @@ class EventHistory:
     disc_resp_retransmitted_payload: Discretizer = None
     disc_resp_zero_window: Discretizer = None
 
+    # shared objects of the distinct history strings
+    __interned: dict = {}
+
     def __init__(self, history: str='') -> None:
         """The constructor initialize the parameters required and if history is given,
         it analyze the string and assigns the relativa values to the fields
@@ -163,9 +174,39 @@ class EventHistory:
 
         # ^
         self.__conn_dir_flipped           = False
+
+        self.__frozen = False
+        self.__discretized = {}
         
         self.analyze_history()
 
+    @classmethod
+    def intern(cls, history: str) -> 'EventHistory':
+        """returns the shared object of a history string, the string is analyzed only
+        the first time it's seen. The object returned can't be changed
+
+        :param history: string to be analyzed
+        :type history: str
+        :return: the shared object of the history
+        :rtype: EventHistory
+        """
+        try:
+            return cls.__interned[history]
+        except KeyError:
+            event_history = cls(history)
+            event_history.__frozen = True
+            return cls.__interned.setdefault(history, event_history)
+
+    def __reduce__(self):
+        """the shared objects are interned again when unpickled, e.g. when they are sent back by the worker processes
+
+        :return: the function and the arguments to rebuild this object
+        :rtype: tuple
+        """
+        if self.__frozen:
+            return (EventHistory.intern, (self.__history,))
+        return super().__reduce__()
+
     def analyze_history(self, history: str=None) -> None:
         """Based on the field history, this analyze the history string and changes
         all the fields of this object. If given a history, this will be analyzed and set
@@ -173,10 +214,14 @@ class EventHistory:
 
         :param history: the history to be analyzed, defaults to None
         :type history: str, optional
+        :raises AttributeError: raised if this object is shared by intern
         """
+        if self.__frozen:
+            raise AttributeError('the EventHistory objects returned by intern can\'t be changed')
 
         if history is not None:
             self.__history = history
+        self.__discretized = {}
 
         for c in self.__history:
             if c == 'S': self.__orig_syn += 1
@@ -503,13 +548,31 @@ class EventHistory:
 
     ##### DISCRETIZATION #####
 
+    def __discretize(self, attribute: str, discretizer: Discretizer, value: float) -> str:
+        """Returns the discretized value of an attribute, computed only once for the same bins
+
+        :param attribute: name of the attribute
+        :type attribute: str
+        :param discretizer: discretizer of the attribute
+        :type discretizer: Discretizer
+        :param value: value of the attribute
+        :type value: float
+        :return: the discretized value
+        :rtype: str
+        """
+        bins = discretizer.get_discretized_bins()
+        cached = self.__discretized.get(attribute)
+        if cached is None or cached[0] is not bins:
+            cached = self.__discretized[attribute] = (bins, discretizer.discretize_attribute(value))
+        return cached[1]
+
     def get_discretized_orig_syn(self) -> str:
         """Returns the discretized value of this objects orig_syn
 
         :return: the discretized value of orig_syn
         :rtype: str
         """
-        return EventHistory.disc_orig_syn.discretize_attribute(self.__orig_syn)
+        return self.__discretize('orig_syn', EventHistory.disc_orig_syn, self.__orig_syn)
     
     def get_discretized_orig_fin(self) -> str:
         """Returns the discretized value of this objects orig_fin
@@ -517,7 +580,7 @@ class EventHistory:
         :return: the discretized value of orig_fin
         :rtype: str
         """
-        return EventHistory.disc_orig_fin.discretize_attribute(self.__orig_fin)
+        return self.__discretize('orig_fin', EventHistory.disc_orig_fin, self.__orig_fin)
 
     def get_discretized_orig_syn_ack(self) -> str:
         """Returns the discretized value of this objects orig_syn_ack
@@ -525,7 +588,7 @@ class EventHistory:
         :return: the discretized value of orig_syn_ack
         :rtype: str
         """
-        return EventHistory.disc_orig_syn_ack.discretize_attribute(self.__orig_syn_ack)
+        return self.__discretize('orig_syn_ack', EventHistory.disc_orig_syn_ack, self.__orig_syn_ack)
 
     def get_discretized_orig_rst(self) -> str:
         """Returns the discretized value of this objects orig_rst
@@ -533,7 +596,7 @@ class EventHistory:
         :return: the discretized value of orig_rst
         :rtype: str
         """
-        return EventHistory.disc_orig_rst.discretize_attribute(self.__orig_rst)
+        return self.__discretize('orig_rst', EventHistory.disc_orig_rst, self.__orig_rst)
 
     def get_discretized_resp_syn(self) -> str:
         """Returns the discretized value of this objects resp_syn
@@ -541,7 +604,7 @@ class EventHistory:
         :return: the discretized value of resp_syn
         :rtype: str
         """
-        return EventHistory.disc_resp_syn.discretize_attribute(self.__resp_syn)
+        return self.__discretize('resp_syn', EventHistory.disc_resp_syn, self.__resp_syn)
 
     def get_discretized_resp_fin(self) -> str:
         """Returns the discretized value of this objects resp_fin
@@ -549,7 +612,7 @@ class EventHistory:
         :return: the discretized value of resp_fin
         :rtype: str
         """
-        return EventHistory.disc_resp_fin.discretize_attribute(self.__resp_fin)
+        return self.__discretize('resp_fin', EventHistory.disc_resp_fin, self.__resp_fin)
 
     def get_discretized_resp_syn_ack(self) -> str:
         """Returns the discretized value of this objects resp_syn_ack
@@ -557,7 +620,7 @@ class EventHistory:
         :return: the discretized value of resp_syn_ack
         :rtype: str
         """
-        return EventHistory.disc_resp_syn_ack.discretize_attribute(self.__resp_syn_ack)
+        return self.__discretize('resp_syn_ack', EventHistory.disc_resp_syn_ack, self.__resp_syn_ack)
 
     def get_discretized_resp_rst(self) -> str:
         """Returns the discretized value of this objects resp_rst
@@ -565,7 +628,7 @@ class EventHistory:
         :return: the discretized value of resp_rst
         :rtype: str
         """
-        return EventHistory.disc_resp_rst.discretize_attribute(self.__resp_rst)
+        return self.__discretize('resp_rst', EventHistory.disc_resp_rst, self.__resp_rst)
 
     def get_discretized_orig_bad_checksum(self) -> str:
         """Returns the discretized value of this objects orig_bad_checksum
@@ -573,7 +636,7 @@ class EventHistory:
         :return: the discretized value of orig_bad_checksum
         :rtype: str
         """
-        return EventHistory.disc_orig_bad_checksum.discretize_attribute(self.__orig_bad_checksum)
+        return self.__discretize('orig_bad_checksum', EventHistory.disc_orig_bad_checksum, self.__orig_bad_checksum)
 
     def get_discretized_orig_content_gap(self) -> str:
         """Returns the discretized value of this objects orig_content_gap
@@ -581,7 +644,7 @@ class EventHistory:
         :return: the discretized value of orig_content_gap
         :rtype: str
         """
-        return EventHistory.disc_orig_content_gap.discretize_attribute(self.__orig_content_gap)
+        return self.__discretize('orig_content_gap', EventHistory.disc_orig_content_gap, self.__orig_content_gap)
 
     def get_discretized_orig_retransmitted_payload(self) -> str:
         """Returns the discretized value of this objects orig_retransmitted_payload
@@ -589,7 +652,7 @@ class EventHistory:
         :return: the discretized value of orig_retransmitted_payload
         :rtype: str
         """
-        return EventHistory.disc_orig_retransmitted_payload.discretize_attribute(self.__orig_retransmitted_payload)
+        return self.__discretize('orig_retransmitted_payload', EventHistory.disc_orig_retransmitted_payload, self.__orig_retransmitted_payload)
 
     def get_discretized_orig_zero_window(self) -> str:
         """Returns the discretized value of this objects orig_zero_window
@@ -597,7 +660,7 @@ class EventHistory:
         :return: the discretized value of orig_zero_window
         :rtype: str
         """
-        return EventHistory.disc_orig_zero_window.discretize_attribute(self.__orig_zero_window)
+        return self.__discretize('orig_zero_window', EventHistory.disc_orig_zero_window, self.__orig_zero_window)
 
     def get_discretized_resp_bad_checksum(self) -> str:
         """Returns the discretized value of this objects resp_bad_checksum
@@ -605,7 +668,7 @@ class EventHistory:
         :return: the discretized value of resp_bad_checksum
         :rtype: str
         """
-        return EventHistory.disc_resp_bad_checksum.discretize_attribute(self.__resp_bad_checksum)
+        return self.__discretize('resp_bad_checksum', EventHistory.disc_resp_bad_checksum, self.__resp_bad_checksum)
 
     def get_discretized_resp_content_gap(self) -> str:
         """Returns the discretized value of this objects resp_content_gap
@@ -613,7 +676,7 @@ class EventHistory:
         :return: the discretized value of resp_content_gap
         :rtype: str
         """
-        return EventHistory.disc_resp_content_gap.discretize_attribute(self.__resp_content_gap)
+        return self.__discretize('resp_content_gap', EventHistory.disc_resp_content_gap, self.__resp_content_gap)
 
     def get_discretized_resp_retransmitted_payload(self) -> str:
         """Returns the discretized value of this objects resp_retransmitted_payload
@@ -621,7 +684,7 @@ class EventHistory:
         :return: the discretized value of resp_retransmitted_payload
         :rtype: str
         """
-        return EventHistory.disc_resp_retransmitted_payload.discretize_attribute(self.__resp_retransmitted_payload)
+        return self.__discretize('resp_retransmitted_payload', EventHistory.disc_resp_retransmitted_payload, self.__resp_retransmitted_payload)
 
     def get_discretized_resp_zero_window(self) -> str:
         """Returns the discretized value of this objects resp_zero_window
@@ -629,5 +692,5 @@ class EventHistory:
         :return: the discretized value of resp_zero_window
         :rtype: str
         """
-        return EventHistory.disc_resp_zero_window.discretize_attribute(self.__resp_zero_window)
+        return self.__discretize('resp_zero_window', EventHistory.disc_resp_zero_window, self.__resp_zero_window)
 
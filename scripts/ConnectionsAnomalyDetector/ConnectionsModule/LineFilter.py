@@ -0,0 +1,161 @@
+import re
+
+class LineFilter:
+    """
+    Filter of the lines of the conn.log compiled once from an expression and evaluated on the split fields of every line,
+    before the events and the traces are created, so that the lines filtered out cost only the split.
+
+    The expression is a list of conditions separated by ';' and a line is kept if all of them are true.
+    Every condition is field=values (or field==values) or field!=values, where values is a list separated by ',' and
+    the condition is true if the field is (or with != is not) one of the values:
+        * orig_ip, resp_ip: addresses or networks in CIDR notation (e.g. 192.168.10.0/24), ip is true if orig_ip or resp_ip is
+        * orig_port, resp_port: ports or ranges of ports (e.g. 1024-65535), port is true if orig_port or resp_port is
+        * proto, service: strings (e.g. tcp)
+        * ts: ranges of timestamps start-end, where start or end can be omitted (e.g. 1499342400-1499346000)
+
+    for example: ip=192.168.10.0/24;proto=tcp;resp_port!=53
+
+    The result of the conditions on ips, ports, proto and service is computed once for every distinct value
+
+    :param __expression: the expression of the filter
+    :type __expression: str
+    :param __conditions: for every condition the positions of the fields, the kind of values, the values, whether it's negated and the results already computed
+    :type __conditions: list[tuple[tuple[int], str, list, bool, dict]]
+    """
+    # field, operator and values of a condition
+    CONDITION_PATTERN = re.compile(r'^\s*(\w+)\s*(!=|==|=)\s*(.+)$')
+    # characters of the operators, not valid in the values
+    OPERATOR_CHARACTERS = '=<>!'
+    # position in the lines of the conn.log of the fields that can be filtered and the kind of their values
+    FIELDS = {
+        'ts': ((0,), 'ts'),
+        'orig_ip': ((2,), 'ip'),
+        'resp_ip': ((4,), 'ip'),
+        'ip': ((2, 4), 'ip'),
+        'orig_port': ((3,), 'port'),
+        'resp_port': ((5,), 'port'),
+        'port': ((3, 5), 'port'),
+        'proto': ((6,), 'string'),
+        'service': ((7,), 'string'),
+    }
+
+    def __init__(self, expression: str) -> None:
+        """Constructor, compiles the expression
+
+        :param expression: the expression of the filter
+        :type expression: str
+        :raises ValueError: raised if a condition of the expression is not valid
+        """
+        self.__expression = expression
+        self.__conditions = [LineFilter.__compile_condition(condition.strip()) for condition in expression.split(';') if condition.strip() != '']
+
+    def __repr__(self) -> str:
+        """returns a string version of this object
+
+        :return: string version of this object
+        :rtype: str
+        """
+        return f'LineFilter({self.__expression!r})'
+
+    def get_expression(self) -> str:
+        """Getter of the expression of the filter
+
+        :return: the expression
+        :rtype: str
+        """
+        return self.__expression
+
+    @staticmethod
+    def __compile_condition(condition: str) -> tuple:
+        """converts a condition of the expression to the positions of its fields and its parsed values
+
+        :param condition: condition as field=values, field==values or field!=values
+        :type condition: str
+        :return: the positions of the fields, the kind of values, the values, whether it's negated and an empty dict for the results
+        :rtype: tuple[tuple[int], str, list, bool, dict]
+        :raises ValueError: raised if the condition is not valid
+        """
+        import ipaddress
+
+        match = LineFilter.CONDITION_PATTERN.match(condition)
+        if match is None:
+            raise ValueError(f'not valid filter condition: {condition}, the conditions are field=values or field!=values')
+        field, operator, values = match.groups()
+        if field not in LineFilter.FIELDS:
+            raise ValueError(f'not valid filter condition: {condition}, the fields are: {", ".join(LineFilter.FIELDS)}')
+        if any(character in values for character in LineFilter.OPERATOR_CHARACTERS):
+            raise ValueError(f'not valid values in the filter condition: {condition}, the values can\'t contain {", ".join(LineFilter.OPERATOR_CHARACTERS)}')
+        negated = operator == '!='
+        indices, kind = LineFilter.FIELDS[field]
+        values = [value.strip() for value in values.split(',') if value.strip() != '']
+        if not values:
+            raise ValueError(f'not valid filter condition: {condition}, there are no values')
+
+        try:
+            if kind == 'ip':
+                values = [ipaddress.ip_network(value, strict=False) for value in values]
+            elif kind == 'port' or kind == 'ts':
+                ranges = []
+                for value in values:
+                    start, separator, end = value.partition('-')
+                    if kind == 'port':
+                        ranges.append((int(start), int(end) if separator else int(start)))
+                    else:
+                        ranges.append((float(start) if start else float('-inf'), float(end) if end else float('inf')))
+                values = ranges
+            else:
+                values = set(values)
+        except ValueError:
+            raise ValueError(f'not valid values in the filter condition: {condition}')
+        return indices, kind, values, negated, {}
+
+    @staticmethod
+    def __is_in_values(kind: str, values: list, value: str) -> bool:
+        """checks if the value of a field is one of the values of a condition
+
+        :param kind: the kind of the values (ip, port, ts or string)
+        :type kind: str
+        :param values: the parsed values of the condition
+        :type values: list
+        :param value: value of the field in the line
+        :type value: str
+        :return: True if the value is one of the values
+        :rtype: bool
+        """
+        import ipaddress
+
+        try:
+            if kind == 'ip':
+                address = ipaddress.ip_address(value)
+                return any(address in network for network in values)
+            if kind == 'port' or kind == 'ts':
+                value = int(value) if kind == 'port' else float(value)
+                return any(start <= value <= end for start, end in values)
+        except ValueError: # '-' or a value not valid
+            return False
+        return value in values
+
+    def match(self, list_to_pack: list) -> bool:
+        """checks if a line satisfies all the conditions of the filter
+
+        :param list_to_pack: fields of the line
+        :type list_to_pack: list[str]
+        :return: True if the line has to be kept
+        :rtype: bool
+        """
+        for indices, kind, values, negated, results in self.__conditions:
+            matched = False
+            for index in indices:
+                value = list_to_pack[index]
+                if kind == 'ts':
+                    matched = LineFilter.__is_in_values(kind, values, value)
+                else:
+                    try:
+                        matched = results[value]
+                    except KeyError:
+                        matched = results[value] = LineFilter.__is_in_values(kind, values, value)
+                if matched:
+                    break
+            if matched == negated:
+                return False
+        return True
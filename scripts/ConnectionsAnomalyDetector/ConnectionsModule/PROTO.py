@@ -19,13 +19,8 @@ class PROTO(Enum):
         :type val: str
         :return: the value relative to the string
         :rtype: int
-        """        
-        if val == 'icmp':
-            return cls.ICMP
-        elif val == 'tcp':
-            return cls.TCP
-        elif val == 'udp':
-            return cls.UDP
+        """
+        return _PROTOS.get(val)
     
     @classmethod
     def proto_to_str(cls, proto: int) -> str:
@@ -35,10 +30,9 @@ class PROTO(Enum):
         :type val: int
         :return: the string relative to the value
         :rtype: str
-        """  
-        if proto == cls.ICMP:
-            return 'icmp'
-        if proto == cls.TCP:
-            return 'tcp'
-        if proto == cls.UDP:
-            return 'udp'
\ No newline at end of file
+        """
+        return _PROTO_NAMES.get(proto)
+
+# conversions built once from the members, the strings of the conn.log are the lowercase names
+_PROTOS = {proto.name.lower(): proto for proto in PROTO}
+_PROTO_NAMES = {proto: name for name, proto in _PROTOS.items()}
\ No newline at end of file
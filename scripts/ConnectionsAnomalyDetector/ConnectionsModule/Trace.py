@@ -1,3 +1,4 @@
+from functools import lru_cache
 from .Event import Event
 from .PROTO import PROTO
 from .CONN_LABEL import CONN_LABEL
@@ -25,6 +26,11 @@ class Trace:
     :type label: float
     """
 
+    # code of the protocols in the keys of generate_key_static, 0 if the protocol is unknown
+    PROTO_CODES = {'icmp': PROTO.ICMP.value, 'tcp': PROTO.TCP.value, 'udp': PROTO.UDP.value}
+    # max number of addresses whose conversion is kept by generate_key_static
+    IP_CACHE_SIZE = 65536
+
     def __init__(self, orig_ip: str, orig_port: str, resp_ip: str, resp_port: str, proto: str, ts_on_open: str, label: str):
         """Constructor
 
@@ -44,9 +50,9 @@ class Trace:
         :type label: float
         """        
         self.__orig_ip: str = orig_ip
-        self.__orig_port: int = int(orig_port)
+        self.__orig_port: int = Trace.__port_to_int(orig_port)
         self.__resp_ip: str = resp_ip
-        self.__resp_port: int = int(resp_port)
+        self.__resp_port: int = Trace.__port_to_int(resp_port)
         self.__proto: PROTO = PROTO.str_to_proto(proto)
         self.__ts_on_open: str = ts_on_open
         self.__label: str = CONN_LABEL.str_to_conn_label(label)
@@ -180,6 +186,63 @@ with label: {CONN_LABEL.conn_label_to_str(self.__label)}
         """        
         return f"{orig_ip} {orig_port} {resp_ip} {resp_port} {PROTO.str_to_proto(proto)}"
 
+    @staticmethod
+    def __port_to_int(port: str):
+        """converts a port to an int
+
+        :param port: the port
+        :type port: str
+        :return: the port as an int, the string itself if it is not a number (like the '-' of a missing port)
+        :rtype: int | str
+        """
+        try:
+            return int(port)
+        except ValueError:
+            return port
+
+    @staticmethod
+    @lru_cache(maxsize=IP_CACHE_SIZE)
+    def __ip_to_int(ip: str):
+        """converts an IPv4 or IPv6 address to an int, the IPv6 ones have the bit 128 set so that they are different from the IPv4 ones.
+        The last IP_CACHE_SIZE addresses converted are cached
+
+        :param ip: the address
+        :type ip: str
+        :return: the address as an int, the string itself if it is not an address
+        :rtype: int | str
+        """
+        import socket
+
+        try:
+            return int.from_bytes(socket.inet_pton(socket.AF_INET, ip), 'big')
+        except OSError:
+            try:
+                return int.from_bytes(socket.inet_pton(socket.AF_INET6, ip), 'big') | (1 << 128)
+            except OSError:
+                return ip
+
+    @classmethod
+    def generate_key_static(cls, orig_ip: str, orig_port: str, resp_ip: str, resp_port: str, proto: str) -> tuple:
+        """
+        generate the key used to group the events of a trace, the same connection of generate_id_static
+        but as a tuple of ints (addresses, ports and the code of the protocol) that is smaller and faster to hash.
+        The addresses seen recently are converted only once
+
+        :param orig_ip: orig_ip of the trace
+        :type orig_ip: str
+        :param orig_port: orig_port of the trace
+        :type orig_port: str
+        :param resp_ip: resp_ip of the trace
+        :type resp_ip: str
+        :param resp_port: resp_port of the trace
+        :type resp_port: str
+        :param proto: proto of the trace
+        :type proto: str
+        :return: generated key
+        :rtype: tuple[int, int, int, int, int]
+        """
+        return (cls.__ip_to_int(orig_ip), cls.__port_to_int(orig_port), cls.__ip_to_int(resp_ip), cls.__port_to_int(resp_port), cls.PROTO_CODES.get(proto, 0))
+
     def generate_id(self) -> str:
         """
         generate the id for this trace based on origin ip, origin port, responder ip, responder port and protocol of this oject
@@ -211,7 +274,7 @@ with label: {CONN_LABEL.conn_label_to_str(self.__label)}
         :return: the list of all the value of duration
         :rtype: list[float]
         """
-        return [float(event.get_duration()) if event.get_duration() != '-' else 0 for event in self.__events]
+        return [value if value == value else 0 for value in map(Event.get_duration, self.__events)]
 
     def get_list_of_orig_bytes(self) -> list:
         """Getter of the orig_bytes of the events in this trace
@@ -219,7 +282,7 @@ with label: {CONN_LABEL.conn_label_to_str(self.__label)}
         :return: the list of all the value of orig_bytes
         :rtype: list[float]
         """
-        return [float(event.get_orig_bytes()) if event.get_orig_bytes() != '-' else 0 for event in self.__events]
+        return [value if value == value else 0 for value in map(Event.get_orig_bytes, self.__events)]
 
     def get_list_of_resp_bytes(self) -> list:
         """Getter of the resp_bytes of the events in this trace
@@ -227,7 +290,7 @@ with label: {CONN_LABEL.conn_label_to_str(self.__label)}
         :return: the list of all the value of resp_bytes
         :rtype: list[float]
         """
-        return [float(event.get_resp_bytes()) if event.get_resp_bytes() != '-' else 0 for event in self.__events]
+        return [value if value == value else 0 for value in map(Event.get_resp_bytes, self.__events)]
 
     def get_list_of_conn_state(self) -> list:
         """Getter of the conn_state of the events in this trace
@@ -243,7 +306,7 @@ with label: {CONN_LABEL.conn_label_to_str(self.__label)}
         :return: the list of all the value of missed_bytes
         :rtype: list[float]
         """
-        return [float(event.get_missed_bytes()) if event.get_missed_bytes() != '-' else 0 for event in self.__events]
+        return [value if value == value else 0 for value in map(Event.get_missed_bytes, self.__events)]
 
     def get_list_of_history(self) -> list:
         """Getter of the history of the events in this trace
@@ -259,7 +322,7 @@ with label: {CONN_LABEL.conn_label_to_str(self.__label)}
         :return: the list of all the value of orig_pkts
         :rtype: list[float]
         """
-        return [float(event.get_orig_pkts()) if event.get_orig_pkts() != '-' else 0 for event in self.__events]
+        return [value if value == value else 0 for value in map(Event.get_orig_pkts, self.__events)]
 
     def get_list_of_orig_ip_bytes(self) -> list:
         """Getter of the orig_ip_bytes of the events in this trace
@@ -267,7 +330,7 @@ with label: {CONN_LABEL.conn_label_to_str(self.__label)}
         :return: the list of all the value of orig_ip_bytes
         :rtype: list[float]
         """
-        return [float(event.get_orig_ip_bytes()) if event.get_orig_ip_bytes() != '-' else 0 for event in self.__events]
+        return [value if value == value else 0 for value in map(Event.get_orig_ip_bytes, self.__events)]
 
     def get_list_of_resp_pkts(self) -> list:
         """Getter of the resp_pkts of the events in this trace
@@ -275,7 +338,7 @@ with label: {CONN_LABEL.conn_label_to_str(self.__label)}
         :return: the list of all the value of resp_pkts
         :rtype: list[float]
         """
-        return [float(event.get_resp_pkts()) if event.get_resp_pkts() != '-' else 0 for event in self.__events]
+        return [value if value == value else 0 for value in map(Event.get_resp_pkts, self.__events)]
 
     def get_list_of_resp_ip_bytes(self) -> list:
         """Getter of the resp_ip_bytes of the events in this trace
@@ -283,7 +346,7 @@ with label: {CONN_LABEL.conn_label_to_str(self.__label)}
         :return: the list of all the value of resp_ip_bytes
         :rtype: list[float]
         """
-        return [float(event.get_resp_ip_bytes()) if event.get_resp_ip_bytes() != '-' else 0 for event in self.__events]
+        return [value if value == value else 0 for value in map(Event.get_resp_ip_bytes, self.__events)]
 
     def get_list_of_discretized_duration(self) -> list:
         """Getter of the discretized duration in this trace
@@ -1,10 +1,24 @@
 from ConnectionsModule.EventHistory import EventHistory
 from .Trace import Trace
 from .Event import Event
+from .TracesStore import TracesStore
+from .TracesView import TracesView
+from .LineFilter import LineFilter
+from .DecompressingReader import DecompressingReader
+from .ZeekJsonParser import ZeekJsonParser
+from .PROTO import PROTO
+from .CONN_LABEL import CONN_LABEL
+from .CONN_STATE import CONN_STATE
 from DiscretizerModule.Equal_Frequency_Discretizer import Equal_Frequency_Discretizer
 from DiscretizerModule.Equal_Width_Discretizer import Equal_Width_Discretizer
+from DiscretizerModule.Logarithmic_Discretizer import Logarithmic_Discretizer
 from DiscretizerModule.DISCRETIZATION_TYPE import DISCRETIZATION_TYPE
+from DiscretizerModule.Discretizer import Discretizer
+from DiscretizerModule.QuantileSketch import QuantileSketch
+from DiscretizerModule.DiscretizationBundle import DiscretizationBundle
 from tqdm import tqdm
+from math import nan
+from xml.etree.ElementTree import Element, SubElement, tostring
 
 class TracesController:
     """
@@ -20,15 +34,80 @@ class TracesController:
     :type lines_to_remove_ash: set[str]
     :param strings_to_filter_event: set of string to be filtered out
     :type strings_to_filter_event: set[str]
+    :param line_filter: filter of the lines evaluated before creating their events, None to keep all the lines
+    :type line_filter: LineFilter
     :param network_traffic: list of the Trace
     :type network_traffic: list[Trace]
-    :param traces_pos_dict: dict that contains the indices of network_traffic
-    :type traces_pos_dict: dict{str: int}
+    :param traces_pos_dict: dict that contains the indices of network_traffic, the key is the one of Trace.generate_key_static
+    :type traces_pos_dict: dict{tuple: int}
+    :param n_workers: number of processes that read the input file and fit the discretizers in parallel (1: serial, 0: one per core)
+    :type n_workers: int
+    :param traces_store: columnar store used instead of network_traffic, None if the traces are stored as objects
+    :type traces_store: TracesStore
+    :param sketches: quantile sketches of the attributes, fed while reading, used to create the equal frequency bins
+    :type sketches: dict{str: QuantileSketch}
+    :param sketch_buffers: for every field of the lines needed by the quantile sketches its position and the strings read
+        and not yet added to the sketches
+    :type sketch_buffers: list[tuple[int, list[str]]]
+    :param bin_codes: True if the discretized values are written as the codes of their bins instead of their intervals
+    :type bin_codes: bool
+    :param projection: attributes of the events parsed and stored while reading (history if one of the history attributes is selected)
+    :type projection: set[str]
+    :param json_input: True if the input file is a conn.log written in json instead of tsv, detected when the file is read
+    :type json_input: bool
     """
+    # number of bytes read from the input file at once
+    READ_BLOCK_SIZE = 1 << 22
+    # number of values of every attribute added to the quantile sketches at once
+    SKETCH_BATCH_SIZE = 1 << 12
+    # number of events whose codes of the bins are computed at once
+    CODES_BLOCK_SIZE = 1 << 16
+    # attributes that can be discretized and the class that holds their discretizer
+    DISCRETIZABLE_ATTRIBUTES = {
+        'duration': Event,
+        'orig_bytes': Event,
+        'resp_bytes': Event,
+        'missed_bytes': Event,
+        'orig_pkts': Event,
+        'orig_ip_bytes': Event,
+        'resp_pkts': Event,
+        'resp_ip_bytes': Event,
+        'orig_syn': EventHistory,
+        'orig_fin': EventHistory,
+        'orig_syn_ack': EventHistory,
+        'orig_rst': EventHistory,
+        'resp_syn': EventHistory,
+        'resp_fin': EventHistory,
+        'resp_syn_ack': EventHistory,
+        'resp_rst': EventHistory,
+        'orig_bad_checksum': EventHistory,
+        'orig_content_gap': EventHistory,
+        'orig_retransmitted_payload': EventHistory,
+        'orig_zero_window': EventHistory,
+        'resp_bad_checksum': EventHistory,
+        'resp_content_gap': EventHistory,
+        'resp_retransmitted_payload': EventHistory,
+        'resp_zero_window': EventHistory,
+    }
+    # position in the lines of the conn.log of the attributes that are not in the history
+    FIELD_INDICES = {
+        'duration': 8,
+        'orig_bytes': 9,
+        'resp_bytes': 10,
+        'missed_bytes': 14,
+        'orig_pkts': 16,
+        'orig_ip_bytes': 17,
+        'resp_pkts': 18,
+        'resp_ip_bytes': 19,
+    }
+
     def __init__(self, 
         path_of_file_input: str='',
         path_of_file_xes: str='',
-        strings_to_filter_event: set=set()) -> None:
+        strings_to_filter_event: set=set(),
+        filter_expression: str='',
+        n_workers: int=1,
+        columnar: bool=False) -> None:
         """Constructor method
 
         :param path_of_file_input: path of the file from where to get the events, defaults to ''
@@ -41,12 +120,28 @@ class TracesController:
         :type lines_to_remove_ash: set, optional
         :param strings_to_filter_event: set of the substring to be removed from the lines read in the file (this doesn't delete it from the input file), defaults to set()
         :type strings_to_filter_event: set, optional
+        :param filter_expression: expression of the LineFilter of the lines to keep, '' to keep all the lines, defaults to ''
+        :type filter_expression: str, optional
+        :param n_workers: number of processes that read the input file and fit the discretizers in parallel (1: serial, 0: one per core), defaults to 1
+        :type n_workers: int, optional
+        :param columnar: if true the events are kept in a columnar TracesStore instead of Trace and Event objects, defaults to False
+        :type columnar: bool, optional
         """
         self.__path_of_file_input = path_of_file_input
         self.__path_of_file_xes = path_of_file_xes
         self.__strings_to_filter_event = strings_to_filter_event
+        self.__line_filter = LineFilter(filter_expression) if filter_expression != '' else None
+        self.__n_workers = n_workers
         self.__network_traffic = []
         self.__traces_pos_dict = {}
+        self.__traces_store = TracesStore() if columnar else None
+        self.__sketches = {}
+        self.__sketch_settings = None
+        self.__sketch_buffers = []
+        self.__bin_codes = False
+        self.__projection = set(TracesStore.CATEGORICAL_ATTRIBUTES + TracesStore.NUMERIC_ATTRIBUTES)
+        # parser of the lines of a json conn.log, None if the conn.log is a tsv
+        self.__json_parser = None
     
     def load_paths_and_filters_from_config_file(self, config_file_path: str) -> None:
         """
@@ -72,17 +167,95 @@ class TracesController:
         if 'Filters' in config:
             self.__strings_to_filter_event = config['Filters']['strings_to_filter_event']  if 'strings_to_filter_event' in config['Filters'] else ''
             self.__strings_to_filter_event = self.__strings_to_filter_event.replace('\'', '').split(',')
+            filter_expression = config['Filters']['filter_expression'] if 'filter_expression' in config['Filters'] else ''
+            self.__line_filter = LineFilter(filter_expression) if filter_expression != '' else None
         else:
             self.__strings_to_filter_event = '' 
+            self.__line_filter = None
+
+        # checks if Ingest is in config.ini file
+        if 'Ingest' in config:
+            self.__n_workers = int(config['Ingest']['n_workers']) if 'n_workers' in config['Ingest'] else 1
+            columnar = bool(int(config['Ingest']['columnar'])) if 'columnar' in config['Ingest'] else False
+        else:
+            self.__n_workers = 1
+            columnar = False
+        self.__traces_store = TracesStore() if columnar else None
+        if self.__traces_store is not None:
+            self.__traces_store.select_attributes(self.__projection)
 
         print('...reading complete')
 
+    def get_data_fingerprint(self, disc_type: DISCRETIZATION_TYPE, n_bins_dict: dict, sketched: bool=False) -> str:
+        """returns a fingerprint of the inputs of the discretization: the input file (path, size and last modification), the filter of the lines,
+        the strings filtered out of the lines, the attributes read from the lines (see select_attributes),
+        the attributes with their number of bins and soglia, the type of discretization and whether the bins are created from quantile sketches.
+        It's saved with the bins to know if they can be loaded instead of created again
+
+        :param disc_type: the type of discretization
+        :type disc_type: DISCRETIZATION_TYPE
+        :param n_bins_dict: dictionary where the key is the attribute to witch apply discretization and the value is the number of bins and the soglia for that attribute
+        :type n_bins_dict: dict
+        :param sketched: True if the bins are created from quantile sketches, defaults to False
+        :type sketched: bool, optional
+        :return: the fingerprint
+        :rtype: str
+        """
+        import hashlib
+        import json
+        import os
+
+        stat = os.stat(self.__path_of_file_input)
+        inputs = [
+            os.path.abspath(self.__path_of_file_input),
+            stat.st_size,
+            stat.st_mtime_ns,
+            self.__line_filter.get_expression() if self.__line_filter is not None else '',
+            sorted(string for string in self.__strings_to_filter_event if string != ''),
+            sorted(self.__projection),
+            disc_type.name,
+            sorted([attribute, n_bins, soglia] for attribute, (n_bins, soglia) in n_bins_dict.items()),
+            sketched,
+        ]
+        return hashlib.sha1(json.dumps(inputs).encode()).hexdigest()
+
+    def has_discretization(self, disc_type: DISCRETIZATION_TYPE, n_bins_dict: dict, filepath_discretization: str, sketched: bool=False) -> bool:
+        """checks if the bins saved in filepath_discretization have been created with the same inputs, so that they can be loaded
+
+        :param disc_type: the type of discretization
+        :type disc_type: DISCRETIZATION_TYPE
+        :param n_bins_dict: dictionary where the key is the attribute to witch apply discretization and the value is the number of bins and the soglia for that attribute
+        :type n_bins_dict: dict
+        :param filepath_discretization: path of the directory where the bins are saved
+        :type filepath_discretization: str
+        :param sketched: True if the bins are created from quantile sketches, defaults to False
+        :type sketched: bool, optional
+        :return: True if the saved bins have the same fingerprint of the inputs
+        :rtype: bool
+        """
+        import os
+
+        bundle_path = f'{filepath_discretization}/{DiscretizationBundle.FILENAME}'
+        if not os.path.exists(bundle_path):
+            return False
+        try:
+            bundle = DiscretizationBundle.load(bundle_path)
+        except ValueError:
+            return False
+        # only the fingerprint is read, the mapping is closed
+        with bundle:
+            return bundle.get_fingerprint() == self.get_data_fingerprint(disc_type, n_bins_dict, sketched)
+
     def get_network_traffic(self) -> list:
-        """returns the list of all the traces processed
+        """returns the list of all the traces processed. With the columnar store it's a TracesView,
+        a read only list that creates every trace from the columns only when it's accessed (and doesn't keep it),
+        so the Trace and Event objects of all the traces are never in memory at the same time
 
         :return: the list of traces
-        :rtype: list
+        :rtype: list | TracesView
         """        
+        if self.__traces_store is not None:
+            return TracesView(self.__traces_store)
         return self.__network_traffic
 
     def get_n_traces_and_event(self, max_n_trace: int=10, randomize: bool=False) -> list:
@@ -96,50 +269,321 @@ class TracesController:
         :rtype: list
         """        
         from random import sample
+        if self.__traces_store is not None:
+            n_traces = self.__traces_store.get_n_traces()
+            indices = sample(range(n_traces), max_n_trace) if randomize else range(min(max_n_trace, n_traces))
+            return [self.__traces_store.get_trace(i) for i in indices]
         return sample(self.__network_traffic, max_n_trace) if randomize else self.__network_traffic[:max_n_trace]
 
+    def enable_quantile_sketches(self, n_bins_dict: dict, error: float) -> None:
+        """makes the reading feed a quantile sketch for every attribute, so that the equal frequency bins
+        are created from the sketches without collecting and sorting all the values. It must be called before read_and_convert_lines
+
+        :param n_bins_dict: dictionary where the key is the attribute to witch apply discretization and the value is the number of bins and the soglia for that attribute
+        :type n_bins_dict: dict
+        :param error: approximate error of the rank of the values in the sketches, relative to the number of values
+        :type error: float
+        :raises ValueError: raised if one of the attributes is not one of the attributes to discretize
+        """
+        for attribute in n_bins_dict:
+            if attribute not in TracesController.DISCRETIZABLE_ATTRIBUTES:
+                raise ValueError(f'attribute must be one of these: {", ".join(TracesController.DISCRETIZABLE_ATTRIBUTES)}')
+        self.__sketches = {attribute: QuantileSketch.from_error(error, max(n_bins, soglia)) for attribute, (n_bins, soglia) in n_bins_dict.items()}
+        self.__sketch_settings = (n_bins_dict, error)
+        # the history attributes are all computed from the history string
+        indices = {TracesController.FIELD_INDICES.get(attribute, 15) for attribute in n_bins_dict}
+        self.__sketch_buffers = [(index, []) for index in sorted(indices)]
+
+    def select_attributes(self, attributes: list) -> None:
+        """makes the reading parse and store only the given attributes of the events, the others are missing ('-' or nan)
+        and the history strings are not analyzed if none of the history attributes is selected.
+        ts and the attributes of the traces are always read. It must be called before read_and_convert_lines
+
+        :param attributes: attributes of the events to read, e.g. the ones to convert to xes and to discretize
+        :type attributes: list[str]
+        """
+        self.__projection = set(attributes)
+        if self.__projection.intersection(TracesStore.HISTORY_ATTRIBUTES):
+            self.__projection.add('history')
+        if self.__traces_store is not None:
+            self.__traces_store.select_attributes(self.__projection)
+
+    def __update_sketches(self, list_to_pack: list) -> None:
+        """adds the fields of a line needed by the quantile sketches to their buffers,
+        the buffers are converted and added to the sketches every SKETCH_BATCH_SIZE lines
+
+        :param list_to_pack: fields of the line
+        :type list_to_pack: list[str]
+        """
+        buffer = None
+        for index, buffer in self.__sketch_buffers:
+            buffer.append(list_to_pack[index])
+        if buffer is not None and len(buffer) >= TracesController.SKETCH_BATCH_SIZE:
+            self.__flush_sketch_buffers()
+
+    def __flush_sketch_buffers(self) -> None:
+        """converts the strings in the buffers to numpy batches of values ('-' becomes 0) and adds them to the quantile sketches,
+        every distinct history string in the batch is analyzed once
+        """
+        import numpy as np
+
+        # the fields of a json conn.log are numbers, '-' is only in the strings
+        fields = {index: np.array(buffer) for index, buffer in self.__sketch_buffers if buffer}
+        if not fields:
+            return
+        if 15 in fields:
+            histories, inverse = np.unique(fields[15], return_inverse=True)
+            histories = [EventHistory.intern(history) for history in histories.tolist()]
+        for attribute, sketch in self.__sketches.items():
+            index = TracesController.FIELD_INDICES.get(attribute)
+            if index is not None:
+                values = fields[index]
+                sketch.update_values(values.astype(float) if values.dtype.kind in 'iuf' else np.where(values == '-', '0', values).astype(float))
+            else:
+                values = np.array([float(getattr(history, f'get_{attribute}')()) for history in histories])
+                sketch.update_values(values[inverse])
+        for _, buffer in self.__sketch_buffers:
+            buffer.clear()
+
     def read_and_convert_lines(self):
         """
-        read lines from file and converting them to a list of trace (network_traffic field)
+        read lines from file and converting them to a list of trace (network_traffic field),
+        a compressed file is always read serially since it can't be split in ranges of bytes.
+        The file can be a tsv or a json conn.log, the format is detected from its first line
         """
         print('reading and converting lines...')
-        num_lines = 0
-        with open(self.__path_of_file_input) as f_in:
-            num_lines = sum(1 for _ in f_in) - 1
-        # reading lines
-        with open(self.__path_of_file_input, "r") as f_in:
-            lines_to_remove = [
-                '#separator',
-                '#set_separator',
-                '#empty_field',
-                '#unset_field',
-                '#path',
-                '#open',
-                '#types',
-                '#fields',
-                '#close',
-            ]
-            next(f_in)
-            for _ in tqdm(range(num_lines)):
-                line = next(f_in)
-                # removing comment lines
-                for line_to_check in lines_to_remove:
-                    if line.startswith(line_to_check):
-                        break
-                else:
-                    # removing unnecessary sub strings
-                    for string in self.__strings_to_filter_event:
-                        line = line.replace(string, '')
-                    self.conv_line_and_add_to_trace(line.replace('\n', ''))
+        with self.__open_input() as f_in:
+            self.__set_json_parser(ZeekJsonParser.is_json(f_in.readline()))
+        if self.__n_workers != 1 and DecompressingReader.detect_compression(self.__path_of_file_input) is None:
+            self.__read_and_convert_lines_parallel()
+        else:
+            self.__convert_lines(self.__read_lines())
+        if self.__traces_store is not None:
+            self.__traces_store.finalize()
+
+    def __set_json_parser(self, json_input: bool) -> None:
+        """creates the parser of the lines of a json conn.log, only the fields read from the lines are extracted from the json objects
+
+        :param json_input: True if the conn.log is a json one, False if it's a tsv one
+        :type json_input: bool
+        """
+        if not json_input:
+            self.__json_parser = None
+            return
+        indices = [TracesStore.FIELD_INDICES[name] for name in self.__projection if name in TracesStore.FIELD_INDICES]
+        indices.extend(index for index, _ in self.__sketch_buffers)
+        self.__json_parser = ZeekJsonParser(indices)
+
+    def __convert_lines(self, lines) -> None:
+        """converts the lines and adds them to the traces or to the columnar store
+
+        :param lines: lines ready to be converted
+        :type lines: Iterable[str]
+        """
+        if self.__traces_store is not None:
+            add_line = self.__traces_store.add_line
+            line_filter = self.__line_filter
+            for line in lines:
+                list_to_pack = line.split('\t') if self.__json_parser is None else self.__json_parser.parse_line(line)
+                if line_filter is not None and not line_filter.match(list_to_pack):
+                    continue
+                add_line(list_to_pack)
+                if self.__sketches:
+                    self.__update_sketches(list_to_pack)
+        else:
+            for line in lines:
+                self.conv_line_and_add_to_trace(line)
+        self.__flush_sketch_buffers()
+
+    def __open_input(self):
+        """opens the input file in binary mode, with a DecompressingReader if it's compressed
+
+        :return: the opened file
+        :rtype: io.BufferedReader | DecompressingReader
+        """
+        compression = DecompressingReader.detect_compression(self.__path_of_file_input)
+        if compression is None:
+            return open(self.__path_of_file_input, 'rb')
+        return DecompressingReader(self.__path_of_file_input, compression, TracesController.READ_BLOCK_SIZE)
+
+    def __read_lines(self):
+        """
+        generator of the lines of the input file ready to be converted, the file is read only once
+        in blocks of complete lines, skipping the first line (the header of the columns, a json conn.log has none) and the
+        zeek header lines (the ones starting with #), the progress is shown in bytes read.
+        A file compressed with gzip, bz2, xz or zstd is decompressed while it's read by a DecompressingReader
+        and the progress is shown in compressed bytes
+
+        :return: generator of the lines without the strings to filter and the new line
+        :rtype: Generator[str]
+        """
+        import os
+
+        def blocks(f_in, progress, position):
+            first_line = f_in.readline()
+            if self.__json_parser is not None:
+                yield first_line
+            progress.update(position() - progress.n)
+            while True:
+                block = f_in.read(TracesController.READ_BLOCK_SIZE)
+                if not block:
+                    break
+                progress.update(position() - progress.n)
+                yield block
+
+        with self.__open_input() as f_in, \
+            tqdm(total=os.path.getsize(self.__path_of_file_input), unit='B', unit_scale=True, unit_divisor=1024) as progress:
+            position = f_in.get_compressed_position if isinstance(f_in, DecompressingReader) else f_in.tell
+            yield from self.__lines_of_blocks(blocks(f_in, progress, position))
+
+    def __lines_of_blocks(self, blocks):
+        """
+        generator of the lines ready to be converted from consecutive blocks of bytes of the input file,
+        only complete lines are converted, the incomplete one at the end of a block waits for the next block
+
+        :param blocks: iterable of consecutive blocks of the file
+        :type blocks: Iterable[bytes]
+        :return: generator of the lines without the strings to filter and the new line
+        :rtype: Generator[str]
+        """
+        strings_to_filter = [string for string in self.__strings_to_filter_event if string != '']
+        remainder = b''
+        for block in blocks:
+            block = remainder + block
+            end = block.rfind(b'\n') + 1
+            remainder = block[end:]
+            yield from TracesController.__clean_lines(block[:end].decode('utf-8'), strings_to_filter)
+        yield from TracesController.__clean_lines(remainder.decode('utf-8'), strings_to_filter)
+
+    def __split_input_in_byte_ranges(self, n_ranges: int) -> list:
+        """splits the input file, without the first line of a tsv conn.log, in n_ranges ranges of bytes of about the same size
+        that start and end at the boundaries of the lines
+
+        :param n_ranges: number of ranges
+        :type n_ranges: int
+        :return: list of the (start, end) ranges in the order of the file
+        :rtype: list[tuple[int, int]]
+        """
+        import mmap
+        import os
+
+        if os.path.getsize(self.__path_of_file_input) == 0:
+            return []
+        with open(self.__path_of_file_input, 'rb') as f_in, mmap.mmap(f_in.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            size = len(mm)
+            start = mm.find(b'\n') + 1 if mm.find(b'\n') != -1 else size # skipping the header of the columns
+            if self.__json_parser is not None:
+                start = 0
+            boundaries = [start]
+            for i in range(1, n_ranges):
+                pos = max(start + (size - start) * i // n_ranges, boundaries[-1])
+                newline = mm.find(b'\n', pos)
+                boundaries.append(newline + 1 if newline != -1 else size)
+            boundaries.append(size)
+        return [(begin, end) for begin, end in zip(boundaries[:-1], boundaries[1:]) if begin < end]
+
+    @staticmethod
+    def convert_byte_range(task: tuple) -> tuple:
+        """converts the lines in a range of bytes of the input file, it's executed by the processes of the pool of the parallel reading.
+        The lines are converted by a new TracesController created from the settings of the reading in task,
+        so the controller that reads the file (with its traces and sketches) is not pickled to every process
+
+        :param task: path of the input file, (start, end) of the range (both at the boundaries of the lines), strings to filter,
+            expression of the LineFilter, attributes to read, True for the columnar store, n_bins_dict and error of the quantile sketches
+            (None without sketches) and True if the conn.log is a json one
+        :type task: tuple[str, tuple[int, int], list[str], str, set[str], bool, tuple[dict, float], bool]
+        :return: the keys of the traces found in the range and the traces with their events, in the same order,
+            or the store not yet finalized with the columnar store, and the quantile sketches of the range
+        :rtype: tuple[tuple[list[tuple], list[Trace]] | TracesStore, dict{str: QuantileSketch}]
+        """
+        import mmap
+
+        path, byte_range, strings_to_filter_event, filter_expression, projection, columnar, sketch_settings, json_input = task
+        controller = TracesController(path, '', strings_to_filter_event, filter_expression, 1, columnar)
+        controller.select_attributes(projection)
+        if sketch_settings is not None:
+            controller.enable_quantile_sketches(*sketch_settings)
+        controller.__set_json_parser(json_input)
+
+        start, end = byte_range
+        with open(path, 'rb') as f_in, mmap.mmap(f_in.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            blocks = (mm[pos:min(pos + TracesController.READ_BLOCK_SIZE, end)] for pos in range(start, end, TracesController.READ_BLOCK_SIZE))
+            controller.__convert_lines(controller.__lines_of_blocks(blocks))
+        if controller.__traces_store is not None:
+            return controller.__traces_store, controller.__sketches
+        return (list(controller.__traces_pos_dict.keys()), controller.__network_traffic), controller.__sketches
+
+    def __read_and_convert_lines_parallel(self) -> None:
+        """reads the input file with a pool of processes, every process converts a range of bytes
+        of the file into its own traces, then these are merged by id in the order of the file,
+        so that the traces and the order of their events are the same of the serial reading
+        """
+        import os
+        from multiprocessing import Pool
+
+        n_workers = self.__n_workers if self.__n_workers > 0 else os.cpu_count()
+        # the settings of the reading are given explicitly to the processes, instead of pickling this controller
+        tasks = [(self.__path_of_file_input,
+            byte_range,
+            [string for string in self.__strings_to_filter_event if string != ''],
+            self.__line_filter.get_expression() if self.__line_filter is not None else '',
+            self.__projection,
+            self.__traces_store is not None,
+            self.__sketch_settings,
+            self.__json_parser is not None) for byte_range in self.__split_input_in_byte_ranges(n_workers)]
+
+        with Pool(n_workers) as pool:
+            for result, sketches in tqdm(pool.imap(TracesController.convert_byte_range, tasks), total=len(tasks)):
+                for attribute, sketch in sketches.items():
+                    self.__sketches[attribute].merge(sketch)
+                if self.__traces_store is not None:
+                    self.__traces_store.merge(result)
+                    continue
+                ids, traces = result
+                for id, trace in zip(ids, traces):
+                    try:
+                        stored_trace = self.__network_traffic[self.__traces_pos_dict[id]]
+                    except KeyError:
+                        self.__traces_pos_dict[id] = len(self.__network_traffic)
+                        self.__network_traffic.append(trace)
+                    else:
+                        for event in trace.get_events():
+                            stored_trace.add_event(event)
+
+    @staticmethod
+    def __clean_lines(text: str, strings_to_filter: list) -> list:
+        """splits a block of lines discarding the zeek header lines and the empty lines, then removes
+        the filtered strings from the lines that are left, one string after the other like line.replace(string, '') for every line.
+        The strings are removed from all the lines of the block at once, with the same result since they don't contain new lines,
+        the lines left empty are discarded
+
+        :param text: block of complete lines
+        :type text: str
+        :param strings_to_filter: strings to be removed, in the order they are removed
+        :type strings_to_filter: list[str]
+        :return: the list of lines ready to be converted
+        :rtype: list[str]
+        """
+        lines = [line for line in text.split('\n') if line != '' and line[0] != '#']
+        if not strings_to_filter or not lines:
+            return lines
+        text = '\n'.join(lines)
+        for string in strings_to_filter:
+            text = text.replace(string, '')
+        return [line for line in text.split('\n') if line != '']
 
     def conv_line_and_add_to_trace(self, line: str):
         """
-        Convert a preprocessed line from the input file to an event and adds it to the network_traffic list
+        Convert a preprocessed line from the input file to an event and adds it to the network_traffic list,
+        the lines that don't match the filter of the lines are discarded before creating the event
 
         :param line: line of the event to be processed and added to a trace
         :type line: str
         """
-        list_to_pack = line.split('\t')
+        list_to_pack = line.split('\t') if self.__json_parser is None else self.__json_parser.parse_line(line)
+        if self.__line_filter is not None and not self.__line_filter.match(list_to_pack):
+            return
+        projection = self.__projection
 
         ts = list_to_pack[0]
         orig_ip = list_to_pack[2]
@@ -147,19 +591,24 @@ class TracesController:
         resp_ip = list_to_pack[4]
         resp_port = list_to_pack[5]
         proto = list_to_pack[6]
-        service = list_to_pack[7]
-        duration = list_to_pack[8]
-        orig_bytes = list_to_pack[9]
-        resp_bytes = list_to_pack[10]
-        conn_state = list_to_pack[11]
-        missed_bytes = list_to_pack[14]
-        history = list_to_pack[15]
-        orig_pkts = list_to_pack[16]
-        orig_ip_bytes = list_to_pack[17]
-        resp_pkts = list_to_pack[18]
-        resp_ip_bytes = list_to_pack[19]
+        # the fields not selected are not read and they are missing like '-',
+        # the numeric fields are parsed once here, the missing ones ('-') become nan
+        service = list_to_pack[7] if 'service' in projection else '-'
+        duration = float(list_to_pack[8]) if list_to_pack[8] != '-' and 'duration' in projection else nan
+        orig_bytes = float(list_to_pack[9]) if list_to_pack[9] != '-' and 'orig_bytes' in projection else nan
+        resp_bytes = float(list_to_pack[10]) if list_to_pack[10] != '-' and 'resp_bytes' in projection else nan
+        conn_state = list_to_pack[11] if 'conn_state' in projection else '-'
+        missed_bytes = float(list_to_pack[14]) if list_to_pack[14] != '-' and 'missed_bytes' in projection else nan
+        history = list_to_pack[15] if 'history' in projection else '-'
+        orig_pkts = float(list_to_pack[16]) if list_to_pack[16] != '-' and 'orig_pkts' in projection else nan
+        orig_ip_bytes = float(list_to_pack[17]) if list_to_pack[17] != '-' and 'orig_ip_bytes' in projection else nan
+        resp_pkts = float(list_to_pack[18]) if list_to_pack[18] != '-' and 'resp_pkts' in projection else nan
+        resp_ip_bytes = float(list_to_pack[19]) if list_to_pack[19] != '-' and 'resp_ip_bytes' in projection else nan
         label = list_to_pack[21]
 
+        if self.__sketches:
+            self.__update_sketches(list_to_pack)
+
         event = Event(ts,
             service,
             duration,
@@ -173,7 +622,7 @@ class TracesController:
             resp_pkts,
             resp_ip_bytes)
     
-        id = Trace.generate_id_static(orig_ip, orig_port, resp_ip, resp_port, proto)
+        id = Trace.generate_key_static(orig_ip, orig_port, resp_ip, resp_port, proto)
 
         try:
             self.__network_traffic[self.__traces_pos_dict[id]].add_event(event)
@@ -253,12 +702,6 @@ class TracesController:
         :param attr_event: list of the attributes to select for the events
         :type attr_event: list[str]
         """
-        from xml.etree.ElementTree import Element, SubElement, tostring
-
-        from ConnectionsModule.PROTO import PROTO
-        from ConnectionsModule.CONN_LABEL import CONN_LABEL
-        from ConnectionsModule.CONN_STATE import CONN_STATE
-
         print('creating the xml object to print...')
 
         tree = Element('log', {'xes.version': '1.0', 'xmlns': 'http://code.deckfour.org/xes'})
@@ -336,189 +779,402 @@ class TracesController:
         SubElement(tree, 'classifier', {'name': 'activity classifier', 'keys':'Activity'})
 
 
-        for trace in tqdm(self.__network_traffic):
-            traceTag = SubElement(tree, 'trace')
+        # the header is serialized once and every trace is written as soon as it is created,
+        # so the memory used doesn't depend on the size of the log
+        header = tostring(tree, encoding='unicode')
+        closing_tag = '</log>'
+        with open(self.__path_of_file_xes, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            print(f'started writing to xes file named {self.__path_of_file_xes}')
+            f.write(header[:-len(closing_tag)])
+            if self.__traces_store is not None:
+                event_columns = self.__store_event_columns(event_attr_presence)
+                for trace in tqdm(range(self.__traces_store.get_n_traces())):
+                    f.write(tostring(self.__store_trace_to_xes_element(trace, trace_attr_presence, event_columns), encoding='unicode'))
+            else:
+                # the strings of service and conn_state are converted once for every code of their codebooks
+                event_strings = (Event.SERVICES.get_values(), Event.CONN_STATES.get_decoded(lambda state: CONN_STATE.state_to_str(CONN_STATE.str_to_state(state))))
+                for trace in tqdm(self.__network_traffic):
+                    f.write(tostring(self.__trace_to_xes_element(trace, trace_attr_presence, event_attr_presence, event_strings), encoding='unicode'))
+            f.write(closing_tag)
+            print('...writing the list of Traces to a xes file completed')
+
+        if self.__bin_codes:
+            self.__print_bin_table(attr_event)
+
+    def __print_bin_table(self, attr_event: list) -> None:
+        """prints the side table of the bin codes written in the xes file, a json file next to it
+        where for every discretized attribute every code is mapped to the interval of its bin
+
+        :param attr_event: list of the attributes of the events in the xes file
+        :type attr_event: list[str]
+        """
+        import json
+
+        table = {}
+        for attribute in attr_event:
+            if attribute not in TracesController.DISCRETIZABLE_ATTRIBUTES:
+                continue
+            discretizer = getattr(TracesController.DISCRETIZABLE_ATTRIBUTES[attribute], f'disc_{attribute}')
+            if discretizer is not None:
+                table[attribute] = dict(zip(discretizer.get_bin_labels(), discretizer.get_interval_labels()))
+        with open(f'{self.__path_of_file_xes}.bins.json', 'w') as f:
+            json.dump(table, f, indent=4)
+
+    def __trace_to_xes_element(self, trace: Trace, trace_attr_presence: list, event_attr_presence: list, event_strings: tuple):
+        """creates the xml element of a trace and of all its events
+
+        :param trace: the trace to convert
+        :type trace: Trace
+        :param trace_attr_presence: presence of every trace attribute in the order used by print_Trace_list_to_xes_file
+        :type trace_attr_presence: list[bool]
+        :param event_attr_presence: presence of every event attribute in the order used by print_Trace_list_to_xes_file
+        :type event_attr_presence: list[bool]
+        :param event_strings: strings of the codes of Event.SERVICES and of Event.CONN_STATES
+        :type event_strings: tuple[list[str], list[str]]
+        :return: the element of the trace
+        :rtype: Element
+        """
+        # the attributes of the trace are the same for all its events, they are converted to strings once
+        trace_attributes = []
+        if trace_attr_presence[0] and trace_attr_presence[1] and trace_attr_presence[2] and trace_attr_presence[3]:
+            trace_attributes.append({'key': 'concept:name', 'value': f'{trace.get_orig_ip()}-{trace.get_orig_port()},{trace.get_resp_ip()}-{str(trace.get_resp_port())}'})
+        if trace_attr_presence[4]:
+            trace_attributes.append({'key': 'concept:proto', 'value': PROTO.proto_to_str(trace.get_proto())})
+        if trace_attr_presence[5]:
+            trace_attributes.append({'key': 'concept:label', 'value': CONN_LABEL.conn_label_to_str(trace.get_label())})
+
+        traceTag = Element('trace')
+        for attributes in trace_attributes:
+            SubElement(traceTag, 'string', attributes)
+
+        service_strings, conn_state_strings = event_strings
+        for event in trace.get_events():
+            eventTag = SubElement(traceTag, 'event')
+            for attributes in trace_attributes:
+                SubElement(eventTag, 'string', attributes)
+
+            if event_attr_presence[0]:
+                SubElement(eventTag, 'string', {'key': 'time:ts', 'value': event.get_ts()})
+            if event_attr_presence[1]:
+                SubElement(eventTag, 'string', {'key': 'concept:service', 'value': service_strings[event.get_service_code()]})
+            if event_attr_presence[2]:
+                SubElement(eventTag, 'string', {'key': 'concept:duration', 'value': event.get_discretized_duration()})
+            if event_attr_presence[3]:
+                SubElement(eventTag, 'string', {'key': 'concept:orig_bytes', 'value': event.get_discretized_orig_bytes()})
+            if event_attr_presence[4]:
+                SubElement(eventTag, 'string', {'key': 'concept:resp_bytes', 'value': event.get_discretized_resp_bytes()})
+            if event_attr_presence[5]:
+                SubElement(eventTag, 'string', {'key': 'concept:conn_state', 'value': conn_state_strings[event.get_conn_state_code()]})
+            if event_attr_presence[6]:
+                SubElement(eventTag, 'string', {'key': 'concept:missed_bytes', 'value': event.get_discretized_missed_bytes()})
+            if event_attr_presence[7]:
+                SubElement(eventTag, 'string', {'key': 'concept:orig_pkts', 'value': event.get_discretized_orig_pkts()})
+            if event_attr_presence[8]:
+                SubElement(eventTag, 'string', {'key': 'concept:orig_ip_bytes', 'value': event.get_discretized_orig_ip_bytes()})
+            if event_attr_presence[9]:
+                SubElement(eventTag, 'string', {'key': 'concept:resp_pkts', 'value': event.get_discretized_resp_pkts()})
+            if event_attr_presence[10]:
+                SubElement(eventTag, 'string', {'key': 'concept:resp_ip_bytes', 'value': event.get_discretized_resp_ip_bytes()})
             
-            if trace_attr_presence[0] and trace_attr_presence[1] and trace_attr_presence[2] and trace_attr_presence[3]:
-                SubElement(traceTag, 'string', {'key': 'concept:name', 'value': f'{trace.get_orig_ip()}-{trace.get_orig_port()},{trace.get_resp_ip()}-{str(trace.get_resp_port())}'})
-            if trace_attr_presence[4]:
-                SubElement(traceTag, 'string', {'key': 'concept:proto', 'value': PROTO.proto_to_str(trace.get_proto())})
-            if trace_attr_presence[5]:
-                SubElement(traceTag, 'string', {'key': 'concept:label', 'value': CONN_LABEL.conn_label_to_str(trace.get_label())})
+            if event_attr_presence[11]:
+                SubElement(eventTag, 'string', {'key': 'concept:orig_syn', 'value': event.get_discretized_orig_syn()})
+            if event_attr_presence[12]:
+                SubElement(eventTag, 'string', {'key': 'concept:orig_fin', 'value': event.get_discretized_orig_fin()})
+            if event_attr_presence[13]:
+                SubElement(eventTag, 'string', {'key': 'concept:orig_syn_ack', 'value': event.get_discretized_orig_syn_ack()})
+            if event_attr_presence[14]:
+                SubElement(eventTag, 'string', {'key': 'concept:orig_rst', 'value': event.get_discretized_orig_rst()})
+            if event_attr_presence[15]:
+                SubElement(eventTag, 'string', {'key': 'concept:resp_syn', 'value': event.get_discretized_resp_syn()})
+            if event_attr_presence[16]:
+                SubElement(eventTag, 'string', {'key': 'concept:resp_fin', 'value': event.get_discretized_resp_fin()})
+            if event_attr_presence[17]:
+                SubElement(eventTag, 'string', {'key': 'concept:resp_syn_ack', 'value': event.get_discretized_resp_syn_ack()})
+            if event_attr_presence[18]:
+                SubElement(eventTag, 'string', {'key': 'concept:resp_rst', 'value': event.get_discretized_resp_rst()})
+            
+            if event_attr_presence[19]:
+                SubElement(eventTag, 'string', {'key': 'concept:orig_ack', 'value': str(event.get_orig_ack())})
+            if event_attr_presence[20]:
+                SubElement(eventTag, 'string', {'key': 'concept:orig_payload', 'value': str(event.get_orig_payload())})
+            if event_attr_presence[21]:
+                SubElement(eventTag, 'string', {'key': 'concept:orig_inconsistent', 'value': str(event.get_orig_inconsistent())})
+            if event_attr_presence[22]:
+                SubElement(eventTag, 'string', {'key': 'concept:orig_multi_flag', 'value': str(event.get_orig_multi_flag())})
+            if event_attr_presence[23]:
+                SubElement(eventTag, 'string', {'key': 'concept:resp_ack', 'value': str(event.get_resp_ack())})
+            if event_attr_presence[24]:
+                SubElement(eventTag, 'string', {'key': 'concept:resp_payload', 'value': str(event.get_resp_payload())})
+            if event_attr_presence[25]:
+                SubElement(eventTag, 'string', {'key': 'concept:resp_inconsistent', 'value': str(event.get_resp_inconsistent())})
+            if event_attr_presence[26]:
+                SubElement(eventTag, 'string', {'key': 'concept:resp_multi_flag', 'value': str(event.get_resp_multi_flag())})
+
+            if event_attr_presence[27]:
+                SubElement(eventTag, 'string', {'key': 'concept:orig_bad_checksum', 'value': event.get_discretized_orig_bad_checksum()})
+            if event_attr_presence[28]:
+                SubElement(eventTag, 'string', {'key': 'concept:orig_content_gap', 'value': event.get_discretized_orig_content_gap()})
+            if event_attr_presence[29]:
+                SubElement(eventTag, 'string', {'key': 'concept:orig_retransmitted_payload', 'value': event.get_discretized_orig_retransmitted_payload()})
+            if event_attr_presence[30]:
+                SubElement(eventTag, 'string', {'key': 'concept:orig_zero_window', 'value': event.get_discretized_orig_zero_window()})
+            if event_attr_presence[31]:
+                SubElement(eventTag, 'string', {'key': 'concept:resp_bad_checksum', 'value': event.get_discretized_resp_bad_checksum()})
+            if event_attr_presence[32]:
+                SubElement(eventTag, 'string', {'key': 'concept:resp_content_gap', 'value': event.get_discretized_resp_content_gap()})
+            if event_attr_presence[33]:
+                SubElement(eventTag, 'string', {'key': 'concept:resp_retransmitted_payload', 'value': event.get_discretized_resp_retransmitted_payload()})
+            if event_attr_presence[34]:
+                SubElement(eventTag, 'string', {'key': 'concept:resp_zero_window', 'value': event.get_discretized_resp_zero_window()})
+
+        return traceTag
+
+    def __store_event_columns(self, event_attr_presence: list) -> list:
+        """prepares the values of the event attributes to write in the xes file from the columnar store,
+        every attribute becomes a column of codes and the table of the strings of the codes, so
+        every distinct value is converted or discretized only once
+
+        :param event_attr_presence: presence of every event attribute in the order used by print_Trace_list_to_xes_file
+        :type event_attr_presence: list[bool]
+        :return: list of (key, codes, strings) of the attributes present, in the order of the xes events,
+            the ts has no table of strings and it's formatted when written
+        :rtype: list[tuple[str, np.ndarray, list[str]]]
+        """
+        import numpy as np
+
+        store = self.__traces_store
+        discretized_codes = store.get_discretized_codes()
+        attributes = ['ts', 'service', 'duration', 'orig_bytes', 'resp_bytes', 'conn_state', 'missed_bytes', 'orig_pkts', 'orig_ip_bytes', 'resp_pkts', 'resp_ip_bytes'] + \
+            TracesStore.HISTORY_ATTRIBUTES[:24]
+
+        event_columns = []
+        for attribute, present in zip(attributes, event_attr_presence):
+            if not present:
+                continue
+            column = store.get_column(attribute)
+            if attribute == 'ts':
+                event_columns.append(('time:ts', column, None))
+            elif attribute == 'service':
+                event_columns.append(('concept:service', column, store.get_codebook('service').get_values()))
+            elif attribute == 'conn_state':
+                event_columns.append(('concept:conn_state', column, store.get_codebook('conn_state').get_decoded(lambda state: CONN_STATE.state_to_str(CONN_STATE.str_to_state(state)))))
+            elif attribute in TracesStore.BOOLEAN_HISTORY_ATTRIBUTES:
+                event_columns.append((f'concept:{attribute}', column.astype(np.uint8), ['False', 'True']))
+            else:
+                discretizer = getattr(TracesController.DISCRETIZABLE_ATTRIBUTES[attribute], f'disc_{attribute}')
+                if discretizer is None:
+                    event_columns.append((f'concept:{attribute}', np.zeros(len(column), dtype=np.uint8), ['n/a']))
+                elif discretized_codes is not None:
+                    # the codes not of any bin (OUT_OF_BOUNDS_CODE) select the label of the values out of bounds
+                    labels = discretizer.get_bin_labels()
+                    event_columns.append((f'concept:{attribute}', discretized_codes[:, Event.DISCRETIZED_ATTRIBUTES.index(attribute)],
+                        labels + [Discretizer.OUT_OF_BOUNDS] * (Event.OUT_OF_BOUNDS_CODE + 1 - len(labels))))
+                else:
+                    # the code of the values out of bounds (-1) selects the last string, the missing values are discretized as 0
+                    event_columns.append((f'concept:{attribute}', discretizer.discretize_values(np.nan_to_num(column, nan=0.0)), discretizer.get_bin_labels() + [Discretizer.OUT_OF_BOUNDS]))
+        return event_columns
+
+    def __store_trace_to_xes_element(self, trace: int, trace_attr_presence: list, event_columns: list):
+        """creates the xml element of a trace of the columnar store and of all its events
+
+        :param trace: index of the trace in the store
+        :type trace: int
+        :param trace_attr_presence: presence of every trace attribute in the order used by print_Trace_list_to_xes_file
+        :type trace_attr_presence: list[bool]
+        :param event_columns: values of the event attributes returned by __store_event_columns
+        :type event_columns: list[tuple[str, np.ndarray, list[str]]]
+        :return: the element of the trace
+        :rtype: Element
+        """
+        orig_ip, orig_port, resp_ip, resp_port, proto, _, label = self.__traces_store.get_trace_fields(trace)
+        trace_attributes = []
+        if trace_attr_presence[0] and trace_attr_presence[1] and trace_attr_presence[2] and trace_attr_presence[3]:
+            trace_attributes.append({'key': 'concept:name', 'value': f'{orig_ip}-{orig_port},{resp_ip}-{resp_port}'})
+        if trace_attr_presence[4]:
+            trace_attributes.append({'key': 'concept:proto', 'value': PROTO.proto_to_str(PROTO.str_to_proto(proto))})
+        if trace_attr_presence[5]:
+            trace_attributes.append({'key': 'concept:label', 'value': CONN_LABEL.conn_label_to_str(CONN_LABEL.str_to_conn_label(label))})
+
+        traceTag = Element('trace')
+        for attributes in trace_attributes:
+            SubElement(traceTag, 'string', attributes)
+
+        for event in self.__traces_store.get_trace_events(trace).tolist():
+            eventTag = SubElement(traceTag, 'event')
+            for attributes in trace_attributes:
+                SubElement(eventTag, 'string', attributes)
+            for key, codes, strings in event_columns:
+                SubElement(eventTag, 'string', {'key': key, 'value': strings[codes[event]] if strings is not None else f'{codes[event]:.6f}'})
 
+        return traceTag
+
+    def __get_columns_of_attributes(self, attributes: list) -> dict:
+        """Returns the values of all the attributes in attributes for every event, collected
+        with a single pass over the traces into preallocated numpy arrays. The missing values are nan
+        and the counters of the history are ints, so the discretizers see the same values of the lists of the traces
+
+        :param attributes: names of the attributes from where to collect data from
+        :type attributes: list[str]
+        :return: dict where the key is the attribute and the value is the array of its values
+        :rtype: dict{str: np.ndarray}
+        :raises ValueError: raised if one of the attributes is not one of the attributes to discretize
+        """
+        import numpy as np
+
+        for attribute in attributes:
+            if attribute not in TracesController.DISCRETIZABLE_ATTRIBUTES:
+                raise ValueError(f'attribute must be one of these: {", ".join(TracesController.DISCRETIZABLE_ATTRIBUTES)}')
+
+        if self.__traces_store is not None:
+            columns = {attribute: self.__traces_store.get_column(attribute) for attribute in attributes}
+            return {attribute: column if np.issubdtype(column.dtype, np.integer) else np.asarray(column, dtype=float) for attribute, column in columns.items()}
+
+        getters = [getattr(Event, f'get_{attribute}') for attribute in attributes]
+        columns = np.empty((len(attributes), sum(len(trace.get_events()) for trace in self.__network_traffic)))
+        i = 0
+        for trace in self.__network_traffic:
             for event in trace.get_events():
-                eventTag = SubElement(traceTag, 'event')
-
-                if trace_attr_presence[0] and trace_attr_presence[1] and trace_attr_presence[2] and trace_attr_presence[3]:
-                    SubElement(eventTag, 'string', {'key': 'concept:name', 'value': f'{trace.get_orig_ip()}-{trace.get_orig_port()},{trace.get_resp_ip()}-{str(trace.get_resp_port())}'})
-                if trace_attr_presence[4]:
-                    SubElement(eventTag, 'string', {'key': 'concept:proto', 'value': PROTO.proto_to_str(trace.get_proto())})
-                if trace_attr_presence[5]:
-                    SubElement(eventTag, 'string', {'key': 'concept:label', 'value': CONN_LABEL.conn_label_to_str(trace.get_label())})
-
-                if event_attr_presence[0]:
-                    SubElement(eventTag, 'string', {'key': 'time:ts', 'value': event.get_ts()})
-                if event_attr_presence[1]:
-                    SubElement(eventTag, 'string', {'key': 'concept:service', 'value': event.get_service()})
-                if event_attr_presence[2]:
-                    SubElement(eventTag, 'string', {'key': 'concept:duration', 'value': event.get_discretized_duration()})
-                if event_attr_presence[3]:
-                    SubElement(eventTag, 'string', {'key': 'concept:orig_bytes', 'value': event.get_discretized_orig_bytes()})
-                if event_attr_presence[4]:
-                    SubElement(eventTag, 'string', {'key': 'concept:resp_bytes', 'value': event.get_discretized_resp_bytes()})
-                if event_attr_presence[5]:
-                    SubElement(eventTag, 'string', {'key': 'concept:conn_state', 'value': CONN_STATE.state_to_str(event.get_conn_state())})
-                if event_attr_presence[6]:
-                    SubElement(eventTag, 'string', {'key': 'concept:missed_bytes', 'value': event.get_discretized_missed_bytes()})
-                if event_attr_presence[7]:
-                    SubElement(eventTag, 'string', {'key': 'concept:orig_pkts', 'value': event.get_discretized_orig_pkts()})
-                if event_attr_presence[8]:
-                    SubElement(eventTag, 'string', {'key': 'concept:orig_ip_bytes', 'value': event.get_discretized_orig_ip_bytes()})
-                if event_attr_presence[9]:
-                    SubElement(eventTag, 'string', {'key': 'concept:resp_pkts', 'value': event.get_discretized_resp_pkts()})
-                if event_attr_presence[10]:
-                    SubElement(eventTag, 'string', {'key': 'concept:resp_ip_bytes', 'value': event.get_discretized_resp_ip_bytes()})
-                
-                if event_attr_presence[11]:
-                    SubElement(eventTag, 'string', {'key': 'concept:orig_syn', 'value': event.get_discretized_orig_syn()})
-                if event_attr_presence[12]:
-                    SubElement(eventTag, 'string', {'key': 'concept:orig_fin', 'value': event.get_discretized_orig_fin()})
-                if event_attr_presence[13]:
-                    SubElement(eventTag, 'string', {'key': 'concept:orig_syn_ack', 'value': event.get_discretized_orig_syn_ack()})
-                if event_attr_presence[14]:
-                    SubElement(eventTag, 'string', {'key': 'concept:orig_rst', 'value': event.get_discretized_orig_rst()})
-                if event_attr_presence[15]:
-                    SubElement(eventTag, 'string', {'key': 'concept:resp_syn', 'value': event.get_discretized_resp_syn()})
-                if event_attr_presence[16]:
-                    SubElement(eventTag, 'string', {'key': 'concept:resp_fin', 'value': event.get_discretized_resp_fin()})
-                if event_attr_presence[17]:
-                    SubElement(eventTag, 'string', {'key': 'concept:resp_syn_ack', 'value': event.get_discretized_resp_syn_ack()})
-                if event_attr_presence[18]:
-                    SubElement(eventTag, 'string', {'key': 'concept:resp_rst', 'value': event.get_discretized_resp_rst()})
-                
-                if event_attr_presence[19]:
-                    SubElement(eventTag, 'string', {'key': 'concept:orig_ack', 'value': str(event.get_orig_ack())})
-                if event_attr_presence[20]:
-                    SubElement(eventTag, 'string', {'key': 'concept:orig_payload', 'value': str(event.get_orig_payload())})
-                if event_attr_presence[21]:
-                    SubElement(eventTag, 'string', {'key': 'concept:orig_inconsistent', 'value': str(event.get_orig_inconsistent())})
-                if event_attr_presence[22]:
-                    SubElement(eventTag, 'string', {'key': 'concept:orig_multi_flag', 'value': str(event.get_orig_multi_flag())})
-                if event_attr_presence[23]:
-                    SubElement(eventTag, 'string', {'key': 'concept:resp_ack', 'value': str(event.get_resp_ack())})
-                if event_attr_presence[24]:
-                    SubElement(eventTag, 'string', {'key': 'concept:resp_payload', 'value': str(event.get_resp_payload())})
-                if event_attr_presence[25]:
-                    SubElement(eventTag, 'string', {'key': 'concept:resp_inconsistent', 'value': str(event.get_resp_inconsistent())})
-                if event_attr_presence[26]:
-                    SubElement(eventTag, 'string', {'key': 'concept:resp_multi_flag', 'value': str(event.get_resp_multi_flag())})
-
-                if event_attr_presence[27]:
-                    SubElement(eventTag, 'string', {'key': 'concept:orig_bad_checksum', 'value': event.get_discretized_orig_bad_checksum()})
-                if event_attr_presence[28]:
-                    SubElement(eventTag, 'string', {'key': 'concept:orig_content_gap', 'value': event.get_discretized_orig_content_gap()})
-                if event_attr_presence[29]:
-                    SubElement(eventTag, 'string', {'key': 'concept:orig_retransmitted_payload', 'value': event.get_discretized_orig_retransmitted_payload()})
-                if event_attr_presence[30]:
-                    SubElement(eventTag, 'string', {'key': 'concept:orig_zero_window', 'value': event.get_discretized_orig_zero_window()})
-                if event_attr_presence[31]:
-                    SubElement(eventTag, 'string', {'key': 'concept:resp_bad_checksum', 'value': event.get_discretized_resp_bad_checksum()})
-                if event_attr_presence[32]:
-                    SubElement(eventTag, 'string', {'key': 'concept:resp_content_gap', 'value': event.get_discretized_resp_content_gap()})
-                if event_attr_presence[33]:
-                    SubElement(eventTag, 'string', {'key': 'concept:resp_retransmitted_payload', 'value': event.get_discretized_resp_retransmitted_payload()})
-                if event_attr_presence[34]:
-                    SubElement(eventTag, 'string', {'key': 'concept:resp_zero_window', 'value': event.get_discretized_resp_zero_window()})
-        
-        #from xml.dom import minidom
-        rough_string = tostring(tree, 'utf-8')
-        reparsed = False
-        #reparsed = minidom.parseString(rough_string)
-        with open(self.__path_of_file_xes, 'w') as f:
-            print(f'started writing to xes file named {self.__path_of_file_xes}')
-            if reparsed:
-                f.write(reparsed.toprettyxml())
+                columns[:, i] = [getter(event) for getter in getters]
+                i += 1
+        return {attribute: column.astype(np.int64) if TracesController.DISCRETIZABLE_ATTRIBUTES[attribute] is EventHistory else column
+            for attribute, column in zip(attributes, columns)}
+
+    @staticmethod
+    def fit_discretizer(task: tuple) -> Discretizer:
+        """fits a discretizer on one of the columns in the shared memory block created by __fit_discretizers_parallel,
+        it's executed by the processes of the pool
+
+        :param task: name of the shared memory block, shape of the columns, row of the column to use, its dtype and the discretizer to fit
+        :type task: tuple[str, tuple[int, int], int, np.dtype, Discretizer]
+        :return: the fitted discretizer
+        :rtype: Discretizer
+        """
+        import numpy as np
+        from multiprocessing import shared_memory
+
+        name, shape, row, dtype, discretizer = task
+        block = shared_memory.SharedMemory(name=name)
+        try:
+            column = np.ndarray(shape, dtype=np.float64, buffer=block.buf)[row]
+            # the columns of ints are copied back to ints, the discretizers create their bins as ints
+            discretizer.discretize(column.astype(dtype) if np.issubdtype(dtype, np.integer) else column)
+            # the view must be released before closing the block
+            del column
+        finally:
+            block.close()
+        return discretizer
+
+    def __fit_discretizers_parallel(self, discretizers: dict, columns: dict) -> None:
+        """fits the discretizers of the attributes in columns with a pool of processes, the columns are copied
+        once in a shared memory block so that they are not pickled to every process.
+        The fitted discretizers replace the ones in discretizers
+
+        :param discretizers: dict where the key is the attribute and the value the discretizer to fit
+        :type discretizers: dict{str: Discretizer}
+        :param columns: dict where the key is the attribute and the value the array of its values
+        :type columns: dict{str: np.ndarray}
+        """
+        import os
+        import numpy as np
+        from multiprocessing import Pool, shared_memory
+
+        attributes = list(columns.keys())
+        shape = (len(attributes), len(columns[attributes[0]]))
+        block = shared_memory.SharedMemory(create=True, size=max(8 * shape[0] * shape[1], 1))
+        try:
+            shared_columns = np.ndarray(shape, dtype=np.float64, buffer=block.buf)
+            for row, attribute in enumerate(attributes):
+                shared_columns[row] = columns[attribute]
+            del shared_columns
+
+            tasks = [(block.name, shape, row, columns[attribute].dtype, discretizers[attribute]) for row, attribute in enumerate(attributes)]
+            n_workers = min(self.__n_workers if self.__n_workers > 0 else os.cpu_count(), len(tasks))
+            with Pool(n_workers) as pool:
+                fitted = pool.imap(TracesController.fit_discretizer, tasks)
+                for attribute, discretizer in zip(attributes, tqdm(fitted, total=len(tasks))):
+                    discretizers[attribute] = discretizer
+        finally:
+            block.close()
+            block.unlink()
+
+    def __materialize_discretized_codes(self, columns: dict) -> None:
+        """computes once the code of the bin of every discretized attribute of every event and stores them
+        in the events (or in the columnar store), so that the bins are not searched again by the getters and the xes writer.
+        The events are processed in blocks of CODES_BLOCK_SIZE, the values of the attributes not in columns
+        (e.g. the ones of the bins created from the sketches or loaded) are collected one block at a time
+
+        :param columns: values of the attributes already collected for the fitting, the others are collected here
+        :type columns: dict{str: np.ndarray}
+        """
+        import numpy as np
+
+        discretizers = [getattr(TracesController.DISCRETIZABLE_ATTRIBUTES[attribute], f'disc_{attribute}') for attribute in Event.DISCRETIZED_ATTRIBUTES]
+        # the codes must fit in a byte, otherwise the codes of a previous discretization are removed
+        # and the getters discretize the values again
+        if any(discretizer is not None and len(discretizer.get_bin_labels()) >= Event.OUT_OF_BOUNDS_CODE for discretizer in discretizers):
+            if self.__traces_store is not None:
+                self.__traces_store.set_discretized_codes(None)
             else:
-                f.write(str(rough_string)[2:-1])
-            print('...writing the list of Traces to a xes file completed')
-        
-    def __get_list_of_attribute(self, attribute: str) -> list:
-        """Returns a list of the values of the attribute specified in attribute
-
-        Possible values of attribute_to_discretize:
-            - orig_bytes
-            - resp_bytes
-            - missed_bytes
-            - orig_pkts
-            - duration
-            - orig_ip_bytes
-            - resp_pkts
-            - resp_ip_bytes
-
-        :param attribute: name of the attribute from where to collect data from
+                for trace in self.__network_traffic:
+                    for event in trace.get_events():
+                        event.set_discretized_codes(None)
+            return
+        discretized = [(j, attribute, discretizer) for j, (attribute, discretizer) in enumerate(zip(Event.DISCRETIZED_ATTRIBUTES, discretizers)) if discretizer is not None]
+        missing_attributes = [attribute for _, attribute, _ in discretized if attribute not in columns]
+
+        def block_codes(start, end, block_columns):
+            codes = np.full((end - start, len(Event.DISCRETIZED_ATTRIBUTES)), Event.OUT_OF_BOUNDS_CODE, dtype=np.uint8)
+            for j, attribute, discretizer in discretized:
+                values = columns[attribute][start:end] if attribute in columns else block_columns[attribute]
+                # the missing values are 0
+                attribute_codes = discretizer.discretize_values(np.nan_to_num(np.asarray(values, dtype=float), nan=0.0))
+                codes[:, j] = np.where(attribute_codes < 0, Event.OUT_OF_BOUNDS_CODE, attribute_codes)
+            return codes
+
+        if self.__traces_store is not None:
+            n_events = self.__traces_store.get_n_events()
+            codes = np.empty((n_events, len(Event.DISCRETIZED_ATTRIBUTES)), dtype=np.uint8)
+            for start in range(0, n_events, TracesController.CODES_BLOCK_SIZE):
+                end = min(start + TracesController.CODES_BLOCK_SIZE, n_events)
+                block_columns = {attribute: self.__traces_store.get_column(attribute, start, end) for attribute in missing_attributes}
+                codes[start:end] = block_codes(start, end, block_columns)
+            self.__traces_store.set_discretized_codes(codes)
+            return
+
+        def event_blocks():
+            block = []
+            for trace in self.__network_traffic:
+                block.extend(trace.get_events())
+                if len(block) >= TracesController.CODES_BLOCK_SIZE:
+                    yield block
+                    block = []
+            if block:
+                yield block
+
+        getters = [getattr(Event, f'get_{attribute}') for attribute in missing_attributes]
+        start = 0
+        for block in event_blocks():
+            end = start + len(block)
+            values = np.array([[getter(event) for getter in getters] for event in block], dtype=float).reshape(len(block), len(getters))
+            for event, row in zip(block, block_codes(start, end, dict(zip(missing_attributes, values.T)))):
+                event.set_discretized_codes(row.tobytes())
+            start = end
+
+    def __install_discretizer(self, attribute: str, discretizer: Discretizer) -> None:
+        """sets the discretizer of an attribute in Event or EventHistory, with the labels chosen in discretize_attributes
+
+        :param attribute: name of the attribute
         :type attribute: str
-        :return: list of all the values of that attribute
-        :rtype: list
-        :raises ValueError: raised if attribute is not one of the attributes to discretize
-        """
-        from itertools import chain
-
-        if 'orig_bytes' == attribute:
-            return list(chain.from_iterable([trace.get_list_of_orig_bytes() for trace in self.__network_traffic]))
-        elif 'resp_bytes' == attribute:
-            return list(chain.from_iterable([trace.get_list_of_resp_bytes() for trace in self.__network_traffic]))
-        elif 'missed_bytes' == attribute:
-            return list(chain.from_iterable([trace.get_list_of_missed_bytes() for trace in self.__network_traffic]))
-        elif 'orig_pkts' == attribute:
-            return list(chain.from_iterable([trace.get_list_of_orig_pkts() for trace in self.__network_traffic]))
-        elif 'duration' == attribute:
-            return list(chain.from_iterable([trace.get_list_of_duration() for trace in self.__network_traffic]))
-        elif 'orig_ip_bytes' == attribute:
-            return list(chain.from_iterable([trace.get_list_of_orig_ip_bytes() for trace in self.__network_traffic]))
-        elif 'resp_pkts' == attribute:
-            return list(chain.from_iterable([trace.get_list_of_resp_pkts() for trace in self.__network_traffic]))
-        elif 'resp_ip_bytes' == attribute:
-            return list(chain.from_iterable([trace.get_list_of_resp_ip_bytes() for trace in self.__network_traffic]))
-
-        elif 'orig_syn' == attribute:
-            return list(chain.from_iterable([trace.get_list_of_orig_syn() for trace in self.__network_traffic]))
-        elif 'orig_fin' == attribute:
-            return list(chain.from_iterable([trace.get_list_of_orig_fin() for trace in self.__network_traffic]))
-        elif 'orig_syn_ack' == attribute:
-            return list(chain.from_iterable([trace.get_list_of_orig_syn_ack() for trace in self.__network_traffic]))
-        elif 'orig_rst' == attribute:
-            return list(chain.from_iterable([trace.get_list_of_orig_rst() for trace in self.__network_traffic]))
-        elif 'resp_syn' == attribute:
-            return list(chain.from_iterable([trace.get_list_of_resp_syn() for trace in self.__network_traffic]))
-        elif 'resp_fin' == attribute:
-            return list(chain.from_iterable([trace.get_list_of_resp_fin() for trace in self.__network_traffic]))
-        elif 'resp_syn_ack' == attribute:
-            return list(chain.from_iterable([trace.get_list_of_resp_syn_ack() for trace in self.__network_traffic]))
-        elif 'resp_rst' == attribute:
-            return list(chain.from_iterable([trace.get_list_of_resp_rst() for trace in self.__network_traffic]))
-        elif 'orig_bad_checksum' == attribute:
-            return list(chain.from_iterable([trace.get_list_of_orig_bad_checksum() for trace in self.__network_traffic]))
-        elif 'orig_content_gap' == attribute:
-            return list(chain.from_iterable([trace.get_list_of_orig_content_gap() for trace in self.__network_traffic]))
-        elif 'orig_retransmitted_payload' == attribute:
-            return list(chain.from_iterable([trace.get_list_of_orig_retransmitted_payload() for trace in self.__network_traffic]))
-        elif 'orig_zero_window' == attribute:
-            return list(chain.from_iterable([trace.get_list_of_orig_zero_window() for trace in self.__network_traffic]))
-        elif 'resp_bad_checksum' == attribute:
-            return list(chain.from_iterable([trace.get_list_of_resp_bad_checksum() for trace in self.__network_traffic]))
-        elif 'resp_content_gap' == attribute:
-            return list(chain.from_iterable([trace.get_list_of_resp_content_gap() for trace in self.__network_traffic]))
-        elif 'resp_retransmitted_payload' == attribute:
-            return list(chain.from_iterable([trace.get_list_of_resp_retransmitted_payload() for trace in self.__network_traffic]))
-        elif 'resp_zero_window' == attribute:
-            return list(chain.from_iterable([trace.get_list_of_resp_zero_window() for trace in self.__network_traffic]))
-        else:
-            raise ValueError('attribute must be one of these: orig_bytes, resp_bytes, missed_bytes, orig_pkts, duration, orig_ip_bytes, resp_pkts, resp_ip_bytes')
+        :param discretizer: the discretizer with its bins
+        :type discretizer: Discretizer
+        """
+        discretizer.set_bin_codes(self.__bin_codes)
+        setattr(TracesController.DISCRETIZABLE_ATTRIBUTES[attribute], f'disc_{attribute}', discretizer)
 
-    def discretize_attributes(self, disc_type: DISCRETIZATION_TYPE, n_bins_dict: dict, filepath_discretization: str, save_discretization: bool) -> None:
-        """Discretizes all the attribute with equal width of frequency discretization depending of the type given in disc_type
+    def discretize_attributes(self, disc_type: DISCRETIZATION_TYPE, n_bins_dict: dict, filepath_discretization: str, save_discretization: bool, log_base: float=10, bin_codes: bool=False) -> None:
+        """Discretizes all the attribute with equal width, equal frequency or logarithmic discretization depending of the type given in disc_type
 
-        Possible values of the attributes_to_discretize:
+        Possible values of the attributes_to_discretize are the keys of DISCRETIZABLE_ATTRIBUTES:
             #. orig_bytes
             #. resp_bytes
             #. missed_bytes
@@ -527,197 +1183,96 @@ class TracesController:
             #. orig_ip_bytes
             #. resp_pkts
             #. resp_ip_bytes
+            #. the counters of the history (orig_syn, orig_fin, ..., resp_zero_window)
 
         :param disc_type: the type of discretization to instantiate
         :type disc_type: DISCRETIZATION_TYPE
         :param n_bins_dict: dictionary where the key is the attribute to witch apply discretization and the value is the number of bins for that attribute
         :type n_bins_dict: dict
-        :raises ValueError: raised if the disc_type is not either EQUAL_WIDTH or EQUAL_FREQUENCY
+        :param filepath_discretization: path of the directory where the bins are saved
+        :type filepath_discretization: str
+        :param save_discretization: True to create and save the bins, False to load them,
+            None to load them only if they have been created from the same inputs (see get_data_fingerprint)
+        :type save_discretization: bool | None
+        :param log_base: base of the logarithm of the logarithmic discretization, defaults to 10
+        :type log_base: float, optional
+        :param bin_codes: True to write the discretized values as the codes of their bins (b0, b1, ...) instead of their intervals,
+            the intervals are written in a side table next to the xes file, defaults to False
+        :type bin_codes: bool, optional
+        :raises ValueError: raised if the disc_type is not either EQUAL_WIDTH, EQUAL_FREQUENCY or LOGARITHMIC
+            or if the bins to load have been created with another type of discretization
         """
         import os
 
         attributes_to_discretize = list(n_bins_dict.keys())
+        self.__bin_codes = bin_codes
         try:
             os.makedirs(filepath_discretization)
         except:
             pass
-        
-        if disc_type == DISCRETIZATION_TYPE.EQUAL_WIDTH:
-            if 'orig_bytes' in attributes_to_discretize:
-                Event.disc_orig_bytes = Equal_Width_Discretizer(n_bins_dict['orig_bytes'][0], n_bins_dict['orig_bytes'][1], f'{filepath_discretization}/orig_bytes.bin', save_discretization)
-            if 'resp_bytes' in attributes_to_discretize:
-                Event.disc_resp_bytes = Equal_Width_Discretizer(n_bins_dict['resp_bytes'][0], n_bins_dict['resp_bytes'][1], f'{filepath_discretization}/resp_bytes.bin', save_discretization)
-            if 'missed_bytes' in attributes_to_discretize:
-                Event.disc_missed_bytes = Equal_Width_Discretizer(n_bins_dict['missed_bytes'][0], n_bins_dict['missed_bytes'][1], f'{filepath_discretization}/missed_bytes.bin', save_discretization)
-            if 'orig_pkts' in attributes_to_discretize:
-                Event.disc_orig_pkts = Equal_Width_Discretizer(n_bins_dict['orig_pkts'][0], n_bins_dict['orig_pkts'][1], f'{filepath_discretization}/orig_pkts.bin', save_discretization)
-            if 'duration' in attributes_to_discretize:
-                Event.disc_duration = Equal_Width_Discretizer(n_bins_dict['duration'][0], n_bins_dict['duration'][1], f'{filepath_discretization}/duration.bin', save_discretization)
-            if 'orig_ip_bytes' in attributes_to_discretize:
-                Event.disc_orig_ip_bytes = Equal_Width_Discretizer(n_bins_dict['orig_ip_bytes'][0], n_bins_dict['orig_ip_bytes'][1], f'{filepath_discretization}/orig_ip_bytes.bin', save_discretization)
-            if 'resp_pkts' in attributes_to_discretize:
-                Event.disc_resp_pkts = Equal_Width_Discretizer(n_bins_dict['resp_pkts'][0], n_bins_dict['resp_pkts'][1], f'{filepath_discretization}/resp_pkts.bin', save_discretization)
-            if 'resp_ip_bytes' in attributes_to_discretize: 
-                Event.disc_resp_ip_bytes = Equal_Width_Discretizer(n_bins_dict['resp_ip_bytes'][0], n_bins_dict['resp_ip_bytes'][1], f'{filepath_discretization}/resp_ip_bytes.bin', save_discretization)
-                
-            if 'orig_syn' in attributes_to_discretize: 
-                EventHistory.disc_orig_syn = Equal_Width_Discretizer(n_bins_dict['orig_syn'][0], n_bins_dict['orig_syn'][1], f'{filepath_discretization}/orig_syn.bin', save_discretization)
-            if 'orig_fin' in attributes_to_discretize: 
-                EventHistory.disc_orig_fin = Equal_Width_Discretizer(n_bins_dict['orig_fin'][0], n_bins_dict['orig_fin'][1], f'{filepath_discretization}/orig_fin.bin', save_discretization)
-            if 'orig_syn_ack' in attributes_to_discretize: 
-                EventHistory.disc_orig_syn_ack = Equal_Width_Discretizer(n_bins_dict['orig_syn_ack'][0], n_bins_dict['orig_syn_ack'][1], f'{filepath_discretization}/orig_syn_ack.bin', save_discretization)
-            if 'orig_rst' in attributes_to_discretize: 
-                EventHistory.disc_orig_rst = Equal_Width_Discretizer(n_bins_dict['orig_rst'][0], n_bins_dict['orig_rst'][1], f'{filepath_discretization}/orig_rst.bin', save_discretization)
-            if 'resp_syn' in attributes_to_discretize: 
-                EventHistory.disc_resp_syn = Equal_Width_Discretizer(n_bins_dict['resp_syn'][0], n_bins_dict['resp_syn'][1], f'{filepath_discretization}/resp_syn.bin', save_discretization)
-            if 'resp_fin' in attributes_to_discretize: 
-                EventHistory.disc_resp_fin = Equal_Width_Discretizer(n_bins_dict['resp_fin'][0], n_bins_dict['resp_fin'][1], f'{filepath_discretization}/resp_fin.bin', save_discretization)
-            if 'resp_syn_ack' in attributes_to_discretize: 
-                EventHistory.disc_resp_syn_ack = Equal_Width_Discretizer(n_bins_dict['resp_syn_ack'][0], n_bins_dict['resp_syn_ack'][1], f'{filepath_discretization}/resp_syn_ack.bin', save_discretization)
-            if 'resp_rst' in attributes_to_discretize: 
-                EventHistory.disc_resp_rst = Equal_Width_Discretizer(n_bins_dict['resp_rst'][0], n_bins_dict['resp_rst'][1], f'{filepath_discretization}/resp_rst.bin', save_discretization)
-            if 'orig_bad_checksum' in attributes_to_discretize: 
-                EventHistory.disc_orig_bad_checksum = Equal_Width_Discretizer(n_bins_dict['orig_bad_checksum'][0], n_bins_dict['orig_bad_checksum'][1], f'{filepath_discretization}/orig_bad_checksum.bin', save_discretization)
-            if 'orig_content_gap' in attributes_to_discretize: 
-                EventHistory.disc_orig_content_gap = Equal_Width_Discretizer(n_bins_dict['orig_content_gap'][0], n_bins_dict['orig_content_gap'][1], f'{filepath_discretization}/orig_content_gap.bin', save_discretization)
-            if 'orig_retransmitted_payload' in attributes_to_discretize: 
-                EventHistory.disc_orig_retransmitted_payload = Equal_Width_Discretizer(n_bins_dict['orig_retransmitted_payload'][0], n_bins_dict['orig_retransmitted_payload'][1], f'{filepath_discretization}/orig_retransmitted_payload.bin', save_discretization)
-            if 'orig_zero_window' in attributes_to_discretize: 
-                EventHistory.disc_orig_zero_window = Equal_Width_Discretizer(n_bins_dict['orig_zero_window'][0], n_bins_dict['orig_zero_window'][1], f'{filepath_discretization}/orig_zero_window.bin', save_discretization)
-            if 'resp_bad_checksum' in attributes_to_discretize: 
-                EventHistory.disc_resp_bad_checksum = Equal_Width_Discretizer(n_bins_dict['resp_bad_checksum'][0], n_bins_dict['resp_bad_checksum'][1], f'{filepath_discretization}/resp_bad_checksum.bin', save_discretization)
-            if 'resp_content_gap' in attributes_to_discretize: 
-                EventHistory.disc_resp_content_gap = Equal_Width_Discretizer(n_bins_dict['resp_content_gap'][0], n_bins_dict['resp_content_gap'][1], f'{filepath_discretization}/resp_content_gap.bin', save_discretization)
-            if 'resp_retransmitted_payload' in attributes_to_discretize: 
-                EventHistory.disc_resp_retransmitted_payload = Equal_Width_Discretizer(n_bins_dict['resp_retransmitted_payload'][0], n_bins_dict['resp_retransmitted_payload'][1], f'{filepath_discretization}/resp_retransmitted_payload.bin', save_discretization)
-            if 'resp_zero_window' in attributes_to_discretize: 
-                EventHistory.disc_resp_zero_window = Equal_Width_Discretizer(n_bins_dict['resp_zero_window'][0], n_bins_dict['resp_zero_window'][1], f'{filepath_discretization}/resp_zero_window.bin', save_discretization)
-
 
+        if disc_type == DISCRETIZATION_TYPE.EQUAL_WIDTH:
+            discretizer_class = Equal_Width_Discretizer
         elif disc_type == DISCRETIZATION_TYPE.EQUAL_FREQUENCY:
-            if 'orig_bytes' in attributes_to_discretize:
-                Event.disc_orig_bytes = Equal_Frequency_Discretizer(n_bins_dict['orig_bytes'][0], n_bins_dict['orig_bytes'][1], f'{filepath_discretization}/orig_bytes.bin', save_discretization)
-            if 'resp_bytes' in attributes_to_discretize:
-                Event.disc_resp_bytes = Equal_Frequency_Discretizer(n_bins_dict['resp_bytes'][0], n_bins_dict['resp_bytes'][1], f'{filepath_discretization}/resp_bytes.bin', save_discretization)
-            if 'missed_bytes' in attributes_to_discretize:
-                Event.disc_missed_bytes = Equal_Frequency_Discretizer(n_bins_dict['missed_bytes'][0], n_bins_dict['missed_bytes'][1], f'{filepath_discretization}/missed_bytes.bin', save_discretization)
-            if 'orig_pkts' in attributes_to_discretize:
-                Event.disc_orig_pkts = Equal_Frequency_Discretizer(n_bins_dict['orig_pkts'][0], n_bins_dict['orig_pkts'][1], f'{filepath_discretization}/orig_pkts.bin', save_discretization)
-            if 'duration' in attributes_to_discretize:
-                Event.disc_duration = Equal_Frequency_Discretizer(n_bins_dict['duration'][0], n_bins_dict['duration'][1], f'{filepath_discretization}/duration.bin', save_discretization)
-            if 'orig_ip_bytes' in attributes_to_discretize:
-                Event.disc_orig_ip_bytes = Equal_Frequency_Discretizer(n_bins_dict['orig_ip_bytes'][0], n_bins_dict['orig_ip_bytes'][1], f'{filepath_discretization}/orig_ip_bytes.bin', save_discretization)
-            if 'resp_pkts' in attributes_to_discretize:
-                Event.disc_resp_pkts = Equal_Frequency_Discretizer(n_bins_dict['resp_pkts'][0], n_bins_dict['resp_pkts'][1], f'{filepath_discretization}/resp_pkts.bin', save_discretization)
-            if 'resp_ip_bytes' in attributes_to_discretize: 
-                Event.disc_resp_ip_bytes = Equal_Frequency_Discretizer(n_bins_dict['resp_ip_bytes'][0], n_bins_dict['resp_ip_bytes'][1], f'{filepath_discretization}/resp_ip_bytes.bin', save_discretization)
-
-            if 'orig_syn' in attributes_to_discretize: 
-                EventHistory.disc_orig_syn = Equal_Frequency_Discretizer(n_bins_dict['orig_syn'][0], n_bins_dict['orig_syn'][1], f'{filepath_discretization}/orig_syn.bin', save_discretization)
-            if 'orig_fin' in attributes_to_discretize: 
-                EventHistory.disc_orig_fin = Equal_Frequency_Discretizer(n_bins_dict['orig_fin'][0], n_bins_dict['orig_fin'][1], f'{filepath_discretization}/orig_fin.bin', save_discretization)
-            if 'orig_syn_ack' in attributes_to_discretize: 
-                EventHistory.disc_orig_syn_ack = Equal_Frequency_Discretizer(n_bins_dict['orig_syn_ack'][0], n_bins_dict['orig_syn_ack'][1], f'{filepath_discretization}/orig_syn_ack.bin', save_discretization)
-            if 'orig_rst' in attributes_to_discretize: 
-                EventHistory.disc_orig_rst = Equal_Frequency_Discretizer(n_bins_dict['orig_rst'][0], n_bins_dict['orig_rst'][1], f'{filepath_discretization}/orig_rst.bin', save_discretization)
-            if 'resp_syn' in attributes_to_discretize: 
-                EventHistory.disc_resp_syn = Equal_Frequency_Discretizer(n_bins_dict['resp_syn'][0], n_bins_dict['resp_syn'][1], f'{filepath_discretization}/resp_syn.bin', save_discretization)
-            if 'resp_fin' in attributes_to_discretize: 
-                EventHistory.disc_resp_fin = Equal_Frequency_Discretizer(n_bins_dict['resp_fin'][0], n_bins_dict['resp_fin'][1], f'{filepath_discretization}/resp_fin.bin', save_discretization)
-            if 'resp_syn_ack' in attributes_to_discretize: 
-                EventHistory.disc_resp_syn_ack = Equal_Frequency_Discretizer(n_bins_dict['resp_syn_ack'][0], n_bins_dict['resp_syn_ack'][1], f'{filepath_discretization}/resp_syn_ack.bin', save_discretization)
-            if 'resp_rst' in attributes_to_discretize: 
-                EventHistory.disc_resp_rst = Equal_Frequency_Discretizer(n_bins_dict['resp_rst'][0], n_bins_dict['resp_rst'][1], f'{filepath_discretization}/resp_rst.bin', save_discretization)
-            if 'orig_bad_checksum' in attributes_to_discretize: 
-                EventHistory.disc_orig_bad_checksum = Equal_Frequency_Discretizer(n_bins_dict['orig_bad_checksum'][0], n_bins_dict['orig_bad_checksum'][1], f'{filepath_discretization}/orig_bad_checksum.bin', save_discretization)
-            if 'orig_content_gap' in attributes_to_discretize: 
-                EventHistory.disc_orig_content_gap = Equal_Frequency_Discretizer(n_bins_dict['orig_content_gap'][0], n_bins_dict['orig_content_gap'][1], f'{filepath_discretization}/orig_content_gap.bin', save_discretization)
-            if 'orig_retransmitted_payload' in attributes_to_discretize: 
-                EventHistory.disc_orig_retransmitted_payload = Equal_Frequency_Discretizer(n_bins_dict['orig_retransmitted_payload'][0], n_bins_dict['orig_retransmitted_payload'][1], f'{filepath_discretization}/orig_retransmitted_payload.bin', save_discretization)
-            if 'orig_zero_window' in attributes_to_discretize: 
-                EventHistory.disc_orig_zero_window = Equal_Frequency_Discretizer(n_bins_dict['orig_zero_window'][0], n_bins_dict['orig_zero_window'][1], f'{filepath_discretization}/orig_zero_window.bin', save_discretization)
-            if 'resp_bad_checksum' in attributes_to_discretize: 
-                EventHistory.disc_resp_bad_checksum = Equal_Frequency_Discretizer(n_bins_dict['resp_bad_checksum'][0], n_bins_dict['resp_bad_checksum'][1], f'{filepath_discretization}/resp_bad_checksum.bin', save_discretization)
-            if 'resp_content_gap' in attributes_to_discretize: 
-                EventHistory.disc_resp_content_gap = Equal_Frequency_Discretizer(n_bins_dict['resp_content_gap'][0], n_bins_dict['resp_content_gap'][1], f'{filepath_discretization}/resp_content_gap.bin', save_discretization)
-            if 'resp_retransmitted_payload' in attributes_to_discretize: 
-                EventHistory.disc_resp_retransmitted_payload = Equal_Frequency_Discretizer(n_bins_dict['resp_retransmitted_payload'][0], n_bins_dict['resp_retransmitted_payload'][1], f'{filepath_discretization}/resp_retransmitted_payload.bin', save_discretization)
-            if 'resp_zero_window' in attributes_to_discretize: 
-                EventHistory.disc_resp_zero_window = Equal_Frequency_Discretizer(n_bins_dict['resp_zero_window'][0], n_bins_dict['resp_zero_window'][1], f'{filepath_discretization}/resp_zero_window.bin', save_discretization)
+            discretizer_class = Equal_Frequency_Discretizer
+        elif disc_type == DISCRETIZATION_TYPE.LOGARITHMIC:
+            # the logarithmic bins don't depend on the data, there is nothing to create, save or load
+            for attribute in attributes_to_discretize:
+                discretizer = Logarithmic_Discretizer(n_bins_dict[attribute][0], n_bins_dict[attribute][1], base=log_base)
+                self.__install_discretizer(attribute, discretizer)
+            self.__materialize_discretized_codes({})
+            return
         else:
             raise ValueError('the type of discretization is not valid')
-        
+
+        sketched = bool(self.__sketches) and discretizer_class is Equal_Frequency_Discretizer
+        fingerprint = self.get_data_fingerprint(disc_type, n_bins_dict, sketched)
+        if save_discretization is None:
+            save_discretization = not self.has_discretization(disc_type, n_bins_dict, filepath_discretization, sketched)
+            print('the discretization inputs changed, creating the bins...' if save_discretization else 'the discretization inputs did not change, loading the bins...')
+
+        # the bins of all the attributes are saved in a single bundle,
+        # the file of every attribute is read only if there is no bundle
+        bundle_path = f'{filepath_discretization}/{DiscretizationBundle.FILENAME}'
+        if not save_discretization and os.path.exists(bundle_path):
+            bundle = DiscretizationBundle.load(bundle_path)
+            if bundle.get_method() != disc_type.name:
+                raise ValueError(f'the bins in {bundle_path} have been created with {bundle.get_method()}, not with {disc_type.name}')
+            if bundle.get_fingerprint() != fingerprint:
+                print(f'warning: the bins in {bundle_path} have been created from different inputs')
+            for attribute in attributes_to_discretize:
+                discretizer = discretizer_class(n_bins_dict[attribute][0], n_bins_dict[attribute][1])
+                bundle.load_discretizer(attribute, discretizer)
+                self.__install_discretizer(attribute, discretizer)
+            self.__materialize_discretized_codes({})
+            return
+
+        # the equal frequency bins of the attributes with a quantile sketch are created from the sketch
+        sketched_attributes = set(self.__sketches) if sketched else set()
+        # the values are needed only to create the bins, not to load them
+        columns = self.__get_columns_of_attributes([attribute for attribute in attributes_to_discretize if attribute not in sketched_attributes]) if save_discretization else {}
+
         print('discretizing all values of every event...')
+        discretizers = {attribute: discretizer_class(n_bins_dict[attribute][0], n_bins_dict[attribute][1], f'{filepath_discretization}/{attribute}.bin' if not save_discretization else '', save_discretization)
+            for attribute in attributes_to_discretize}
+        # the discretizers are independent, with more than one worker they are fitted in parallel
+        fitted_attributes = set()
+        if self.__n_workers != 1 and len(columns) > 1:
+            self.__fit_discretizers_parallel(discretizers, columns)
+            fitted_attributes = set(columns)
+
         for attribute in tqdm(attributes_to_discretize):
-            self.__apply_discretization(attribute)
-
-    def __apply_discretization(self, attribute_to_discretize: str):
-        """Creates bins for the attribute specified in attribute_to_discretize
-
-        Possible values of the attributes_to_discretize:
-            - orig_bytes
-            - resp_bytes
-            - missed_bytes
-            - orig_pkts
-            - duration
-            - orig_ip_bytes
-            - resp_pkts
-            - resp_ip_bytes
-
-        :param attribute_to_discretize: name of the attribute for which to create the bins
-        :type attribute_to_discretize: str
-        :raises ValueError: raised if attribute_to_discretize is not one of the attributes to discretize
-        """
-        attributes_values = self.__get_list_of_attribute(attribute_to_discretize)
-
-        if 'orig_bytes' == attribute_to_discretize:
-            Event.disc_orig_bytes.discretize(attributes_values)
-        elif 'resp_bytes' == attribute_to_discretize:
-            Event.disc_resp_bytes.discretize(attributes_values)
-        elif 'missed_bytes' == attribute_to_discretize:
-            Event.disc_missed_bytes.discretize(attributes_values)
-        elif 'orig_pkts' == attribute_to_discretize:
-            Event.disc_orig_pkts.discretize(attributes_values)
-        elif 'duration' == attribute_to_discretize:
-            Event.disc_duration.discretize(attributes_values)
-        elif 'orig_ip_bytes' == attribute_to_discretize:
-            Event.disc_orig_ip_bytes.discretize(attributes_values)
-        elif 'resp_pkts' == attribute_to_discretize:
-            Event.disc_resp_pkts.discretize(attributes_values)
-        elif 'resp_ip_bytes' == attribute_to_discretize: 
-            Event.disc_resp_ip_bytes.discretize(attributes_values)
-        
-        elif 'orig_syn' == attribute_to_discretize: 
-            EventHistory.disc_orig_syn.discretize(attributes_values)
-        elif 'orig_fin' == attribute_to_discretize: 
-            EventHistory.disc_orig_fin.discretize(attributes_values)
-        elif 'orig_syn_ack' == attribute_to_discretize: 
-            EventHistory.disc_orig_syn_ack.discretize(attributes_values)
-        elif 'orig_rst' == attribute_to_discretize: 
-            EventHistory.disc_orig_rst.discretize(attributes_values)
-        elif 'resp_syn' == attribute_to_discretize: 
-            EventHistory.disc_resp_syn.discretize(attributes_values)
-        elif 'resp_fin' == attribute_to_discretize: 
-            EventHistory.disc_resp_fin.discretize(attributes_values)
-        elif 'resp_syn_ack' == attribute_to_discretize: 
-            EventHistory.disc_resp_syn_ack.discretize(attributes_values)
-        elif 'resp_rst' == attribute_to_discretize: 
-            EventHistory.disc_resp_rst.discretize(attributes_values)
-        elif 'orig_bad_checksum' == attribute_to_discretize: 
-            EventHistory.disc_orig_bad_checksum.discretize(attributes_values)
-        elif 'orig_content_gap' == attribute_to_discretize: 
-            EventHistory.disc_orig_content_gap.discretize(attributes_values)
-        elif 'orig_retransmitted_payload' == attribute_to_discretize: 
-            EventHistory.disc_orig_retransmitted_payload.discretize(attributes_values)
-        elif 'orig_zero_window' == attribute_to_discretize: 
-            EventHistory.disc_orig_zero_window.discretize(attributes_values)
-        elif 'resp_bad_checksum' == attribute_to_discretize: 
-            EventHistory.disc_resp_bad_checksum.discretize(attributes_values)
-        elif 'resp_content_gap' == attribute_to_discretize: 
-            EventHistory.disc_resp_content_gap.discretize(attributes_values)
-        elif 'resp_retransmitted_payload' == attribute_to_discretize: 
-            EventHistory.disc_resp_retransmitted_payload.discretize(attributes_values)
-        elif 'resp_zero_window' == attribute_to_discretize: 
-            EventHistory.disc_resp_zero_window.discretize(attributes_values)
-        else:
-            raise ValueError('attribute_to_discretize must be one of these: orig_bytes, resp_bytes, missed_bytes, orig_pkts, duration, orig_ip_bytes, resp_pkts, resp_ip_bytes') 
+            discretizer = discretizers[attribute]
+            if attribute in sketched_attributes:
+                discretizer.discretize_sketch(self.__sketches[attribute])
+            elif attribute not in fitted_attributes:
+                discretizer.discretize(columns.get(attribute))
+            self.__install_discretizer(attribute, discretizer)
+
+        if save_discretization:
+            bundle = DiscretizationBundle(disc_type.name, fingerprint)
+            for attribute in attributes_to_discretize:
+                bundle.add(attribute, discretizers[attribute])
+            bundle.save(bundle_path)
+
+        self.__materialize_discretized_codes(columns)
@@ -0,0 +1,298 @@
+from array import array
+from math import nan
+import numpy as np
+from .EventHistory import EventHistory
+from .Event import Event
+from .Trace import Trace
+from .Codebook import Codebook
+
+class TracesStore:
+    """
+    Columnar store of the traces and of their events, alternative to the list of Trace objects.
+    Every field of the events is kept in its own column (struct of arrays) instead of an Event
+    and an EventHistory object per line:
+        * numeric fields in float64 columns, parsed once while reading ('-' is stored as nan like in Event)
+        * service, conn_state and history as codes of a codebook of their distinct values
+        * the history counters in a table with one row for each distinct history string
+
+    While reading, the columns are growing array.array buffers, after finalize they become numpy arrays
+    and the events are grouped by trace (the events of the trace i are order[offsets[i]:offsets[i + 1]],
+    in the same order they have been read). Trace and Event objects are created only on demand.
+    With select_attributes only the columns of the selected attributes are parsed and stored
+
+    :param __trace_ids: dict where the key is the key of the trace (Trace.generate_key_static) and the value its index
+    :type __trace_ids: dict{tuple: int}
+    :param __trace_fields: for every trace orig_ip, orig_port, resp_ip, resp_port, proto, ts_on_open and label
+    :type __trace_fields: list[tuple]
+    :param __columns: columns of the events
+    :type __columns: dict{str: array | np.ndarray}
+    :param __fields: name and position in the lines of the conn.log of the stored categorical and numeric attributes
+    :type __fields: tuple[list[tuple[str, int]], list[tuple[str, int]]]
+    :param __codebooks: codebooks of service, conn_state and history
+    :type __codebooks: dict{str: Codebook}
+    :param __history_table: values of the history attributes for every distinct history string
+    :type __history_table: np.ndarray
+    :param __order: indices of the events grouped by trace
+    :type __order: np.ndarray
+    :param __offsets: position in order of the first event of every trace
+    :type __offsets: np.ndarray
+    :param __discretized_codes: for every event the codes of the bins of Event.DISCRETIZED_ATTRIBUTES, None if not computed
+    :type __discretized_codes: np.ndarray
+    """
+    NUMERIC_ATTRIBUTES = [
+        'duration',
+        'orig_bytes',
+        'resp_bytes',
+        'missed_bytes',
+        'orig_pkts',
+        'orig_ip_bytes',
+        'resp_pkts',
+        'resp_ip_bytes',
+    ]
+    # same order of EventHistory.get_history_with_values
+    HISTORY_ATTRIBUTES = [
+        'orig_syn', 'orig_fin', 'orig_syn_ack', 'orig_rst',
+        'resp_syn', 'resp_fin', 'resp_syn_ack', 'resp_rst',
+        'orig_ack', 'orig_payload', 'orig_inconsistent', 'orig_multi_flag',
+        'resp_ack', 'resp_payload', 'resp_inconsistent', 'resp_multi_flag',
+        'orig_bad_checksum', 'orig_content_gap', 'orig_retransmitted_payload', 'orig_zero_window',
+        'resp_bad_checksum', 'resp_content_gap', 'resp_retransmitted_payload', 'resp_zero_window',
+        'conn_dir_flipped',
+    ]
+    BOOLEAN_HISTORY_ATTRIBUTES = {
+        'orig_ack', 'orig_payload', 'orig_inconsistent', 'orig_multi_flag',
+        'resp_ack', 'resp_payload', 'resp_inconsistent', 'resp_multi_flag',
+        'conn_dir_flipped',
+    }
+    CATEGORICAL_ATTRIBUTES = ['service', 'conn_state', 'history']
+    # position in the lines of the conn.log of the stored attributes
+    FIELD_INDICES = {
+        'service': 7,
+        'duration': 8,
+        'orig_bytes': 9,
+        'resp_bytes': 10,
+        'conn_state': 11,
+        'missed_bytes': 14,
+        'history': 15,
+        'orig_pkts': 16,
+        'orig_ip_bytes': 17,
+        'resp_pkts': 18,
+        'resp_ip_bytes': 19,
+    }
+    # typecodes of the buffers used while reading
+    BUFFER_TYPES = {'ts': 'd', 'trace': 'L', 'service': 'L', 'conn_state': 'L', 'history': 'L'}
+    # types of the columns after finalize
+    COLUMN_TYPES = {'ts': np.float64, 'trace': np.uint32, 'service': np.uint16, 'conn_state': np.uint8, 'history': np.uint32}
+
+    def __init__(self) -> None:
+        """Constructor, creates an empty store
+        """
+        self.__trace_ids = {}
+        self.__trace_fields = []
+        self.__columns = None
+        self.__fields = None
+        self.select_attributes(TracesStore.CATEGORICAL_ATTRIBUTES + TracesStore.NUMERIC_ATTRIBUTES)
+        self.__codebooks = {name: Codebook() for name in TracesStore.CATEGORICAL_ATTRIBUTES}
+        self.__history_table = None
+        self.__order = None
+        self.__offsets = None
+        self.__discretized_codes = None
+
+    def select_attributes(self, attributes: list) -> None:
+        """makes the store parse and keep only the columns of the given attributes (ts and the fields of the traces are always kept),
+        the history is kept only if one of the history attributes is selected. It must be called before add_line
+
+        :param attributes: attributes of the events to keep, the ones not stored in columns are ignored
+        :type attributes: list[str]
+        """
+        attributes = set(attributes)
+        if attributes.intersection(TracesStore.HISTORY_ATTRIBUTES):
+            attributes.add('history')
+        self.__fields = (
+            [(name, TracesStore.FIELD_INDICES[name]) for name in TracesStore.CATEGORICAL_ATTRIBUTES if name in attributes],
+            [(name, TracesStore.FIELD_INDICES[name]) for name in TracesStore.NUMERIC_ATTRIBUTES if name in attributes],
+        )
+        self.__columns = {'ts': array(TracesStore.BUFFER_TYPES['ts']), 'trace': array(TracesStore.BUFFER_TYPES['trace'])}
+        self.__columns.update({name: array(TracesStore.BUFFER_TYPES[name]) for name, _ in self.__fields[0]})
+        self.__columns.update({name: array('d') for name, _ in self.__fields[1]})
+
+    def add_line(self, list_to_pack: list) -> None:
+        """adds the event of a line of the conn.log to the store, creating its trace if it's the first one
+
+        :param list_to_pack: fields of the line
+        :type list_to_pack: list[str]
+        """
+        columns = self.__columns
+        id = Trace.generate_key_static(list_to_pack[2], list_to_pack[3], list_to_pack[4], list_to_pack[5], list_to_pack[6])
+        try:
+            trace = self.__trace_ids[id]
+        except KeyError:
+            trace = self.__trace_ids[id] = len(self.__trace_fields)
+            self.__trace_fields.append((list_to_pack[2], list_to_pack[3], list_to_pack[4], list_to_pack[5], list_to_pack[6], list_to_pack[0], list_to_pack[21]))
+
+        columns['trace'].append(trace)
+        columns['ts'].append(float(list_to_pack[0]))
+        categorical_fields, numeric_fields = self.__fields
+        for name, index in categorical_fields:
+            columns[name].append(self.__codebooks[name].encode(list_to_pack[index]))
+        for name, index in numeric_fields:
+            value = list_to_pack[index]
+            columns[name].append(float(value) if value != '-' else nan)
+
+    def merge(self, other: 'TracesStore') -> None:
+        """appends the events of another store not yet finalized, read after the ones of this store,
+        the traces with the same id are merged and the codes are translated to the codebooks of this store
+
+        :param other: the store to append
+        :type other: TracesStore
+        """
+        trace_map = np.empty(len(other.__trace_fields), dtype=np.int64)
+        for id, other_trace in other.__trace_ids.items():
+            try:
+                trace_map[other_trace] = self.__trace_ids[id]
+            except KeyError:
+                trace_map[other_trace] = self.__trace_ids[id] = len(self.__trace_fields)
+                self.__trace_fields.append(other.__trace_fields[other_trace])
+
+        maps = {'trace': trace_map}
+        for name, _ in self.__fields[0]:
+            maps[name] = self.__codebooks[name].translate(other.__codebooks[name])
+
+        for name, column in other.__columns.items():
+            values = np.frombuffer(column, dtype=np.dtype(column.typecode)) if len(column) > 0 else np.empty(0, dtype=np.dtype(column.typecode))
+            if name in maps:
+                values = maps[name][values]
+            self.__columns[name].frombytes(values.astype(np.dtype(column.typecode)).tobytes())
+
+    def finalize(self) -> None:
+        """converts the buffers to numpy columns, groups the events by trace and analyzes
+        every distinct history string once (none if the history is not stored)
+        """
+        for name, column in self.__columns.items():
+            self.__columns[name] = np.array(column, dtype=TracesStore.COLUMN_TYPES.get(name, np.float64))
+
+        # a stable sort keeps the events of every trace in the order they have been read
+        self.__order = np.argsort(self.__columns['trace'], kind='stable')
+        self.__offsets = np.zeros(len(self.__trace_fields) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.__columns['trace'], minlength=len(self.__trace_fields)), out=self.__offsets[1:])
+
+        self.__history_table = np.array(
+            [[value for _, value in EventHistory.intern(history).get_history_with_values()[1:]] for history in self.__codebooks['history'].get_values()],
+            dtype=np.uint16).reshape(-1, len(TracesStore.HISTORY_ATTRIBUTES))
+
+    def get_n_traces(self) -> int:
+        """returns the number of traces in the store
+
+        :return: the number of traces
+        :rtype: int
+        """
+        return len(self.__trace_fields)
+
+    def get_n_events(self) -> int:
+        """returns the number of events in the store
+
+        :return: the number of events
+        :rtype: int
+        """
+        return len(self.__columns['ts'])
+
+    def get_trace_fields(self, trace: int) -> tuple:
+        """returns orig_ip, orig_port, resp_ip, resp_port, proto, ts_on_open and label of a trace as read from the file
+
+        :param trace: index of the trace
+        :type trace: int
+        :return: the fields of the trace
+        :rtype: tuple[str]
+        """
+        return self.__trace_fields[trace]
+
+    def get_trace_events(self, trace: int) -> np.ndarray:
+        """returns the indices of the events of a trace in the order they have been read
+
+        :param trace: index of the trace
+        :type trace: int
+        :return: the indices of the events
+        :rtype: np.ndarray
+        """
+        return self.__order[self.__offsets[trace]:self.__offsets[trace + 1]]
+
+    def get_codebook(self, name: str) -> Codebook:
+        """returns the codebook of service, conn_state or history
+
+        :param name: name of the categorical attribute
+        :type name: str
+        :return: the codebook of the attribute
+        :rtype: Codebook
+        """
+        return self.__codebooks[name]
+
+    def get_column(self, attribute: str, start: int=0, end: int=None) -> np.ndarray:
+        """returns the values of an attribute for every event in the order they have been read,
+        service, conn_state and history are returned as codes of their codebook
+
+        :param attribute: name of the attribute
+        :type attribute: str
+        :param start: position of the first event, defaults to 0
+        :type start: int, optional
+        :param end: position after the last event, None for all the events up to the last one, defaults to None
+        :type end: int, optional
+        :return: the column of the attribute, only the values of the events from start to end
+        :rtype: np.ndarray
+        :raises ValueError: raised if the attribute is not an attribute of the events or it's not stored
+        """
+        if attribute in self.__columns:
+            return self.__columns[attribute][start:end]
+        elif attribute in TracesStore.HISTORY_ATTRIBUTES and 'history' in self.__columns:
+            column = self.__history_table[:, TracesStore.HISTORY_ATTRIBUTES.index(attribute)][self.__columns['history'][start:end]]
+            return column.astype(bool) if attribute in TracesStore.BOOLEAN_HISTORY_ATTRIBUTES else column
+        raise ValueError(f'{attribute} is not an attribute of the events or it\'s not stored')
+
+    def set_discretized_codes(self, codes: np.ndarray) -> None:
+        """Setter of the codes of the bins of the discretized attributes of every event, given to the events created by get_trace
+
+        :param codes: uint8 matrix with a row for every event and a column for every attribute in Event.DISCRETIZED_ATTRIBUTES, None if not computed
+        :type codes: np.ndarray
+        """
+        self.__discretized_codes = codes
+
+    def get_discretized_codes(self) -> np.ndarray:
+        """Getter of the codes of the bins of the discretized attributes of every event
+
+        :return: uint8 matrix with a row for every event and a column for every attribute in Event.DISCRETIZED_ATTRIBUTES, None if not set
+        :rtype: np.ndarray
+        """
+        return self.__discretized_codes
+
+    def get_trace(self, trace: int) -> Trace:
+        """creates the Trace object of a trace with all its Event objects,
+        the attributes not stored are missing in the events ('-' or nan)
+
+        :param trace: index of the trace
+        :type trace: int
+        :return: the trace
+        :rtype: Trace
+        """
+        c = self.__columns
+        events = self.get_trace_events(trace)
+        # the values of every attribute for the events of the trace, the ones not stored are missing
+        values = {name: [codebook.get_values()[code] for code in c[name][events]] if name in c else ['-'] * len(events)
+            for name, codebook in self.__codebooks.items()}
+        values.update({name: c[name][events] if name in c else np.full(len(events), nan) for name in TracesStore.NUMERIC_ATTRIBUTES})
+        t = Trace(*self.__trace_fields[trace])
+        for j, i in enumerate(events):
+            event = Event(f'{c["ts"][i]:.6f}',
+                values['service'][j],
+                values['duration'][j],
+                values['orig_bytes'][j],
+                values['resp_bytes'][j],
+                values['conn_state'][j],
+                values['missed_bytes'][j],
+                values['history'][j],
+                values['orig_pkts'][j],
+                values['orig_ip_bytes'][j],
+                values['resp_pkts'][j],
+                values['resp_ip_bytes'][j])
+            if self.__discretized_codes is not None:
+                event.set_discretized_codes(self.__discretized_codes[i].tobytes())
+            t.add_event(event)
+        return t
@@ -0,0 +1,59 @@
+from collections.abc import Sequence
+from .Trace import Trace
+from .TracesStore import TracesStore
+
+class TracesView(Sequence):
+    """
+    Read only list of the traces of a TracesStore, returned by TracesController.get_network_traffic with the columnar store.
+    The Trace objects (and their Event objects) are created from the columns only when they are accessed and they are not kept,
+    so iterating over the traces holds in memory the objects of one trace at a time instead of all of them.
+
+    It supports len, indexing (also with negative indices and slices) and iteration like the list of traces,
+    the traces returned by two accesses to the same index are different objects with the same values
+
+    :param __store: the store of the traces
+    :type __store: TracesStore
+    """
+
+    def __init__(self, store: TracesStore) -> None:
+        """Constructor
+
+        :param store: the store of the traces
+        :type store: TracesStore
+        """
+        self.__store = store
+
+    def __len__(self) -> int:
+        """returns the number of traces
+
+        :return: the number of traces
+        :rtype: int
+        """
+        return self.__store.get_n_traces()
+
+    def __getitem__(self, index):
+        """creates the trace at an index, or the list of the traces of a slice
+
+        :param index: index of the trace or a slice
+        :type index: int | slice
+        :return: the trace or the list of traces
+        :rtype: Trace | list[Trace]
+        :raises IndexError: raised if the index is out of range
+        """
+        if isinstance(index, slice):
+            return [self.__store.get_trace(i) for i in range(*index.indices(len(self)))]
+        n_traces = len(self)
+        if index < 0:
+            index += n_traces
+        if not 0 <= index < n_traces:
+            raise IndexError('trace index out of range')
+        return self.__store.get_trace(index)
+
+    def __iter__(self):
+        """creates the traces one at a time
+
+        :return: iterator over the traces
+        :rtype: Iterator[Trace]
+        """
+        for i in range(len(self)):
+            yield self.__store.get_trace(i)
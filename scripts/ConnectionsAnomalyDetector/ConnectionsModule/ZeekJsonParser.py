@@ -0,0 +1,142 @@
+try:
+    from orjson import loads
+except ImportError:
+    from json import loads
+
+class ZeekJsonParser:
+    """
+    Parser of the lines of a conn.log written by zeek in json (LogAscii::use_json=T), one object per line.
+    Every line is converted to the fields of the line of the tsv conn.log, in the same positions,
+    so the traces created from a json conn.log are the same of the ones created from the tsv one.
+
+    Only the keys of the fields to extract are read: the ones of the id of the trace, ts, service and label
+    (used also by the LineFilter) and the ones given to the constructor, the other fields and the missing keys are '-'.
+    The numeric fields are the numbers of the json object, not parsed again from strings,
+    ts and the ports are the same strings of the tsv conn.log.
+
+    The lines are decoded with orjson if it's installed, otherwise with json
+
+    :param __indices: positions of the fields to extract
+    :type __indices: list[int]
+    :param __fields: position, key and function that converts the value of every field to extract
+    :type __fields: list[tuple[int, str, Callable]]
+    """
+    # keys of the fields in the order of the columns of the tsv conn.log
+    FIELDS = [
+        'ts', 'uid', 'id.orig_h', 'id.orig_p', 'id.resp_h', 'id.resp_p', 'proto', 'service',
+        'duration', 'orig_bytes', 'resp_bytes', 'conn_state', 'local_orig', 'local_resp', 'missed_bytes', 'history',
+        'orig_pkts', 'orig_ip_bytes', 'resp_pkts', 'resp_ip_bytes', 'tunnel_parents', 'label',
+    ]
+    # positions of the fields always extracted: ts, the id of the trace, service and label
+    ID_INDICES = (0, 2, 3, 4, 5, 6, 7, 21)
+    # positions of the numeric fields, extracted as numbers
+    NUMERIC_INDICES = (8, 9, 10, 14, 16, 17, 18, 19)
+
+    def __init__(self, indices: list=None) -> None:
+        """Constructor, compiles the fields to extract
+
+        :param indices: positions of the fields to extract besides ID_INDICES, None for all the fields, defaults to None
+        :type indices: list[int], optional
+        """
+        self.__indices = list(range(len(ZeekJsonParser.FIELDS))) if indices is None else sorted(set(indices).union(ZeekJsonParser.ID_INDICES))
+        self.__fields = [(index, ZeekJsonParser.FIELDS[index], ZeekJsonParser.__get_converter(index)) for index in self.__indices]
+
+    def __getstate__(self) -> list:
+        """returns the positions of the fields to extract, the parser is pickled without its functions
+
+        :return: the positions of the fields to extract
+        :rtype: list[int]
+        """
+        return self.__indices
+
+    def __setstate__(self, indices: list) -> None:
+        """compiles again the fields to extract of a pickled parser
+
+        :param indices: the positions of the fields to extract
+        :type indices: list[int]
+        """
+        self.__init__(indices)
+
+    @staticmethod
+    def __get_converter(index: int):
+        """returns the function that converts the value of a field of the json object
+
+        :param index: position of the field
+        :type index: int
+        :return: the function
+        :rtype: Callable
+        """
+        if index == 0:
+            return ZeekJsonParser.__to_ts
+        if index in ZeekJsonParser.NUMERIC_INDICES:
+            return ZeekJsonParser.__to_number
+        return ZeekJsonParser.__to_field
+
+    @staticmethod
+    def is_json(line: bytes) -> bool:
+        """checks if a line of a conn.log is a json object
+
+        :param line: first line of the file
+        :type line: bytes
+        :return: True if the line is a json object
+        :rtype: bool
+        """
+        return line.lstrip().startswith(b'{')
+
+    @staticmethod
+    def __to_field(value) -> str:
+        """converts a value of the json object to the string of the tsv conn.log
+
+        :param value: the value
+        :type value: Any
+        :return: the string of the value
+        :rtype: str
+        """
+        if value is None:
+            return '-'
+        if value is True or value is False:
+            return 'T' if value else 'F'
+        if isinstance(value, list):
+            return ','.join(ZeekJsonParser.__to_field(element) for element in value) if value else '(empty)'
+        return str(value)
+
+    @staticmethod
+    def __to_number(value) -> float:
+        """returns a numeric value of the json object as it is, a string (not written by zeek) is parsed
+
+        :param value: the value
+        :type value: int | float | str
+        :return: the number
+        :rtype: int | float
+        """
+        return value if not isinstance(value, str) else float(value)
+
+    @staticmethod
+    def __to_ts(value) -> str:
+        """converts the ts of the json object (seconds or ISO 8601) to the string of the tsv conn.log
+
+        :param value: the ts
+        :type value: float | str
+        :return: the seconds with 6 decimals
+        :rtype: str
+        """
+        if isinstance(value, str):
+            from datetime import datetime
+            value = datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+        return f'{value:.6f}'
+
+    def parse_line(self, line: str) -> list:
+        """converts a json line of the conn.log to the fields of the tsv line, only the fields to extract are read
+
+        :param line: json object of the line
+        :type line: str
+        :return: the fields of the line, in the positions of the tsv conn.log
+        :rtype: list[str | float]
+        """
+        get = loads(line).get
+        list_to_pack = ['-'] * len(ZeekJsonParser.FIELDS)
+        for index, key, convert in self.__fields:
+            value = get(key)
+            if value is not None:
+                list_to_pack[index] = convert(value)
+        return list_to_pack
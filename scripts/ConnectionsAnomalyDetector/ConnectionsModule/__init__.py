@@ -1,5 +1,11 @@
 from .CONN_STATE import CONN_STATE
+from .Codebook import Codebook
 from .EventHistory import EventHistory
 from .Event import Event
 from .Trace import Trace
+from .LineFilter import LineFilter
+from .DecompressingReader import DecompressingReader
+from .ZeekJsonParser import ZeekJsonParser
+from .TracesStore import TracesStore
+from .TracesView import TracesView
 from .TracesController import TracesController
\ No newline at end of file
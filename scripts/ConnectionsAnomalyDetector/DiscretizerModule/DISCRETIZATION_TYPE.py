@@ -5,6 +5,8 @@ class DISCRETIZATION_TYPE(Enum):
     Enumerate the types of discretization
         #. EQUAL_FREQUENCY
         #. EQUAL_WIDTH
+        #. LOGARITHMIC
     """    
     EQUAL_FREQUENCY = auto()
-    EQUAL_WIDTH = auto()
\ No newline at end of file
+    EQUAL_WIDTH = auto()
+    LOGARITHMIC = auto()
\ No newline at end of file
@@ -0,0 +1,197 @@
+import numpy as np
+from .Discretizer import Discretizer
+
+class DiscretizationBundle:
+    """
+    Single file with the bins of all the discretized attributes, it replaces the pickle file of every attribute.
+
+    The file is structured in this way:
+        * MAGIC (4 bytes)
+        * version of the format and length of the header (2 little endian uint32)
+        * header in json with the method of discretization, the fingerprint of the data used to create the bins
+          and for every attribute n_bins, soglia, the position of its edges and which of them are ints in the data
+        * padding up to a multiple of 8 bytes
+        * the edges of all the attributes as little endian float64
+
+    When loaded the file is mapped in memory once and the edges are views of the mapping,
+    so the processes that load the same bundle share the same pages. A loaded bundle can be used
+    in a with statement to close the mapping when its edges are no longer needed
+
+    :param __method: name of the discretization type used to create the bins
+    :type __method: str
+    :param __fingerprint: fingerprint of the data used to create the bins
+    :type __fingerprint: str
+    :param __attributes: dict where the key is the attribute and the value n_bins, soglia, offset and length of its edges and the positions of the edges that are ints
+    :type __attributes: dict{str: dict}
+    :param __edges: edges of all the attributes
+    :type __edges: list[float] | np.ndarray
+    :param __mmap: memory mapping of the file, None if the bundle was not loaded
+    :type __mmap: mmap.mmap
+    """
+    MAGIC = b'DSCB'
+    VERSION = 1
+    # name of the bundle in the directory of the discretization
+    FILENAME = 'discretization.bundle'
+
+    def __init__(self, method: str, fingerprint: str='') -> None:
+        """Constructor, creates an empty bundle
+
+        :param method: name of the discretization type used to create the bins
+        :type method: str
+        :param fingerprint: fingerprint of the data used to create the bins, defaults to ''
+        :type fingerprint: str, optional
+        """
+        self.__method = method
+        self.__fingerprint = fingerprint
+        self.__attributes = {}
+        self.__edges = []
+        self.__mmap = None
+
+    def add(self, attribute: str, discretizer: Discretizer) -> None:
+        """adds the bins of a fitted discretizer to the bundle
+
+        :param attribute: name of the attribute
+        :type attribute: str
+        :param discretizer: the fitted discretizer
+        :type discretizer: Discretizer
+        """
+        bins = discretizer.get_discretized_bins()
+        self.__attributes[attribute] = {
+            'n_bins': discretizer.get_n_bins(),
+            'soglia': discretizer.get_soglia(),
+            'offset': len(self.__edges),
+            'length': len(bins),
+            'int_edges': discretizer.get_int_edges(),
+        }
+        self.__edges.extend(float(edge) for edge in bins)
+
+    def save(self, filepath: str) -> None:
+        """writes the bundle in a temporary file and then replaces the file at filepath with it,
+        so that the bundle to load is never written only in part
+
+        :param filepath: path of the file
+        :type filepath: str
+        """
+        import json
+        import os
+        import struct
+
+        header = json.dumps({
+            'method': self.__method,
+            'fingerprint': self.__fingerprint,
+            'attributes': self.__attributes,
+        }).encode()
+        preamble = DiscretizationBundle.MAGIC + struct.pack('<II', DiscretizationBundle.VERSION, len(header)) + header
+        tmp_filepath = f'{filepath}.tmp'
+        with open(tmp_filepath, 'wb') as f:
+            f.write(preamble)
+            f.write(b'\0' * (-len(preamble) % 8))
+            f.write(np.asarray(self.__edges, dtype='<f8').tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_filepath, filepath)
+
+    @classmethod
+    def load(cls, filepath: str) -> 'DiscretizationBundle':
+        """loads a bundle mapping its file in memory
+
+        :param filepath: path of the file
+        :type filepath: str
+        :return: the loaded bundle
+        :rtype: DiscretizationBundle
+        :raises ValueError: raised if the file is not a bundle or its version is not supported
+        """
+        import json
+        import mmap
+        import struct
+
+        with open(filepath, 'rb') as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if mm[:len(cls.MAGIC)] != cls.MAGIC:
+            mm.close()
+            raise ValueError(f'{filepath} is not a discretization bundle')
+        version, header_len = struct.unpack_from('<II', mm, len(cls.MAGIC))
+        if version != cls.VERSION:
+            mm.close()
+            raise ValueError(f'version {version} of the discretization bundle is not supported')
+        start = len(cls.MAGIC) + 8
+        header = json.loads(mm[start:start + header_len])
+        start += header_len
+        start += -start % 8
+
+        bundle = cls(header['method'], header['fingerprint'])
+        bundle.__attributes = header['attributes']
+        bundle.__edges = np.frombuffer(mm, dtype='<f8', offset=start)
+        bundle.__mmap = mm
+        return bundle
+
+    def close(self) -> None:
+        """closes the mapping of a loaded bundle, the edges of the bundle (also the ones set in the discretizers) must not be used anymore
+        """
+        self.__edges = []
+        if self.__mmap is not None:
+            self.__mmap.close()
+            self.__mmap = None
+
+    def __enter__(self) -> 'DiscretizationBundle':
+        """returns this bundle at the start of a with statement
+
+        :return: this bundle
+        :rtype: DiscretizationBundle
+        """
+        return self
+
+    def __exit__(self, *args) -> None:
+        """closes this bundle at the end of a with statement
+        """
+        self.close()
+
+    def get_method(self) -> str:
+        """Getter of the name of the discretization type used to create the bins
+
+        :return: the name of the discretization type
+        :rtype: str
+        """
+        return self.__method
+
+    def get_fingerprint(self) -> str:
+        """Getter of the fingerprint of the data used to create the bins
+
+        :return: the fingerprint
+        :rtype: str
+        """
+        return self.__fingerprint
+
+    def get_attributes(self) -> list:
+        """returns the attributes in the bundle
+
+        :return: the list of the attributes
+        :rtype: list[str]
+        """
+        return list(self.__attributes.keys())
+
+    def get_edges(self, attribute: str) -> np.ndarray:
+        """returns the edges of the bins of an attribute, a view of the mapped file if the bundle was loaded
+
+        :param attribute: name of the attribute
+        :type attribute: str
+        :return: the edges of the bins
+        :rtype: np.ndarray
+        """
+        info = self.__attributes[attribute]
+        return np.asarray(self.__edges[info['offset']:info['offset'] + info['length']], dtype=float)
+
+    def load_discretizer(self, attribute: str, discretizer: Discretizer) -> None:
+        """sets n_bins, soglia and the bins of an attribute in a discretizer, instead of fitting it
+
+        :param attribute: name of the attribute
+        :type attribute: str
+        :param discretizer: the discretizer where to set the bins
+        :type discretizer: Discretizer
+        :raises KeyError: raised if the attribute is not in the bundle
+        """
+        if attribute not in self.__attributes:
+            raise KeyError(f'{attribute} is not in the discretization bundle')
+        info = self.__attributes[attribute]
+        # the edges are installed as the view of the mapped file, without copying them
+        discretizer.set_discretized_bins(self.get_edges(attribute), info['n_bins'], info['soglia'], info.get('int_edges', []))
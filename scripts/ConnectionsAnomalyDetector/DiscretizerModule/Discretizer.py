@@ -1,4 +1,6 @@
 import abc
+import numpy as np
+from .DistinctCounter import DistinctCounter
 
 class Discretizer(metaclass=abc.ABCMeta):
     """Abstract class that contains the methods to:
@@ -22,7 +24,19 @@ class Discretizer(metaclass=abc.ABCMeta):
     :type __discretized_bins: list
     :param __n_bins: number of bins for this discretization
     :type __n_bins: int
+    :param __lookup: bins used to compute the lookup table, the bins as a numpy array and the label of every bin
+    :type __lookup: tuple[list | np.ndarray, np.ndarray, list[str]]
+    :param __bin_codes: True if the label of the bin i is the code b<i> instead of its interval
+    :type __bin_codes: bool
+    :param __int_edges: positions of the edges set by set_discretized_bins that are ints in the data, written without decimals in the labels
+    :type __int_edges: frozenset[int]
     """
+    # label and code of the values that are not in any bin
+    OUT_OF_BOUNDS = 'value out of bounds'
+    OUT_OF_BOUNDS_CODE = -1
+    # prefix of the labels of the bins when they are codes
+    BIN_CODE_PREFIX = 'b'
+
     def __init__(self, n_bins: int=10, soglia: int=10, filepath: str='', save: bool=False) -> None:
         """Constructor that initialize discretized_bins with and empty list
 
@@ -34,6 +48,9 @@ class Discretizer(metaclass=abc.ABCMeta):
         self._SOGLIA = soglia
         self._filepath = filepath
         self._save = save
+        self._lookup = None
+        self._bin_codes = False
+        self._int_edges = frozenset()
 
     def get_discretized_bins(self) -> list:
         """Getter of the discretized bins list
@@ -51,6 +68,33 @@ class Discretizer(metaclass=abc.ABCMeta):
         """
         return self._n_bins
 
+    def set_discretized_bins(self, bins: list, n_bins: int, soglia: int, int_edges: list=()) -> None:
+        """Setter of the bins created elsewhere (e.g. loaded from a discretization bundle), instead of calling discretize
+
+        :param bins: the discretized list, also a numpy array (e.g. a view of a mapped bundle)
+        :type bins: list[float] | np.ndarray
+        :param n_bins: number of bins
+        :type n_bins: int
+        :param soglia: the soglia used to create the bins
+        :type soglia: int
+        :param int_edges: positions of the edges that are ints in the data (see get_int_edges), defaults to ()
+        :type int_edges: list[int], optional
+        """
+        self._discretized_bins = bins
+        self._int_edges = frozenset(int_edges)
+        self._n_bins = n_bins
+        self._SOGLIA = soglia
+
+    def get_int_edges(self) -> list:
+        """returns the positions of the edges that are ints in the data (e.g. the missing values or the counters of the history
+        taken as edges by the equal frequency discretization), they are written without decimals in the labels like in the lists of the traces
+
+        :return: the positions of the edges that are ints
+        :rtype: list[int]
+        """
+        bins = self._discretized_bins
+        return [i for i in range(len(bins)) if i in self._int_edges or isinstance(bins[i], (int, np.integer))]
+
     def get_soglia(self) -> int:
         """Getter of the number of bins for this discretizer
 
@@ -59,6 +103,47 @@ class Discretizer(metaclass=abc.ABCMeta):
         """
         return self._SOGLIA
 
+    def _get_distinct_values(self, values) -> list:
+        """returns the sorted distinct values if they are no more than max(n_bins, soglia),
+        without keeping the set of all the values of the attributes with many distinct values
+
+        :param values: values to analize
+        :type values: np.ndarray | list[float]
+        :return: the distinct values or None if they are more than max(n_bins, soglia)
+        :rtype: list[float]
+        """
+        counter = DistinctCounter(max(self._n_bins, self._SOGLIA))
+        counter.update_values(values)
+        return counter.get_distinct_values()
+
+    def _save_bins(self) -> None:
+        """saves the bins in the file at filepath, nothing is saved if filepath is empty
+        """
+        import pickle
+
+        if self._filepath == '':
+            return
+        with open(self._filepath, 'wb') as f:
+            obj = {
+                '_n_bins': self._n_bins,
+                '_SOGLIA': self._SOGLIA,
+                '_discretized_bins': self._discretized_bins,
+            }
+
+            pickle.dump(obj, f, pickle.HIGHEST_PROTOCOL)
+
+    def _load_bins(self) -> None:
+        """loads the bins from the file at filepath
+        """
+        import pickle
+
+        with open(self._filepath, 'rb') as f:
+            obj = pickle.load(f)
+
+        self._n_bins = obj['_n_bins']
+        self._SOGLIA = obj['_SOGLIA']
+        self._discretized_bins = obj['_discretized_bins']
+
     @abc.abstractmethod
     def discretize(self, values: list) -> None:
         """Analizes the list of values in input to create the bins
@@ -68,6 +153,80 @@ class Discretizer(metaclass=abc.ABCMeta):
         """
         pass
 
+    def set_bin_codes(self, bin_codes: bool) -> None:
+        """Setter of the kind of labels of the bins: codes like b3 (the code of the bin i is b<i>, its interval is
+        the i-th element of get_interval_labels) or the interval of the bin like [0.0, 10.5[
+
+        :param bin_codes: True to label the bins with their codes, False with their intervals
+        :type bin_codes: bool
+        """
+        self._bin_codes = bin_codes
+        self._lookup = None
+
+    def get_interval_labels(self) -> list:
+        """returns the interval of every bin as a string, also when the bins are labelled with their codes
+
+        :return: the list of the intervals
+        :rtype: list[str]
+        """
+        bins = self._discretized_bins
+        edges = [int(bins[i]) if i in self._int_edges else bins[i] for i in range(len(bins))]
+        return [f'[{edges[i]}, {edges[i + 1]}[' for i in range(len(edges) - 1)]
+
+    def _get_lookup(self) -> tuple:
+        """returns the bins as a numpy array and the label of every bin, they are computed again
+        only when discretized_bins is replaced
+
+        :return: the bins and the list of the labels
+        :rtype: tuple[np.ndarray, list[str]]
+        """
+        if self._lookup is None or self._lookup[0] is not self._discretized_bins:
+            bins = self._discretized_bins
+            if self._bin_codes:
+                labels = [f'{Discretizer.BIN_CODE_PREFIX}{i}' for i in range(len(bins) - 1)]
+            else:
+                labels = self.get_interval_labels()
+            self._lookup = (bins, np.asarray(bins, dtype=float), labels)
+        return self._lookup[1], self._lookup[2]
+
+    def get_bin_labels(self) -> list:
+        """Getter of the labels of the bins, the label of the bin with code i is the i-th element
+
+        :return: the list of the labels
+        :rtype: list[str]
+        """
+        return self._get_lookup()[1]
+
+    def get_label_of_code(self, code: int) -> str:
+        """returns the label of the bin with a code, OUT_OF_BOUNDS if the code is not of any bin
+
+        :param code: code of the bin
+        :type code: int
+        :return: the label of the bin
+        :rtype: str
+        """
+        labels = self._get_lookup()[1]
+        return labels[code] if 0 <= code < len(labels) else Discretizer.OUT_OF_BOUNDS
+
+    def discretize_values(self, values) -> np.ndarray:
+        """Returns the code of the bin of every value, the same bin returned by discretize_attribute,
+        the values not in any bin get OUT_OF_BOUNDS_CODE
+
+        :param values: values to discretize
+        :type values: np.ndarray | list[float]
+        :return: the code of the bin of every value
+        :rtype: np.ndarray
+        """
+        bins, labels = self._get_lookup()
+        values = np.asarray(values, dtype=float)
+        if len(labels) == 0:
+            return np.full(values.shape, Discretizer.OUT_OF_BOUNDS_CODE, dtype=np.int64)
+        # the first bin with lower <= value <= upper is the one before the first edge >= value
+        codes = np.searchsorted(bins, values, side='left') - 1
+        codes[values == bins[0]] = 0
+        codes[(codes < 0) | (codes >= len(labels)) | np.isnan(values)] = Discretizer.OUT_OF_BOUNDS_CODE
+        return codes
+
     def discretize_attribute(self, value: float) -> str:
         """Given a value such that: min(discretized_bins) <= value <= max(discretized_bins), 
         this returns the bin associated to that value using the equal height algorithm
@@ -78,10 +237,12 @@ class Discretizer(metaclass=abc.ABCMeta):
 
         :rtype: str
         """
-        for i in range(len(self._discretized_bins) - 1):
-            lower = self._discretized_bins[i]
-            upper = self._discretized_bins[i + 1]
-            if lower <= value <= upper:
-                return f'[{lower}, {upper}['
-                
-        return 'value out of bounds'
\ No newline at end of file
+        from bisect import bisect_left
+
+        labels = self._get_lookup()[1]
+        if value != value: # nan isn't in any bin
+            return Discretizer.OUT_OF_BOUNDS
+        code = max(bisect_left(self._discretized_bins, value) - 1, 0)
+        if code < len(labels) and self._discretized_bins[code] <= value <= self._discretized_bins[code + 1]:
+            return labels[code]
+        return Discretizer.OUT_OF_BOUNDS
\ No newline at end of file
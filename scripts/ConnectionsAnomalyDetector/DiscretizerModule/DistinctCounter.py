@@ -0,0 +1,167 @@
+import numpy as np
+
+class DistinctCounter:
+    """
+    Counter of the distinct values of an attribute with bounded memory, used by the discretizers
+    to know if an attribute has few distinct values without building the set of all the values.
+
+    The distinct values are kept exactly until they are more than max_distinct, then the set is dropped
+    and the count is estimated with HyperLogLog: every value is hashed, the first precision bits of the hash
+    select a register and the register keeps the max position of the first 1 bit of the rest of the hash.
+    The values are hashed in batches with numpy
+
+    :param __max_distinct: max number of distinct values to keep exactly
+    :type __max_distinct: int
+    :param __distinct: distinct values seen, None if they are more than max_distinct
+    :type __distinct: set[float]
+    :param __precision: number of bits of the hash used to select the register
+    :type __precision: int
+    :param __registers: registers of HyperLogLog, None until the distinct values are more than max_distinct
+    :type __registers: np.ndarray
+    :param __buffer: values not yet added to the registers
+    :type __buffer: list[float]
+    """
+    # number of values hashed at once
+    BATCH_SIZE = 1 << 16
+
+    def __init__(self, max_distinct: int=0, precision: int=12) -> None:
+        """Constructor, creates an empty counter
+
+        :param max_distinct: max number of distinct values to keep exactly, defaults to 0
+        :type max_distinct: int, optional
+        :param precision: number of bits of the hash used to select the register, the estimate has an error
+            of about 1.04 / sqrt(2^precision), defaults to 12
+        :type precision: int, optional
+        """
+        self.__max_distinct = max_distinct
+        self.__distinct = set()
+        self.__precision = precision
+        self.__registers = None
+        self.__buffer = []
+
+    @staticmethod
+    def __hash(values: np.ndarray) -> np.ndarray:
+        """returns the 64 bits hash (splitmix64) of the bits of every value
+
+        :param values: values to hash
+        :type values: np.ndarray
+        :return: the hash of every value
+        :rtype: np.ndarray
+        """
+        # -0.0 and 0.0 are the same value
+        z = (values + 0.0).view(np.uint64) + np.uint64(0x9E3779B97F4A7C15)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return z ^ (z >> np.uint64(31))
+
+    def __add_to_registers(self, values: np.ndarray) -> None:
+        """adds the values to the registers of HyperLogLog
+
+        :param values: values to add
+        :type values: np.ndarray
+        """
+        if self.__registers is None:
+            self.__registers = np.zeros(1 << self.__precision, dtype=np.uint8)
+        if len(values) == 0:
+            return
+        z = DistinctCounter.__hash(values)
+        indices = (z >> np.uint64(64 - self.__precision)).astype(np.int64)
+        rest = z & np.uint64((1 << (64 - self.__precision)) - 1)
+
+        # the position of the first 1 bit is the number of bits of rest minus its length,
+        # the length is the exponent of frexp (exact since rest has less than 53 bits)
+        length = np.frexp(rest.astype(float))[1]
+        ranks = (64 - self.__precision + 1 - length).astype(np.uint8)
+        np.maximum.at(self.__registers, indices, ranks)
+
+    def __flush(self) -> None:
+        """adds the values in the buffer to the registers
+        """
+        if self.__buffer:
+            self.__add_to_registers(np.array(self.__buffer, dtype=float))
+            self.__buffer = []
+
+    def __give_up_distinct(self) -> None:
+        """drops the set of the distinct values, moving them to the registers
+        """
+        self.__add_to_registers(np.fromiter(self.__distinct, dtype=float, count=len(self.__distinct)))
+        self.__distinct = None
+
+    def update(self, value: float) -> None:
+        """adds a value to the counter
+
+        :param value: value to add
+        :type value: float
+        """
+        if self.__distinct is not None:
+            self.__distinct.add(value)
+            if len(self.__distinct) > self.__max_distinct:
+                self.__give_up_distinct()
+        else:
+            self.__buffer.append(value)
+            if len(self.__buffer) >= DistinctCounter.BATCH_SIZE:
+                self.__flush()
+
+    def update_values(self, values) -> None:
+        """adds all the values to the counter, in batches so that no more than BATCH_SIZE values are copied at once
+
+        :param values: values to add
+        :type values: np.ndarray | list[float]
+        """
+        values = np.asarray(values, dtype=float)
+        for start in range(0, len(values), DistinctCounter.BATCH_SIZE):
+            batch = values[start:start + DistinctCounter.BATCH_SIZE]
+            if self.__distinct is not None:
+                self.__distinct.update(np.unique(batch).tolist())
+                if len(self.__distinct) > self.__max_distinct:
+                    self.__give_up_distinct()
+            else:
+                self.__add_to_registers(batch)
+
+    def merge(self, other: 'DistinctCounter') -> None:
+        """adds all the values of another counter to this one
+
+        :param other: the counter to merge, it must have the same precision
+        :type other: DistinctCounter
+        """
+        if self.__distinct is not None and other.__distinct is not None:
+            self.__distinct |= other.__distinct
+            if len(self.__distinct) > self.__max_distinct:
+                self.__give_up_distinct()
+            return
+
+        if self.__distinct is not None:
+            self.__give_up_distinct()
+        self.__flush()
+        if other.__distinct is not None:
+            self.__add_to_registers(np.fromiter(other.__distinct, dtype=float, count=len(other.__distinct)))
+        else:
+            np.maximum(self.__registers, other.__registers, out=self.__registers)
+            self.__add_to_registers(np.array(other.__buffer, dtype=float))
+
+    def get_distinct_values(self) -> list:
+        """returns the sorted distinct values if they are no more than max_distinct
+
+        :return: the distinct values or None if they are more than max_distinct
+        :rtype: list[float]
+        """
+        return sorted(self.__distinct) if self.__distinct is not None else None
+
+    def get_count(self) -> int:
+        """returns the number of distinct values, exact if they are no more than max_distinct, estimated otherwise
+
+        :return: the number of distinct values
+        :rtype: int
+        """
+        if self.__distinct is not None:
+            return len(self.__distinct)
+        self.__flush()
+
+        m = len(self.__registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.exp2(-self.__registers.astype(float)))
+        n_zeros = int(np.count_nonzero(self.__registers == 0))
+        # with few values linear counting is more accurate
+        if estimate <= 2.5 * m and n_zeros > 0:
+            estimate = m * np.log(m / n_zeros)
+        return max(int(round(estimate)), self.__max_distinct + 1)
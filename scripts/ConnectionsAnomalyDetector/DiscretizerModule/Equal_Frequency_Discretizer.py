@@ -1,4 +1,5 @@
 from . import Discretizer
+from .QuantileSketch import QuantileSketch
 
 class Equal_Frequency_Discretizer(Discretizer):
     """
@@ -18,50 +19,89 @@ class Equal_Frequency_Discretizer(Discretizer):
     def discretize(self, values: list) -> None:
         """Analizes the list of values in input to create the bins
 
-        :param values: list of values to discretize with equal Frequency
-        :type values: list
+        :param values: list of values to discretize with equal Frequency, the missing values are nan
+        :type values: list | np.ndarray
         :return: the discretized list
         :rtype: list
         """
-        import pickle
+        import numpy as np
 
         if self._save:
-            from math import inf
-            val_set = set(values)
-            value_set_len = len(val_set)
+            values = np.asarray(values)
+            integral = np.issubdtype(values.dtype, np.integer)
+            values = values.astype(float)
+            # the missing values are the int 0, like in the lists of the values of the traces
+            missing = np.isnan(values)
+            values[missing] = 0
+            val_set = self._get_distinct_values(values)
 
             # handling distinct values
-            if value_set_len <= max(self._n_bins, self._SOGLIA):
-                values = sorted(list(val_set))
-                self._discretized_bins = [-inf] + [(values[i] + values[i - 1]) / 2 for i in range(1, value_set_len)] + [inf]# + ['soglia']
+            if val_set is not None:
+                self.__set_bins_of_distinct_values(val_set)
             else:
-                values.sort()
-                step = int(len(values) / self._n_bins)
-                self._discretized_bins = [-inf] + [values[step * i] for i in range(1, self._n_bins)] + [inf]
-                
-                disc_set = list(set(self._discretized_bins))
-                if len(disc_set) < len(self._discretized_bins):
-                    self._discretized_bins = sorted(disc_set)# + ['con duplicati']
-                
-            with open(self._filepath, 'wb') as f:
-                obj = {
-                    '_n_bins': self._n_bins,
-                    '_SOGLIA': self._SOGLIA,
-                    '_discretized_bins': self._discretized_bins,
-                }
-                
-                pickle.dump(obj, f, pickle.HIGHEST_PROTOCOL)
+                # the stable sort keeps the equal values in the order of the data, so the edges are the
+                # same values (also ints or floats) of the sorted lists of the values of the traces
+                order = np.argsort(values, kind='stable')
+                self.__set_bins_of_ranks(len(values), lambda ranks: [int(values[i]) if integral or missing[i] else float(values[i]) for i in order[ranks]])
+            self._save_bins()
         else:
-            with open(self._filepath, 'rb') as f:
-                obj = pickle.load(f)
-
-            self._n_bins = obj['_n_bins']
-            self._SOGLIA = obj['_SOGLIA']
-            self._discretized_bins = obj['_discretized_bins']
-            
-            import numpy as np
-            print(self._filepath.split('/')[-1])
-            print(self._n_bins)
-            print(self._SOGLIA)
-            print(np.array(self._discretized_bins))
-            print('\n')
\ No newline at end of file
+            self._load_bins()
+
+    def discretize_sketch(self, sketch: QuantileSketch) -> None:
+        """Creates the bins from a quantile sketch of the values instead of the list of all the values,
+        the bins are the same of discretize for the attributes with few distinct values and are
+        approximated (with the error of the sketch) for the others
+
+        :param sketch: sketch of the values to discretize with equal Frequency
+        :type sketch: QuantileSketch
+        """
+        if self._save:
+            distinct_values = sketch.get_distinct_values()
+
+            # handling distinct values
+            if distinct_values is not None and len(distinct_values) <= max(self._n_bins, self._SOGLIA):
+                self.__set_bins_of_distinct_values(distinct_values)
+            else:
+                self.__set_bins_of_ranks(sketch.get_n(), sketch.get_values_at_ranks)
+            self._save_bins()
+        else:
+            self._load_bins()
+
+    def __set_bins_of_distinct_values(self, values: list) -> None:
+        """creates a bin for every distinct value, the bounds are the middle points between the values
+
+        :param values: sorted distinct values
+        :type values: list[float]
+        """
+        from math import inf
+        self._discretized_bins = [-inf] + [(values[i] + values[i - 1]) / 2 for i in range(1, len(values))] + [inf]# + ['soglia']
+
+    def __set_bins_of_ranks(self, n_values: int, get_values_at_ranks) -> None:
+        """creates the bins with the same number of values, the bounds are the values at the ranks
+        multiple of n_values / n_bins in the sorted list of the values
+
+        :param n_values: number of values
+        :type n_values: int
+        :param get_values_at_ranks: function that returns the value at every rank in the sorted list of the values
+        :type get_values_at_ranks: Callable[[list[int]], list[float]]
+        """
+        from math import inf
+        step = int(n_values / self._n_bins)
+        self._discretized_bins = [-inf] + get_values_at_ranks([step * i for i in range(1, self._n_bins)]) + [inf]
+        
+        disc_set = list(set(self._discretized_bins))
+        if len(disc_set) < len(self._discretized_bins):
+            self._discretized_bins = sorted(disc_set)# + ['con duplicati']
+
+    def _load_bins(self) -> None:
+        """loads the bins from the file at filepath and prints them
+        """
+        import numpy as np
+
+        super()._load_bins()
+        
+        print(self._filepath.split('/')[-1])
+        print(self._n_bins)
+        print(self._SOGLIA)
+        print(np.array(self._discretized_bins))
+        print('\n')
@@ -20,37 +20,27 @@ class Equal_Width_Discretizer(Discretizer):
         """Analizes the list of values in input to create the bins
 
         :param values: list of values to discretize with equal width
-        :type values: list
+        :type values: list | np.ndarray
         """
-        import pickle
+        import numpy as np
 
         if self._save:
             from math import inf
 
-            val_set = set(values)
-            value_set_len = len(val_set)
-            if value_set_len <= max(self._n_bins, self._SOGLIA):
-                values = sorted(list(val_set))
+            # the missing values are 0
+            values = np.nan_to_num(np.asarray(values, dtype=float), nan=0.0)
+            val_set = self._get_distinct_values(values)
+            if val_set is not None:
+                value_set_len = len(val_set)
+                values = val_set
                 self._discretized_bins = [-inf] + [(values[i] + values[i - 1]) / 2 for i in range(1, value_set_len)] + [inf]# + ['soglia']
             else:
-                min_val = min(values)
-                max_val = max(values)
+                min_val = float(values.min())
+                max_val = float(values.max())
                 step = (max_val - min_val) / self._n_bins
                 self._discretized_bins = [-inf] + [min_val + step * i for i in range(1, self._n_bins)] + [inf]
 
-            with open(self._filepath, 'wb') as f:
-                obj = {
-                    '_n_bins': self._n_bins,
-                    '_SOGLIA': self._SOGLIA,
-                    '_discretized_bins': self._discretized_bins,
-                }
-
-                pickle.dump(obj, f, pickle.HIGHEST_PROTOCOL)
+            self._save_bins()
         else:
-            with open(self._filepath, 'rb') as f:
-                obj = pickle.load(f)
-
-            self._n_bins = obj['_n_bins']
-            self._SOGLIA = obj['_SOGLIA']
-            self._discretized_bins = obj['_discretized_bins']
+            self._load_bins()
 
@@ -0,0 +1,84 @@
+from . import Discretizer
+import numpy as np
+
+class Logarithmic_Discretizer(Discretizer):
+    """
+    Class that discretize a value in bins with logarithmic width, useful for the counters with heavy tails
+    (bytes and packets) where equal width puts almost every value in the first bin.
+
+    The edges are fixed and don't depend on the data: with n bins and base b they are
+    [-inf, 1, b, b^2, ..., b^(n-2), inf], so no fitting and no saved state is needed
+    and the bin of a value is computed from its logarithm
+    """
+
+    def __init__(self, n_bins: int=None, soglia: int=None, filepath: str='', save: bool=False, base: float=10) -> None:
+        """Constructor of this class, calls the super constructor and creates the edges
+
+        :param n_bins: number of bins, defaults to None
+        :type n_bins: int, optional
+        :param base: base of the logarithm, the ratio between the edges of a bin, defaults to 10
+        :type base: float, optional
+        """
+        super().__init__(n_bins, soglia, filepath, save)
+        self.__base = base
+        self.discretize()
+
+    def get_base(self) -> float:
+        """Getter of the base of the logarithm
+
+        :return: the base
+        :rtype: float
+        """
+        return self.__base
+
+    def discretize(self, values: list=None) -> None:
+        """Creates the bins, the values are not needed since the edges are fixed
+
+        :param values: ignored, defaults to None
+        :type values: list, optional
+        """
+        from math import inf
+        self._discretized_bins = [-inf] + [float(self.__base ** k) for k in range(self._n_bins - 1)] + [inf]
+
+    def discretize_values(self, values) -> np.ndarray:
+        """Returns the code of the bin of every value, the same of Discretizer.discretize_values,
+        computed from the logarithm of the values instead of searching the edges
+
+        :param values: values to discretize
+        :type values: np.ndarray | list[float]
+        :return: the code of the bin of every value
+        :rtype: np.ndarray
+        """
+        bins, _ = self._get_lookup()
+        values = np.asarray(values, dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # a value in ]b^(i-1), b^i] is in the bin i, the values <= 1 in the bin 0
+            codes = np.ceil(np.log(np.maximum(values, 1.0)) / np.log(self.__base))
+        codes = np.clip(np.nan_to_num(codes, nan=0.0), 0, self._n_bins - 1).astype(np.int64)
+        # corrects the rounding errors of the logarithm on the edges
+        codes[(codes > 0) & (values <= bins[codes])] -= 1
+        codes[(codes < self._n_bins - 1) & (values > bins[codes + 1])] += 1
+        codes[np.isnan(values)] = Discretizer.OUT_OF_BOUNDS_CODE
+        return codes
+
+    def discretize_attribute(self, value: float) -> str:
+        """Returns the bin associated to the value, computed from its logarithm
+
+        :param value: value to discretize
+        :type value: float
+        :return: a string representing the bounds of the interval
+        :rtype: str
+        """
+        from math import ceil, log
+
+        labels = self._get_lookup()[1]
+        if value != value: # nan isn't in any bin
+            return Discretizer.OUT_OF_BOUNDS
+        exponent = log(value, self.__base) if value > 1 else 0.0
+        code = ceil(exponent) if exponent < self._n_bins - 1 else self._n_bins - 1
+        # corrects the rounding errors of the logarithm on the edges
+        if code > 0 and value <= self._discretized_bins[code]:
+            code -= 1
+        elif code < self._n_bins - 1 and value > self._discretized_bins[code + 1]:
+            code += 1
+        return labels[code]
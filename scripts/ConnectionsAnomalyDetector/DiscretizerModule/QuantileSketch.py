@@ -0,0 +1,180 @@
+import random
+import numpy as np
+from .DistinctCounter import DistinctCounter
+
+class QuantileSketch:
+    """
+    Mergeable streaming quantile sketch (KLL) used to create the equal frequency bins
+    without keeping and sorting all the values.
+
+    The values are stored in levels (compactors), every value in the level h stands for 2^h values.
+    When a level is full it's sorted and every other value is promoted to the next level (only the levels
+    that overflow are compacted), so the memory
+    used is about O(k log(n / k)) and the rank of a value is known with an error of about n / k.
+    Sketches of different parts of the data (e.g. of the worker processes) can be merged.
+
+    The distinct values are also kept exactly until they are more than max_distinct,
+    so that the low cardinality attributes can be discretized like with the full list
+
+    :param __k: size of the biggest level, the bigger the more accurate
+    :type __k: int
+    :param __levels: values of every level
+    :type __levels: list[list[float]]
+    :param __n: number of values added
+    :type __n: int
+    :param __distinct: counter of the distinct values, keeps them until they are more than max_distinct
+    :type __distinct: DistinctCounter
+    """
+    # min capacity of a level, with smaller levels the lowest ones would be compacted at almost every update
+    MIN_CAPACITY = 8
+
+    def __init__(self, k: int=200, max_distinct: int=0, seed: int=0) -> None:
+        """Constructor, creates an empty sketch
+
+        :param k: size of the biggest level, defaults to 200
+        :type k: int, optional
+        :param max_distinct: max number of distinct values to keep, defaults to 0
+        :type max_distinct: int, optional
+        :param seed: seed of the random choices of the compactions, so that the same data gives the same sketch, defaults to 0
+        :type seed: int, optional
+        """
+        self.__k = max(k, 8)
+        self.__levels = [[]]
+        self.__n = 0
+        self.__distinct = DistinctCounter(max_distinct)
+        self.__random = random.Random(seed)
+        self.__capacity_level_0 = self.__capacity(0)
+
+    @classmethod
+    def from_error(cls, error: float, max_distinct: int=0) -> 'QuantileSketch':
+        """creates a sketch where the rank of the values has an approximate error of error * n
+
+        :param error: approximate error of the rank, relative to the number of values (e.g. 0.01)
+        :type error: float
+        :param max_distinct: max number of distinct values to keep, defaults to 0
+        :type max_distinct: int, optional
+        :return: the empty sketch
+        :rtype: QuantileSketch
+        """
+        from math import ceil
+        return cls(ceil(1.7 / error), max_distinct)
+
+    def __capacity(self, level: int) -> int:
+        """returns the number of values that a level can have before being compacted,
+        the capacities decrease by 2/3 from the highest level to the lowest
+
+        :param level: index of the level
+        :type level: int
+        :return: the capacity of the level
+        :rtype: int
+        """
+        return max(QuantileSketch.MIN_CAPACITY, int(self.__k * (2 / 3) ** (len(self.__levels) - 1 - level)))
+
+    def update(self, value: float) -> None:
+        """adds a value to the sketch
+
+        :param value: value to add
+        :type value: float
+        """
+        self.__n += 1
+        self.__distinct.update(value)
+        level = self.__levels[0]
+        level.append(value)
+        if len(level) >= self.__capacity_level_0:
+            self.__compress(0)
+
+    def update_values(self, values) -> None:
+        """adds a batch of values to the sketch, the level 0 is compacted once for the whole batch
+
+        :param values: values to add
+        :type values: np.ndarray | list[float]
+        """
+        values = np.asarray(values, dtype=float)
+        self.__n += len(values)
+        self.__distinct.update_values(values)
+        self.__levels[0].extend(values.tolist())
+        if len(self.__levels[0]) >= self.__capacity_level_0:
+            self.__compress(0)
+
+    def __compact(self, h: int) -> None:
+        """sorts a level and promotes every other value to the next level
+
+        :param h: index of the level
+        :type h: int
+        """
+        if h + 1 == len(self.__levels):
+            self.__levels.append([])
+        level = sorted(self.__levels[h])
+        # with an odd number of values one stays in this level
+        self.__levels[h] = [level.pop()] if len(level) % 2 else []
+        self.__levels[h + 1].extend(level[self.__random.getrandbits(1)::2])
+
+    def __compress(self, h: int) -> None:
+        """compacts the levels from h that reached their capacity, a level above h is compacted only if
+        it overflows with the values promoted by the level below
+
+        :param h: index of the first level to check
+        :type h: int
+        """
+        while h < len(self.__levels) and len(self.__levels[h]) >= self.__capacity(h):
+            self.__compact(h)
+            h += 1
+        self.__capacity_level_0 = self.__capacity(0)
+
+    def merge(self, other: 'QuantileSketch') -> None:
+        """adds all the values of another sketch to this one
+
+        :param other: the sketch to merge
+        :type other: QuantileSketch
+        """
+        while len(self.__levels) < len(other.__levels):
+            self.__levels.append([])
+        for h, level in enumerate(other.__levels):
+            self.__levels[h].extend(level)
+        self.__n += other.__n
+        self.__distinct.merge(other.__distinct)
+        # after a merge any level can be over its capacity
+        for h in range(len(self.__levels)):
+            self.__compress(h)
+
+    def get_n(self) -> int:
+        """Getter of the number of values added
+
+        :return: the number of values
+        :rtype: int
+        """
+        return self.__n
+
+    def get_distinct_values(self) -> list:
+        """returns the sorted distinct values if they are no more than max_distinct
+
+        :return: the distinct values or None if they are more than max_distinct
+        :rtype: list[float]
+        """
+        return self.__distinct.get_distinct_values()
+
+    def get_n_distinct(self) -> int:
+        """returns the number of distinct values, estimated if they are more than max_distinct
+
+        :return: the number of distinct values
+        :rtype: int
+        """
+        return self.__distinct.get_count()
+
+    def get_values_at_ranks(self, ranks: list) -> list:
+        """returns the approximate value that would be at every rank in the sorted list of all the values,
+        if no level has been compacted yet the values are exact
+
+        :param ranks: positions in the sorted list, from 0 to n - 1
+        :type ranks: list[int]
+        :return: the value at every rank
+        :rtype: list[float]
+        """
+        values = np.array([value for level in self.__levels for value in level], dtype=float)
+        weights = np.concatenate([np.full(len(level), 1 << h, dtype=np.int64) for h, level in enumerate(self.__levels)])
+        if len(values) == 0:
+            return [float('nan') for _ in ranks]
+        order = np.argsort(values, kind='stable')
+        cumulative_weights = np.cumsum(weights[order])
+        positions = np.minimum(np.searchsorted(cumulative_weights, ranks, side='right'), len(values) - 1)
+        return values[order][positions].tolist()
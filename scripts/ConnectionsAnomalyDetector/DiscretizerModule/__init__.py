@@ -1,3 +1,7 @@
+from .DistinctCounter import DistinctCounter
 from .Discretizer import Discretizer
+from .QuantileSketch import QuantileSketch
 from .Equal_Frequency_Discretizer import Equal_Frequency_Discretizer
-from .Equal_Width_Discretizer import Equal_Width_Discretizer
\ No newline at end of file
+from .Equal_Width_Discretizer import Equal_Width_Discretizer
+from .Logarithmic_Discretizer import Logarithmic_Discretizer
+from .DiscretizationBundle import DiscretizationBundle
\ No newline at end of file
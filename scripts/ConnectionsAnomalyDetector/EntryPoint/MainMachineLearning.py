@@ -14,8 +14,12 @@ class MainMachineLearning:
 
         if 'ML' in config:
             delta = float(config['ML']['delta']) if 'delta' in config['ML'] else 0.0
+            group_by_variant = bool(int(config['ML']['group_by_variant'])) if 'group_by_variant' in config['ML'] else True
+            fitness_cutoffs = [float(cutoff) for cutoff in config['ML']['fitness_cutoffs'].split(',') if cutoff.strip() != ''] if 'fitness_cutoffs' in config['ML'] else []
         else:
             delta = 0.0
+            group_by_variant = True
+            fitness_cutoffs = []
 
         if 'Attributes' in config:
             attrs = config['Attributes']['attributes_to_xes_events'] if 'attributes_to_xes_events' in config['Attributes'] else ['ts','service','duration','orig_bytes','resp_bytes','conn_state','missed_bytes','orig_syn','orig_pkts','orig_ip_bytes','resp_pkts','resp_ip_bytes','orig_syn','orig_fin','orig_syn_ack','orig_rst','resp_syn','resp_fin','resp_syn_ack','resp_rst','orig_bad_checksum','orig_content_gap','orig_retransmitted_payload','orig_zero_window','resp_bad_checksum','resp_content_gap','resp_retransmitted_payload','resp_zero_window','orig_ack','orig_payload','orig_inconsistent','orig_multi_flag','resp_ack','resp_payload','resp_inconsistent','resp_multi_flag']
@@ -23,8 +27,13 @@ class MainMachineLearning:
         else:
             attrs = ['ts','service','duration','orig_bytes','resp_bytes','conn_state','missed_bytes','orig_syn','orig_pkts','orig_ip_bytes','resp_pkts','resp_ip_bytes','orig_syn','orig_fin','orig_syn_ack','orig_rst','resp_syn','resp_fin','resp_syn_ack','resp_rst','orig_bad_checksum','orig_content_gap','orig_retransmitted_payload','orig_zero_window','resp_bad_checksum','resp_content_gap','resp_retransmitted_payload','resp_zero_window','orig_ack','orig_payload','orig_inconsistent','orig_multi_flag','resp_ack','resp_payload','resp_inconsistent','resp_multi_flag']
 
-        self.__petriNetCollector = PetriNetCollector(attrs, delta)
-        self.__anomalyDetector = AnomalyDetector()
+        if 'Files' in config:
+            path_of_fitness_cache = config['Files']['path_of_fitness_cache'] if 'path_of_fitness_cache' in config['Files'] else ''
+        else:
+            path_of_fitness_cache = ''
+
+        self.__petriNetCollector = PetriNetCollector(attrs, delta, group_by_variant, path_of_fitness_cache)
+        self.__anomalyDetector = AnomalyDetector(fitness_cutoffs)
 
     def execute_application(self, config_path: str='') -> None:
         self.__train_model(config_path)
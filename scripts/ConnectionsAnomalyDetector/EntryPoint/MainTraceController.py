@@ -44,17 +44,27 @@ class MainTraceController:
         # checks if Discretization is in config.ini file
         if 'Discretization' in config:
             type = config['Discretization']['discretization_type'] if 'discretization_type' in config['Discretization'] else 'equal_frequency'
-            self.__discretization_type = DISCRETIZATION_TYPE.EQUAL_FREQUENCY if type == 'equal_frequency' else DISCRETIZATION_TYPE.EQUAL_WIDTH
+            self.__discretization_type = DISCRETIZATION_TYPE.EQUAL_FREQUENCY if type == 'equal_frequency' else DISCRETIZATION_TYPE.LOGARITHMIC if type == 'logarithmic' else DISCRETIZATION_TYPE.EQUAL_WIDTH
             n_bins = int(config['Discretization']['n_bins']) if 'n_bins' in config['Discretization'] else n_bins
             soglia = int(config['Discretization']['soglia']) if 'soglia' in config['Discretization'] else soglia
             self.__filepath_discretization = config['Discretization']['filepath'] if 'filepath' in config['Discretization'] else '../logs/ML/discretized_bins.bin'
-            self.__save_discretization = bool(int(config['Discretization']['save'])) if 'save' in config['Discretization'] else True
+            save = config['Discretization']['save'] if 'save' in config['Discretization'] else '1'
+            # with auto the bins are loaded only if they have been created from the same inputs
+            self.__save_discretization = bool(int(save)) if save != 'auto' else None
+            fitting = config['Discretization']['fitting'] if 'fitting' in config['Discretization'] else 'exact'
+            quantile_error = float(config['Discretization']['quantile_error']) if 'quantile_error' in config['Discretization'] else 0.01
+            self.__log_base = float(config['Discretization']['log_base']) if 'log_base' in config['Discretization'] else 10
+            self.__bin_codes = config['Discretization']['bin_labels'] == 'code' if 'bin_labels' in config['Discretization'] else False
         else:
             self.__discretization_type = DISCRETIZATION_TYPE.EQUAL_FREQUENCY
             n_bins = 5
             soglia = 10
             self.__filepath_discretization = '../logs/ML/discretized_bins.bin'
             self.__save_discretization = True
+            fitting = 'exact'
+            quantile_error = 0.01
+            self.__log_base = 10
+            self.__bin_codes = False
 
         if 'Attributes' in config:
             self.__attr_to_xes_traces = config['Attributes']['attributes_to_xes_traces'].split(',') if 'attributes_to_xes_traces' in config['Attributes'] else ['orig_ip','orig_port','resp_ip','resp_port','proto','label']
@@ -94,6 +104,17 @@ class MainTraceController:
         soglia_list = [soglia for _ in range(len(attr_to_discretize))]
         self.__attr_bins_dict = dict(zip(attr_to_discretize, zip(bins_list, soglia_list)))
 
+        # only the attributes converted to xes are read from the input file
+        self.__traces_controller.select_attributes(self.__attr_to_xes_events)
+
+        sketched = fitting == 'sketch' and self.__discretization_type == DISCRETIZATION_TYPE.EQUAL_FREQUENCY
+        if self.__save_discretization is None:
+            self.__save_discretization = not self.__traces_controller.has_discretization(self.__discretization_type, self.__attr_bins_dict, self.__filepath_discretization, sketched)
+
+        # the equal frequency bins are created from quantile sketches fed while reading the file
+        if sketched and self.__save_discretization:
+            self.__traces_controller.enable_quantile_sketches(self.__attr_bins_dict, quantile_error)
+
         if 'Print' in config:
             self.__show_examples = bool(int(config['Print']['show_examples'])) if 'show_examples' in config['Print'] else True
             self.__n_trace_to_print = int(config['Print']['n_trace_to_print']) if 'n_trace_to_print' in config['Print'] else 10
@@ -123,7 +144,7 @@ class MainTraceController:
         self.__cls()
         self.__traces_controller.read_and_convert_lines()
         self.__print_n_traces_and_events() if self.__show_examples else ''
-        self.__traces_controller.discretize_attributes(self.__discretization_type, self.__attr_bins_dict, self.__filepath_discretization, self.__save_discretization)
+        self.__traces_controller.discretize_attributes(self.__discretization_type, self.__attr_bins_dict, self.__filepath_discretization, self.__save_discretization, self.__log_base, self.__bin_codes)
         self.__print_n_discretized_traces_and_events() if self.__show_examples else ''
         self.__traces_controller.print_Trace_list_to_xes_file(self.__attr_to_xes_traces, self.__attr_to_xes_events)
     
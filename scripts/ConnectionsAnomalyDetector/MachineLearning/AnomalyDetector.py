@@ -1,45 +1,82 @@
+import numpy as np
 import pandas as pd
-#import matplotlib.pyplot as plt
-from tqdm import tqdm
-from sklearn.metrics import classification_report, confusion_matrix#, ConfusionMatrixDisplay
 
 class AnomalyDetector:
-    def __getDFRow(self, soglia, crDict, cm):
+    def __init__(self, fitness_cutoffs: list=None) -> None:
+        # if given, every threshold is also tested counting as misfit the attributes with fitness < cutoff
+        self.__fitness_cutoffs = fitness_cutoffs if fitness_cutoffs is not None else []
+
+    @staticmethod
+    def __scores(tp: int, fp: int, fn: int) -> tuple:
+        # same definitions of sklearn, with 0 when the value is undefined
+        precision = tp / (tp + fp) if tp + fp > 0 else 0.0
+        recall = tp / (tp + fn) if tp + fn > 0 else 0.0
+        denom = precision + recall
+        fscore = 2 * precision * recall / (denom if denom != 0.0 else 1)
+        return precision, recall, fscore
+
+    def __getDFRow(self, soglia, tp, fn, fp, tn):
+        precision_pos, recall_pos, fscore_pos = self.__scores(tp, fp, fn)
+        precision_neg, recall_neg, fscore_neg = self.__scores(tn, fn, fp)
+        support_pos = tp + fn
+        support_neg = tn + fp
         row = {}
         row['soglia'] = soglia
-        row['TP'] = cm[1, 1]
-        row['FN'] = cm[1, 0]
-        row['FP'] = cm[0, 1]
-        row['TN'] = cm[0, 0]
-        row['precision (positive)'] = crDict['1']['precision']
-        row['recall (positive)'] = crDict['1']['recall']
-        row['fscore (positive)'] = crDict['1']['f1-score']
-        row['precision (negative)'] = crDict['-1']['precision']
-        row['recall (negative)'] = crDict['-1']['recall']
-        row['fscore (negative)'] = crDict['-1']['f1-score']
-        row['accuracy'] = crDict['accuracy']
-        row['macroF'] = crDict['macro avg']['f1-score']
-        row['WeigthedF'] = crDict['weighted avg']['f1-score']
+        row['TP'] = tp
+        row['FN'] = fn
+        row['FP'] = fp
+        row['TN'] = tn
+        row['precision (positive)'] = precision_pos
+        row['recall (positive)'] = recall_pos
+        row['fscore (positive)'] = fscore_pos
+        row['precision (negative)'] = precision_neg
+        row['recall (negative)'] = recall_neg
+        row['fscore (negative)'] = fscore_neg
+        row['accuracy'] = (tp + tn) / (support_pos + support_neg)
+        row['macroF'] = np.average([fscore_neg, fscore_pos])
+        row['WeigthedF'] = np.average([fscore_neg, fscore_pos], weights=[support_neg, support_pos]) if support_pos + support_neg > 0 else 0.0
         return row
-    
+
     def generate_predictions(self, X, Y, file_name_out):
+        values = X.to_numpy(dtype=float)
+        y = np.asarray(Y)
+        n_attrs = values.shape[1]
 
         report = []
-        for i in tqdm(range(1, len(X.columns) + 1)):
-            y_pred = self.__prediction(X, i)
-            cr = classification_report(Y, y_pred, output_dict=True)
-            cm = confusion_matrix(Y, y_pred)
-            #cm_display = ConfusionMatrixDisplay(confusion_matrix = cm)
-            #cm_display.plot()
-            #plt.show()
-            report.append(self.__getDFRow(i, cr, cm))
+        # number of attributes that don't fit the model for every trace, computed once per cutoff
+        misfits = [(None, (values != 1).sum(axis=1))]
+        misfits += [(cutoff, (values < cutoff).sum(axis=1)) for cutoff in self.__fitness_cutoffs]
+        for cutoff, n_misfit in misfits:
+            for row in self.__sweep(n_misfit, y, n_attrs):
+                if cutoff is not None:
+                    row['cutoff'] = cutoff
+                report.append(row)
         pd.DataFrame(report).to_csv(file_name_out)
 
-    def __prediction(self, X: pd.DataFrame, soglia: int):
-        y_pred = []
-        for _, x in X.iterrows():
-            if sum([1 if attr != 1 else 0 for attr in x]) >= soglia:
-                y_pred.append(-1)
-            else:
-                y_pred.append(1)
-        return y_pred
+    def __sweep(self, n_misfit: np.ndarray, y: np.ndarray, n_attrs: int) -> list:
+        """computes the rows of the report for every threshold from 1 to n_attrs in one pass:
+        a trace is predicted as anomalous (-1) when at least soglia attributes don't fit
+
+        :param n_misfit: number of attributes that don't fit for every trace
+        :type n_misfit: np.ndarray
+        :param y: real label of every trace (1 normal, -1 anomaly)
+        :type y: np.ndarray
+        :param n_attrs: number of attributes, the maximum threshold
+        :type n_attrs: int
+        :return: the rows of the report
+        :rtype: list[dict]
+        """
+        # hist[k] number of traces with exactly k misfits, at_least[s] number of traces with misfits >= s
+        hist_pos = np.bincount(n_misfit[y == 1], minlength=n_attrs + 1)
+        hist_neg = np.bincount(n_misfit[y == -1], minlength=n_attrs + 1)
+        at_least_pos = np.cumsum(hist_pos[::-1])[::-1]
+        at_least_neg = np.cumsum(hist_neg[::-1])[::-1]
+        n_pos = int(hist_pos.sum())
+        n_neg = int(hist_neg.sum())
+
+        rows = []
+        for soglia in range(1, n_attrs + 1):
+            fn = int(at_least_pos[soglia])
+            tn = int(at_least_neg[soglia])
+            rows.append(self.__getDFRow(soglia, n_pos - fn, fn, n_neg - tn, tn))
+        return rows
@@ -0,0 +1,86 @@
+import sqlite3
+
+class FitnessCache:
+    """
+    Persistent cache of the alignment fitness stored in a sqlite3 database.
+    Every entry is keyed by the fingerprint of the model (the hash of its pnml file)
+    and by the variant (the sequence of activities of a trace projected on one attribute),
+    so the entries stay valid across runs, days and crashes as long as the model doesn't change
+
+    :param __file_name: path of the sqlite3 database
+    :type __file_name: str
+    """
+    # separator of the activities in the key of a variant
+    SEPARATOR = '\x1f'
+
+    def __init__(self, file_name: str) -> None:
+        """Constructor, creates the database and the table if they aren't already present
+
+        :param file_name: path of the sqlite3 database
+        :type file_name: str
+        """
+        self.__file_name = file_name
+        conn = self.__connect()
+        try:
+            conn.execute('PRAGMA journal_mode=WAL') # lets the worker processes read while another one writes
+            with conn:
+                conn.execute('''CREATE TABLE IF NOT EXISTS fitness (
+                    model TEXT NOT NULL,
+                    variant TEXT NOT NULL,
+                    fitness REAL NOT NULL,
+                    PRIMARY KEY (model, variant)
+                ) WITHOUT ROWID''')
+        finally:
+            conn.close()
+
+    def __connect(self) -> sqlite3.Connection:
+        """opens a new connection, connections are never kept in the object so that
+        it can be sent to the worker processes
+
+        :return: the connection to the database
+        :rtype: sqlite3.Connection
+        """
+        return sqlite3.connect(self.__file_name, timeout=60)
+
+    @classmethod
+    def variant_to_key(cls, variant: tuple) -> str:
+        """converts a variant to the key used in the database
+
+        :param variant: sequence of activities
+        :type variant: tuple[str]
+        :return: the key of the variant
+        :rtype: str
+        """
+        return cls.SEPARATOR.join(str(activity) for activity in variant)
+
+    def get_all(self, model: str) -> dict:
+        """returns every fitness stored for a model
+
+        :param model: fingerprint of the model
+        :type model: str
+        :return: dict where the key is the key of the variant and the value is its fitness
+        :rtype: dict{str: float}
+        """
+        conn = self.__connect()
+        try:
+            return dict(conn.execute('SELECT variant, fitness FROM fitness WHERE model = ?', (model,)))
+        finally:
+            conn.close()
+
+    def put_many(self, model: str, fitness_dict: dict) -> None:
+        """stores the fitness of the variants of a model
+
+        :param model: fingerprint of the model
+        :type model: str
+        :param fitness_dict: dict where the key is the key of the variant and the value is its fitness
+        :type fitness_dict: dict{str: float}
+        """
+        if not fitness_dict:
+            return
+        conn = self.__connect()
+        try:
+            with conn:
+                conn.executemany('INSERT OR REPLACE INTO fitness (model, variant, fitness) VALUES (?, ?, ?)',
+                    ((model, variant, fitness) for variant, fitness in fitness_dict.items()))
+        finally:
+            conn.close()
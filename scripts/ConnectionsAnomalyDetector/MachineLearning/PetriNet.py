@@ -6,9 +6,14 @@ from pm4py.objects.conversion.process_tree import converter
 from pm4py.objects.log.obj import EventLog
 
 class PetriNet:
+    def __init__(self) -> None:
+        self.__model = None
+        self.__fingerprint = None # hash of the pnml file of the model
+
     def train(self, xes_log: EventLog, delta: float, activity: str) -> None:
         ptree = ind_miner.apply_tree(xes_log, parameters={Parameters.NOISE_THRESHOLD: delta, Parameters.ACTIVITY_KEY: activity}, variant=ind_miner.Variants.IMf)
         self.__model = converter.apply(ptree)
+        self.__fingerprint = None
         #pm4py.view_petri_net(self.__model[0], self.__model[1], self.__model[2])
         #input('digita per fare la prossima rete')
 
@@ -17,9 +22,20 @@ class PetriNet:
 
     def save_model(self, file_name: str) -> None:
         pm4py.write_pnml(self.__model[0], self.__model[1], self.__model[2], file_name)
+        self.__fingerprint = PetriNet.__file_fingerprint(file_name)
+
+    def get_fingerprint(self) -> str:
+        return self.__fingerprint
+
+    @classmethod
+    def __file_fingerprint(cls, file_name: str) -> str:
+        import hashlib
+        with open(file_name, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
 
     @classmethod
     def load_model(cls, file_name: str):
         temp = PetriNet()
         temp.__model = pm4py.read_pnml(file_name)
+        temp.__fingerprint = PetriNet.__file_fingerprint(file_name)
         return temp
\ No newline at end of file
@@ -1,4 +1,5 @@
 from .PetriNet import PetriNet
+from .FitnessCache import FitnessCache
 
 import pandas as pd
 from pandas import DataFrame
@@ -15,9 +16,17 @@ from multiprocessing import Pool
 from pm4py.algo.discovery.inductive.variants.im_f.algorithm import Parameters
 
 class PetriNetCollector:
-    def __init__(self, attrs: list, delta: float) -> None:
+    def __init__(self, attrs: list, delta: float, group_by_variant: bool=True, fitness_cache_path: str='') -> None:
         self.__dict_petriNet = {}
         self.__delta = delta
+        self.__group_by_variant = group_by_variant # align each distinct activity sequence only once
+        self.__fitness_cache = None
+        if fitness_cache_path != '':
+            try:
+                os.makedirs(fitness_cache_path[:fitness_cache_path.rfind('/')+1]) # create the folder if isn't already present
+            except:
+                pass
+            self.__fitness_cache = FitnessCache(fitness_cache_path)
         for attr in attrs:
             self.__dict_petriNet[f'concept:{attr}'] = PetriNet()
     
@@ -55,16 +64,36 @@ class PetriNetCollector:
         file_name_complete = f'{file_name}_{attr.replace("concept:", "")}.csv'
 
         tot = len(self.__data_log)
-        if not exists(file_name_complete):
-            next_perc = 10
-            for i, trace in enumerate(self.__data_log):
-                log= EventLog([Trace({'concept:name': activity[attr]} for activity in trace)])
-                res[i] = pn.calc_conformance(log, attr)['average_trace_fitness']
-                
-                perc = int(((i / tot) * 100))
-                if perc == next_perc:
-                    print(f'{attr} :: {perc} %')
-                    next_perc += 10
+        # with the fitness cache the csv is always rebuilt, only the variants never seen are aligned
+        if self.__fitness_cache is not None or not exists(file_name_complete):
+            if self.__group_by_variant:
+                res = self.__conformance_by_variant(attr, pn)
+            else:
+                model = pn.get_fingerprint()
+                use_cache = self.__fitness_cache is not None and model is not None
+                cached = self.__fitness_cache.get_all(model) if use_cache else {}
+                to_store = {} # fitness of the new variants not yet written to the cache
+                next_perc = 10
+                for i, trace in enumerate(self.__data_log):
+                    key = FitnessCache.variant_to_key(activity[attr] for activity in trace) if use_cache else None
+                    if key in cached:
+                        res[i] = cached[key]
+                    else:
+                        log= EventLog([Trace({'concept:name': activity[attr]} for activity in trace)])
+                        res[i] = pn.calc_conformance(log)['average_trace_fitness']
+                        if use_cache:
+                            cached[key] = res[i]
+                            to_store[key] = res[i]
+                            if len(to_store) >= 100: # stores periodically so that a crash loses only the last variants
+                                self.__fitness_cache.put_many(model, to_store)
+                                to_store = {}
+                    
+                    perc = int(((i / tot) * 100))
+                    if perc == next_perc:
+                        print(f'{attr} :: {perc} %')
+                        next_perc += 10
+                if use_cache:
+                    self.__fitness_cache.put_many(model, to_store)
             print(f'{attr} :: 100 % - completato')
 
             DataFrame({'conformance': res}).to_csv(file_name_complete)
@@ -74,6 +103,59 @@ class PetriNetCollector:
 
         return res
 
+    def __conformance_by_variant(self, attr: str, pn: PetriNet) -> list:
+        """groups the traces by the sequence of activities projected on attr (the variant),
+        aligns every variant only once and copies its fitness to all the traces of the group
+
+        :param attr: the attribute on which the traces are projected
+        :type attr: str
+        :param pn: the model to align the variants with
+        :type pn: PetriNet
+        :return: the fitness of every trace, in the same order of the log
+        :rtype: list[float]
+        """
+        res = [0 for _ in self.__data_log]
+
+        variants = {} # projected activity sequence -> indices of the traces with that sequence
+        for i, trace in enumerate(self.__data_log):
+            variants.setdefault(tuple(activity[attr] for activity in trace), []).append(i)
+        print(f'{attr} :: {len(variants)} variants over {len(self.__data_log)} traces')
+
+        model = pn.get_fingerprint()
+        use_cache = self.__fitness_cache is not None and model is not None
+        cached = self.__fitness_cache.get_all(model) if use_cache else {}
+        to_store = {} # fitness of the new variants not yet written to the cache
+
+        tot = len(variants)
+        next_perc = 10
+        n_aligned = 0
+        for n, (variant, traces) in enumerate(variants.items()):
+            key = FitnessCache.variant_to_key(variant)
+            if key in cached:
+                fitness = cached[key]
+            else:
+                log = EventLog([Trace({'concept:name': activity} for activity in variant)])
+                fitness = pn.calc_conformance(log)['average_trace_fitness']
+                n_aligned += 1
+                if use_cache:
+                    to_store[key] = fitness
+                    if len(to_store) >= 100: # stores periodically so that a crash loses only the last variants
+                        self.__fitness_cache.put_many(model, to_store)
+                        to_store = {}
+            for i in traces:
+                res[i] = fitness
+
+            perc = int(((n / tot) * 100))
+            if perc == next_perc:
+                print(f'{attr} :: {perc} %')
+                next_perc += 10
+
+        if use_cache:
+            self.__fitness_cache.put_many(model, to_store)
+            print(f'{attr} :: {n_aligned} variants aligned, {tot - n_aligned} taken from the fitness cache')
+
+        return res
+
     def create_PetriNet_dataset(self, file_name: str) -> tuple[DataFrame, DataFrame]:
         df = DataFrame()
 
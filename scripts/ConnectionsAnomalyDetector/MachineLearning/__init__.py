@@ -1,3 +1,4 @@
 from .AnomalyDetector import AnomalyDetector
 from .PetriNet import PetriNet
+from .FitnessCache import FitnessCache
 from .PetriNetCollector import PetriNetCollector
\ No newline at end of file